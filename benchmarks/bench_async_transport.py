@@ -0,0 +1,58 @@
+"""
+Load test of the Flask/gunicorn and the asyncio/uvicorn entry points,
+with the Slack Web API and Azure DevOps replaced by local stand-ins
+with a fixed latency
+
+Each event is a message on a new channel, so every reply waits on
+conversations.info and chat.postMessage. The latency of an event is
+the time from the event sent to its reply arriving on the fake Slack.
+
+Usage:
+    python -m benchmarks.bench_async_transport [events] [concurrency] [latency]
+"""
+
+import asyncio
+import sys
+import time
+
+from benchmarks.fake_az_devops import FakeAzDevOpsServer
+from benchmarks.fake_slack import FakeSlackServer
+from benchmarks.load import ENTRY_POINTS, BotServer, bot_env, message_event, percentile, send_events
+
+
+def wait_replies(slack_server: FakeSlackServer, expected: int, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+
+    while len(slack_server.messages) < expected and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def run(name: str, events: int, concurrency: int, latency: float) -> None:
+    with FakeSlackServer(latency=latency) as slack_server, FakeAzDevOpsServer(latency=latency) as az_server:
+        with BotServer(ENTRY_POINTS[name], bot_env(slack_server.api_url, az_server.url)) as bot_server:
+            bodies = [message_event(index, f"C{index:08d}") for index in range(events)]
+            started_at = time.monotonic()
+            sent = asyncio.run(send_events(f"{bot_server.url}/slack/events", bodies, concurrency))
+            wait_replies(slack_server, events - sent["failures"])
+
+        replied_at = {params["channel"]: arrival for arrival, params in slack_server.messages}
+        latencies = [
+            replied_at[event["event"]["channel"]] - sent["sent_at"][event["event_id"]]
+            for event in bodies if event["event"]["channel"] in replied_at
+        ]
+        elapsed = max(replied_at.values(), default=started_at) - started_at
+
+    print(
+        f"{name:<9} events={events} concurrency={concurrency} replies={len(latencies)} "
+        f"failed_acks={sent['failures']} throughput={len(latencies) / elapsed if elapsed else 0:.1f}/s "
+        f"p50={percentile(latencies, 50) * 1000:.0f}ms p99={percentile(latencies, 99) * 1000:.0f}ms"
+    )
+
+
+def main(events: int = 500, concurrency: int = 100, latency: float = 0.05) -> None:
+    for name in ["gunicorn", "uvicorn"]:
+        run(name, events, concurrency, latency)
+
+
+if __name__ == "__main__":
+    main(*[cast(arg) for cast, arg in zip((int, int, float), sys.argv[1:])])
@@ -0,0 +1,54 @@
+"""
+Benchmark of the Azure DevOps calls made by a burst of support
+tickets, with and without the $batch coalescing of the work items
+creations, running against a local stand-in of the Azure DevOps REST API
+
+Usage:
+    python -m benchmarks.bench_az_devops_batch [tickets] [window]
+"""
+
+import logging
+import sys
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_az_devops import FakeAzDevOpsServer
+from bot.config import Config
+from bot.libs.az_devops_client import AzDevOpsClient
+
+DOCUMENT = [{"op": "add", "path": "/fields/System.Title", "from": None, "value": "Test"}]
+
+
+def main(tickets: int = 50, window: float = 0.05) -> None:
+    # The single mode opens more connections than the pool keeps
+    logging.getLogger("urllib3").setLevel(logging.ERROR)
+
+    for name, batch_window in [("single", 0), ("batched", window)]:
+        with FakeAzDevOpsServer(latency=0.05) as server:
+            Config.az_devops_organization_url = server.url
+            Config.az_devops_batch_window = batch_window
+            az_devops_client = AzDevOpsClient()
+            az_devops_client.provide_work_item_tracking_client()
+            server.counters.clear()
+
+            started_at = time.monotonic()
+
+            with ThreadPoolExecutor(max_workers=tickets) as executor:
+                board_items = list(executor.map(
+                    lambda _: az_devops_client.add_item_to_project_board(
+                        project="project", document=DOCUMENT, work_item_type="Support"
+                    ),
+                    range(tickets)
+                ))
+
+            elapsed = time.monotonic() - started_at
+
+        print(
+            f"{name:<8} tickets={tickets} created={sum(board_item is not None for board_item in board_items)} "
+            f"requests={server.counters.get('requests', 0)} burst_time={elapsed * 1000:.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main(*[cast(arg) for cast, arg in zip((int, float), sys.argv[1:])])
@@ -0,0 +1,67 @@
+"""
+Benchmark of the connections opened per ticket by AzDevOpsClient,
+running against a local stand-in of the Azure DevOps REST API
+
+Usage:
+    python -m benchmarks.bench_az_devops_client
+"""
+
+import time
+import requests
+
+from benchmarks.fake_az_devops import FakeAzDevOpsServer
+from bot.config import Config
+from bot.libs.az_devops_client import AzDevOpsClient
+
+DOCUMENT = [{"op": "add", "path": "/fields/System.Title", "from": None, "value": "Test"}]
+
+
+class UnpooledAzDevOpsClient(AzDevOpsClient):
+    """Previous behaviour: a new client, connection and session per ticket"""
+
+    def share_session(self, client: object) -> None:
+        pass
+
+    def get_team_settings(self, project: str) -> dict:
+        return requests.get(
+            url=f"{Config.az_devops_organization_url}/{project}/_apis/work/teamsettings?api-version=6.1-preview.1",
+            headers={"Authorization": f"Basic {Config.az_devops_pat_b64}"},
+            verify=False  # nosec
+        ).json()
+
+
+def create_ticket(az_devops_client: AzDevOpsClient) -> None:
+    az_devops_client.get_team_settings("project")
+    az_devops_client.add_item_to_project_board(
+        project="project", document=DOCUMENT, work_item_type="Support"
+    )
+
+
+def main(tickets: int = 200) -> None:
+    for name, get_client in [
+        ("unpooled", UnpooledAzDevOpsClient),
+        ("pooled", AzDevOpsClient.get_instance)
+    ]:
+        with FakeAzDevOpsServer() as server:
+            Config.az_devops_organization_url = server.url
+            AzDevOpsClient._instance = None
+            create_ticket(get_client())
+            server.counters.clear()
+
+            started_at = time.monotonic()
+
+            for _ in range(tickets):
+                create_ticket(get_client())
+
+            elapsed = time.monotonic() - started_at
+
+        print(
+            f"{name:<9} tickets={tickets} "
+            f"connections/ticket={server.counters.get('connections', 0) / tickets:.2f} "
+            f"requests/ticket={server.counters.get('requests', 0) / tickets:.2f} "
+            f"latency/ticket={elapsed / tickets * 1000:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
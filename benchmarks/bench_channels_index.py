@@ -0,0 +1,46 @@
+"""
+Microbenchmark of the channel -> shortcuts lookup done for every message
+
+Usage:
+    python -m benchmarks.bench_channels_index
+"""
+
+import timeit
+
+from bot.config import Config
+
+
+def linear_scan_reply_text(channel_name: str) -> str:
+    """Previous lookup: scan all shortcuts and render the reply per message"""
+    channel_shortcuts_list = list()
+
+    for shortcut in Config.slack_shortcuts:
+        if Config.slack_shortcuts[shortcut].get("slack_channel") == channel_name:
+            channel_shortcuts_list.append(shortcut)
+
+    channel_shortcuts = ", ".join(map(lambda x: "/" + x, channel_shortcuts_list))
+    return Config.slack_channel_reply_text.format(shortcuts=channel_shortcuts)
+
+
+def main(number: int = 10000) -> None:
+    for shortcuts_count, channels_count in [(10, 5), (200, 100), (800, 400)]:
+        Config.slack_shortcuts = {
+            f"shortcut_{index}": {"slack_channel": f"channel-{index % channels_count}"}
+            for index in range(shortcuts_count)
+        }
+        channel_name = f"channel-{channels_count - 1}"
+
+        assert linear_scan_reply_text(channel_name) == Config.get_channel_reply_text(channel_name)
+
+        linear_scan = timeit.timeit(lambda: linear_scan_reply_text(channel_name), number=number)
+        indexed = timeit.timeit(lambda: Config.get_channel_reply_text(channel_name), number=number)
+
+        print(
+            f"shortcuts={shortcuts_count:<4} channels={channels_count:<4} "
+            f"linear_scan={linear_scan / number * 1e6:8.2f}us "
+            f"indexed={indexed / number * 1e6:8.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
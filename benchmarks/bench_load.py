@@ -0,0 +1,311 @@
+"""
+End-to-end load test of the bot, with the Slack Web API and Azure
+DevOps replaced by local stand-ins with configurable latency and errors
+
+The bot runs on its production server and receives signed Slack
+requests at a fixed rate, or Socket Mode envelopes with the
+socket_mode entry point, one bot process by scenario:
+
+- message: channel messages, completed when the bot reply is posted
+- shortcut: shortcuts, completed when the modal is opened
+- view_submission: support form submissions, completed when the thread
+  reply with the Azure DevOps card is posted
+
+The report has the throughput, the ack and completion latencies and the
+Slack and Azure DevOps calls per request. With --baseline the results
+are compared to a previous --output, failing on regressions. --workers
+runs more gunicorn workers, with --shared-cache they share the metadata
+caches on a SQLite database. --trace-file keeps the bot traces, with
+a span for each Slack and Azure DevOps call.
+
+Usage:
+    python -m benchmarks.bench_load --rate 20 --duration 10 --slack-latency 0.05 --output results.json
+    python -m benchmarks.bench_load --rate 20 --duration 10 --slack-latency 0.05 --baseline results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from benchmarks.fake_az_devops import FakeAzDevOpsServer
+from benchmarks.fake_slack import FakeSlackServer
+from benchmarks.fake_socket_mode import FakeSocketModeServer
+from benchmarks.load import (
+    ENTRY_POINTS,
+    BotServer,
+    bot_env,
+    envelope_acks,
+    event_request,
+    message_event,
+    payload_request,
+    percentile,
+    send_envelopes,
+    send_requests,
+    shortcut_payload,
+    view_submission_payload
+)
+
+# Shortcut and channel of each support form, as on Config.slack_shortcuts
+SHORTCUT_CHANNELS = {"devops_support": ("C0DEVOPS", "devops-support"), "coud_support": ("C00CLOUD", "cloud-support")}
+
+
+def message_requests(count: int, channels: int) -> list:
+    requests = list()
+
+    for index in range(count):
+        channel = f"C{index % channels:08d}"
+        event_id, body, envelope_type = event_request(message_event(index, channel))
+        requests.append((f"{channel}:{event_id}", body, envelope_type))
+
+    return requests
+
+
+def message_completions(slack_server: FakeSlackServer, sent_at: dict) -> dict:
+    # The replies don't reference the message, so they are matched to
+    # the messages of their channel in the order they were sent
+    events = defaultdict(list)
+
+    for key, _ in sorted(sent_at.items(), key=lambda item: item[1]):
+        events[key.split(":")[0]].append(key)
+
+    completions = dict()
+
+    for arrival, params in slack_server.messages:
+        channel_events = events.get(params.get("channel"))
+
+        if channel_events and not params.get("thread_ts"):
+            completions[channel_events.pop(0)] = arrival
+
+    return completions
+
+
+def shortcut_requests(count: int, channels: int) -> list:
+    shortcuts = list(SHORTCUT_CHANNELS)
+
+    return [
+        payload_request(f"trigger-{index:08d}", shortcut_payload(index, shortcuts[index % len(shortcuts)]))
+        for index in range(count)
+    ]
+
+
+def shortcut_completions(slack_server: FakeSlackServer, sent_at: dict) -> dict:
+    return {params.get("trigger_id"): arrival for arrival, params in list(slack_server.calls["views.open"])}
+
+
+def view_submission_requests(count: int, channels: int) -> list:
+    shortcuts = list(SHORTCUT_CHANNELS)
+
+    return [
+        payload_request(f"Ticket {index}", view_submission_payload(index, shortcuts[index % len(shortcuts)]))
+        for index in range(count)
+    ]
+
+
+def view_submission_completions(slack_server: FakeSlackServer, sent_at: dict) -> dict:
+    tickets = dict()
+    replies = dict()
+    completions = dict()
+
+    for arrival, params in list(slack_server.messages):
+        text = params.get("text") or ""
+
+        if not params.get("thread_ts"):
+            ticket = text.split("*Resumo da Solicitação:* ")[-1].split("\n")[0]
+            tickets[params["ts"]] = ticket
+        elif params["thread_ts"] in tickets:
+            replies[params["ts"]] = tickets[params["thread_ts"]]
+
+            if "card de suporte" in text:
+                completions[tickets[params["thread_ts"]]] = arrival
+
+    # With the merged thread reply, the card link arrives updating the reply
+    for arrival, params in list(slack_server.calls["chat.update"]):
+        if "card de suporte" in (params.get("text") or "") and params.get("ts") in replies:
+            completions[replies[params["ts"]]] = arrival
+
+    return completions
+
+
+# Absolute change accepted on top of the tolerance, so the small values don't fail on noise
+NOISE_FLOORS = {"p99": 0.01, "slack_calls_per_request": 0.1, "az_devops_calls_per_request": 0.1}
+
+# Requests builder and completions matcher by scenario
+SCENARIOS: Dict[str, tuple] = {
+    "message": (message_requests, message_completions),
+    "shortcut": (shortcut_requests, shortcut_completions),
+    "view_submission": (view_submission_requests, view_submission_completions)
+}
+
+
+def wait_completions(completions: Callable, slack_server: FakeSlackServer, sent: dict, timeout: float) -> dict:
+    expected = len(sent["sent_at"]) - sent["failures"]
+    deadline = time.monotonic() + timeout
+    completed = completions(slack_server, sent["sent_at"])
+
+    while len(completed) < expected and time.monotonic() < deadline:
+        time.sleep(0.1)
+        completed = completions(slack_server, sent["sent_at"])
+
+    return completed
+
+
+def run_scenario(scenario: str, args: argparse.Namespace) -> dict:
+    build_requests, completions = SCENARIOS[scenario]
+    channels = {channel_id: name for channel_id, name in SHORTCUT_CHANNELS.values()}
+
+    with FakeSlackServer(latency=args.slack_latency, error_rate=args.error_rate, channels=channels) as slack_server, \
+            FakeAzDevOpsServer(latency=args.az_latency, error_rate=args.error_rate) as az_server, \
+            FakeSocketModeServer() as socket_mode_server, tempfile.TemporaryDirectory() as directory:
+        slack_server.usergroups.append({"id": "S0SUPPORT", "handle": "tis-administration"})
+        slack_server.socket_mode_url = socket_mode_server.url
+        env = bot_env(slack_server.api_url, az_server.url, rate_limits=args.real_rate_limits)
+
+        if args.merged_thread_reply:
+            env.update(SLACK_MERGED_THREAD_REPLY="true")
+
+        if args.trace_file:
+            env.update(TRACING_OTLP_FILE=os.path.abspath(args.trace_file))
+
+        if args.shared_cache:
+            env.update(CACHE_DB=os.path.join(directory, "cache.db"), SLACK_DEDUP_DB=os.path.join(directory, "dedup.db"))
+
+        with BotServer(ENTRY_POINTS[args.entry_point], env, workers=args.workers) as bot_server:
+            socket_mode = args.entry_point == "socket_mode"
+
+            if socket_mode and not socket_mode_server.wait_connection():
+                raise RuntimeError("The bot didn't connect to the Socket Mode server")
+
+            slack_server.reset()
+            az_server.counters.clear()
+            requests = build_requests(int(args.rate * args.duration), args.channels)
+            started_at = time.monotonic()
+
+            if socket_mode:
+                sent = send_envelopes(socket_mode_server, requests, args.rate)
+            else:
+                sent = asyncio.run(
+                    send_requests(f"{bot_server.url}/slack/events", requests, args.concurrency, args.rate)
+                )
+
+            completed = wait_completions(completions, slack_server, sent, args.timeout)
+
+            if socket_mode:
+                sent = envelope_acks(socket_mode_server, sent)
+
+        slack_calls = sum(len(calls) for calls in slack_server.calls.values())
+        az_devops_calls = az_server.counters.get("requests", 0)
+
+    latencies = [completed_at - sent["sent_at"][key] for key, completed_at in completed.items() if key in sent["sent_at"]]
+    elapsed = max(completed.values(), default=started_at) - started_at
+    ack_latencies = list(sent["ack_latencies"].values())
+
+    return dict(
+        requests=len(requests),
+        completed=len(latencies),
+        failed=len(requests) - len(latencies),
+        failed_acks=sent["failures"],
+        throughput=len(latencies) / elapsed if elapsed else 0,
+        ack_p99=percentile(ack_latencies, 99),
+        p50=percentile(latencies, 50),
+        p95=percentile(latencies, 95),
+        p99=percentile(latencies, 99),
+        slack_calls_per_request=slack_calls / len(requests) if requests else 0,
+        az_devops_calls_per_request=az_devops_calls / len(requests) if requests else 0
+    )
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Get the regressions of the results compared to a baseline
+
+    Args:
+        results: The results by scenario
+        baseline: The baseline results by scenario
+        tolerance: Fraction of the baseline value accepted as noise
+
+    Returns:
+        The regressions description
+    """
+    regressions = list()
+
+    for scenario, result in results.items():
+        base = baseline.get(scenario)
+
+        if not base:
+            continue
+
+        if result["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{scenario}: throughput {result['throughput']:.1f}/s < {base['throughput']:.1f}/s")
+
+        for key, noise_floor in NOISE_FLOORS.items():
+            if result[key] > base[key] * (1 + tolerance) + noise_floor:
+                regressions.append(f"{scenario}: {key} {result[key]:.3f} > {base[key]:.3f}")
+
+        if result["failed"] > base["failed"]:
+            regressions.append(f"{scenario}: failed {result['failed']} > {base['failed']}")
+
+    return regressions
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--entry-point", choices=list(ENTRY_POINTS), default="gunicorn")
+    parser.add_argument("--workers", type=int, default=1, help="gunicorn worker processes")
+    parser.add_argument("--shared-cache", action="store_true", help="Share the caches between the workers")
+    parser.add_argument("--trace-file", help="Append the bot traces to an OTLP/JSON lines file")
+    parser.add_argument("--merged-thread-reply", action="store_true", help="Post the ticket thread reply once")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma separated scenarios")
+    parser.add_argument("--rate", type=float, default=20, help="Requests sent per second")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds sending requests")
+    parser.add_argument("--concurrency", type=int, default=200, help="Max requests in flight")
+    parser.add_argument("--channels", type=int, default=10, help="Channels receiving the messages")
+    parser.add_argument("--slack-latency", type=float, default=0.05, help="Seconds added to the Slack responses")
+    parser.add_argument("--az-latency", type=float, default=0.1, help="Seconds added to the Azure DevOps responses")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of the API responses failed")
+    parser.add_argument("--real-rate-limits", action="store_true", help="Keep the bot default rate limits")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds to wait the requests completion")
+    parser.add_argument("--output", help="Write the results to a JSON file")
+    parser.add_argument("--baseline", help="Compare the results to a JSON file written by --output")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Fraction of the baseline accepted as noise")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    results = dict()
+
+    for scenario in args.scenarios.split(","):
+        result = results[scenario] = run_scenario(scenario, args)
+        print(
+            f"{scenario:<15} {args.entry_point} rate={args.rate:g}/s requests={result['requests']} "
+            f"completed={result['completed']} failed_acks={result['failed_acks']} "
+            f"throughput={result['throughput']:.1f}/s ack_p99={result['ack_p99'] * 1000:.0f}ms "
+            f"p50={result['p50'] * 1000:.0f}ms p95={result['p95'] * 1000:.0f}ms p99={result['p99'] * 1000:.0f}ms "
+            f"slack_calls={result['slack_calls_per_request']:.2f}/req "
+            f"az_devops_calls={result['az_devops_calls_per_request']:.2f}/req"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(results, json.load(baseline), args.tolerance)
+
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
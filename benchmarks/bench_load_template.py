@@ -0,0 +1,47 @@
+"""
+Microbenchmark of Config.load_template, comparing the previous
+render and parse on every call with the parsed templates cache
+
+Usage:
+    python -m benchmarks.bench_load_template
+"""
+
+import json
+import timeit
+
+from bot.config import Config
+
+TEMPLATES = [
+    ("slack/devops_shortcut_support.json", dict()),
+    ("azure_devops/devops_team.j2", dict(
+        title="Test",
+        description="<b>Solicitante:</b> test<br/><br/>Test description",
+        environment="Production",
+        infrastructure="Test",
+        product="Test",
+        area_path="devops-project\\\\q1",
+        iteration_path="devops-project\\\\Sprint 1"
+    ))
+]
+
+
+def render_and_parse(template: str, **kwargs) -> dict:
+    """Previous path: render the jinja2 template and parse the JSON"""
+    return json.loads(Config.get_templates_env().get_template(template).render(**kwargs), strict=False)
+
+
+def main(number: int = 5000) -> None:
+    for template, kwargs in TEMPLATES:
+        assert render_and_parse(template, **kwargs) == Config.load_template(template, **kwargs)
+
+        render = timeit.timeit(lambda: render_and_parse(template, **kwargs), number=number)
+        cached = timeit.timeit(lambda: Config.load_template(template, **kwargs), number=number)
+
+        print(
+            f"{template:<40} render_and_parse={render / number * 1e6:8.2f}us "
+            f"cached={cached / number * 1e6:8.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
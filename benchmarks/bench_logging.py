@@ -0,0 +1,66 @@
+"""
+Microbenchmark of the time a log call takes on the calling thread,
+comparing the previous stderr handler with the queue pipeline, for
+an info record and an error with its traceback, writing to a fast
+stream and to a slow one, like a container log pipe under backpressure
+
+Usage:
+    python -m benchmarks.bench_logging
+"""
+
+import io
+import logging
+import queue
+import time
+import timeit
+
+from logging.handlers import QueueListener
+
+from bot.libs.logs import DATE_FORMAT, TEXT_FORMAT, LazyQueueHandler
+
+
+class SlowStream(io.StringIO):
+    """Stream that blocks each write, like a full pipe"""
+
+    def write(self, text: str) -> int:
+        time.sleep(0.001)
+        return len(text)
+
+
+def log_error(logger: logging.Logger) -> None:
+    try:
+        raise ValueError("Azure DevOps unavailable")
+    except ValueError:
+        logger.error("Failed to create Azure Boards Work Item.", exc_info=True)
+
+
+def main(number: int = 2000) -> None:
+    for stream_name, stream in [("fast", io.StringIO()), ("slow", SlowStream())]:
+        stream_handler = logging.StreamHandler(stream)
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+        log_queue = queue.Queue()
+        listener = QueueListener(log_queue, stream_handler)
+        listener.start()
+
+        for name, handler in [("stream", stream_handler), ("queue", LazyQueueHandler(log_queue))]:
+            logger = logging.getLogger(f"bench.{stream_name}.{name}")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            logger.addHandler(handler)
+
+            for record, statement in [
+                ("info", lambda: logger.info("New ticket received on channel #%s from %s: %s", "devops", "user", "T")),
+                ("error", lambda: log_error(logger))
+            ]:
+                elapsed = min(timeit.repeat(statement, number=number, repeat=3))
+                print(f"{stream_name} {name:<6} {record:<5} {elapsed / number * 1e6:8.2f}us/call")
+
+        # The queued records are discarded, only the calling thread time is measured
+        with log_queue.mutex:
+            log_queue.queue.clear()
+
+        listener.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Microbenchmark of the cost added by the metrics collection to a handler
+and to an outbound call
+
+Usage:
+    python -m benchmarks.bench_metrics
+"""
+
+import time
+import timeit
+
+from bot.libs import metrics
+
+
+def handler(ack: object, body: dict) -> None:
+    pass
+
+
+def main(number: int = 200000) -> None:
+    instrumented_handler = metrics.instrument_handler("bench_handler")(handler)
+    started_at = time.perf_counter()
+
+    for name, statement in [
+        ("handler", lambda: handler(None, None)),
+        ("instrumented handler", lambda: instrumented_handler(None, None)),
+        ("outbound call observe", lambda: metrics.observe_outbound_call("slack", "chat.postMessage", started_at, False))
+    ]:
+        elapsed = min(timeit.repeat(statement, number=number, repeat=3))
+        print(f"{name:<22} {elapsed / number * 1e6:.2f}us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark of a burst of Slack messages sent to a rate limited local
+stand-in of the Slack Web API, with the plain WebClient, that loses the
+messages rejected with HTTP 429, and with the rate limited one
+
+Usage:
+    python -m benchmarks.bench_rate_limiter [messages] [rate_limit]
+"""
+
+import sys
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from slack_sdk import WebClient
+
+from benchmarks.fake_slack import FakeSlackServer
+from bot.config import Config
+from bot.libs.rate_limiter import RateLimiter
+from bot.libs.slack_web_client import RateLimitedWebClient
+
+
+def post_message(client: WebClient, index: int) -> bool:
+    try:
+        client.chat_postMessage(channel=f"C{index % 10}", text="Test")
+        return True
+    except Exception:
+        return False
+
+
+def main(messages: int = 200, rate_limit: int = 50) -> None:
+    # 10 channels, each one allowed to send its share of the server limit
+    Config.slack_rate_limits = dict(Config.slack_rate_limits, **{"chat.postMessage": [rate_limit * 60 / 10, 1]})
+    Config.rate_limit_deadline = 60
+
+    for name, client_class in [("plain", WebClient), ("limited", RateLimitedWebClient)]:
+        RateLimiter._instances.clear()
+
+        with FakeSlackServer(rate_limit=rate_limit) as server:
+            client = client_class(token="xoxb-benchmark", base_url=server.api_url)
+            started_at = time.monotonic()
+
+            with ThreadPoolExecutor(max_workers=20) as executor:
+                sent = sum(executor.map(lambda index: post_message(client, index), range(messages)))
+
+            elapsed = time.monotonic() - started_at
+
+        stats = RateLimiter._instances["slack"].stats() if RateLimiter._instances else dict()
+        wait_times = stats.get("wait_times", {}).get("chat.postMessage", {})
+
+        print(
+            f"{name:<8} messages={messages} sent={sent} lost={messages - sent} "
+            f"http_429={server.counters.get('throttled', 0)} elapsed={elapsed:.2f}s "
+            f"wait_avg={wait_times.get('wait_time_total', 0) / messages * 1000:.0f}ms "
+            f"wait_max={wait_times.get('wait_time_max', 0) * 1000:.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,162 @@
+"""
+Startup profile of the bot entry points
+
+Imports the entry point on a new interpreter with -X importtime, with
+the Slack Web API replaced by a local stand-in, and reports the import
+time of the entry point, the packages that spent the most time importing
+and the slowest modules. The startup warmup is disabled, so the modules
+it imports in the background aren't counted. Exits with an error when
+the median import time is over the budget of the entry point.
+
+Usage:
+    python -m benchmarks.bench_startup [--module bot.main] [--runs 5] [--top 15] [--budget 400]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+from benchmarks.fake_az_devops import FakeAzDevOpsServer
+from benchmarks.fake_slack import FakeSlackServer
+from benchmarks.load import bot_env
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+# bot.main imports in about 260ms on an idle machine, the budget leaves
+# room for loaded CI runners
+IMPORT_BUDGETS_MS = {"bot.main": 800}
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+def parse_import_times(output: str) -> List[ImportTime]:
+    """Parse the -X importtime report
+
+    Args:
+        output: The interpreter stderr
+
+    Returns:
+        The import time of each module, in the order they finished importing
+    """
+    import_times = list()
+
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            import_times.append(ImportTime(module, int(self_us) / 1000, int(cumulative_us) / 1000, len(indent) // 2))
+
+    return import_times
+
+
+def profile_imports(module: str, env: dict) -> Dict[str, ImportTime]:
+    """Import a module on a new interpreter with -X importtime
+
+    Args:
+        module: The module imported
+        env: Environment variables set over the current ones
+
+    Returns:
+        The import time of the module and of the modules it imported, by module name
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=dict(os.environ, STARTUP_WARMUP="false", **env),
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+
+    if process.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{process.stderr}")
+
+    import_times = parse_import_times(process.stderr)
+    index = next(index for index, import_time in enumerate(import_times) if import_time.module == module)
+    depth = import_times[index].depth
+    start = index
+
+    # The modules imported by a module are reported before it, one level deeper
+    while start > 0 and import_times[start - 1].depth > depth:
+        start -= 1
+
+    return {import_time.module: import_time for import_time in import_times[start:index + 1]}
+
+
+def profile_entry_point(module: str, runs: int = 1) -> List[Dict[str, ImportTime]]:
+    """Profile the imports of a bot entry point against the stand-in servers
+
+    Args:
+        module: The entry point module
+        runs: Number of interpreters started
+
+    Returns:
+        The import times of each run
+    """
+    with FakeSlackServer() as slack_server, FakeAzDevOpsServer() as az_server:
+        env = bot_env(slack_server.api_url, az_server.url)
+        return [profile_imports(module, env) for _ in range(runs)]
+
+
+def group_by_package(import_times: Dict[str, ImportTime]) -> Dict[str, float]:
+    """Sum the modules self time by top level package"""
+    packages = defaultdict(float)
+
+    for import_time in import_times.values():
+        packages[import_time.module.split(".")[0]] += import_time.self_ms
+
+    return packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="bot.main", help="Entry point module imported")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters started, the median run is reported")
+    parser.add_argument("--top", type=int, default=15, help="Packages and modules listed")
+    parser.add_argument(
+        "--budget", type=float,
+        help="Max import time in ms, exits with an error when exceeded, by default the entry point budget"
+    )
+    args = parser.parse_args()
+
+    runs = sorted(profile_entry_point(args.module, args.runs), key=lambda run: run[args.module].cumulative_ms)
+    import_times = runs[len(runs) // 2]
+    total_ms = import_times[args.module].cumulative_ms
+
+    print(
+        f"import {args.module}: median={total_ms:.0f}ms "
+        f"min={runs[0][args.module].cumulative_ms:.0f}ms max={runs[-1][args.module].cumulative_ms:.0f}ms "
+        f"modules={len(import_times)}"
+    )
+    print("\nPackages by self time:")
+
+    packages = sorted(group_by_package(import_times).items(), key=lambda item: item[1], reverse=True)
+
+    for package, self_ms in packages[:args.top]:
+        print(f"  {package:<44} {self_ms:8.1f}ms {self_ms / total_ms:6.1%}")
+
+    print("\nModules by cumulative time:")
+
+    modules = sorted(import_times.values(), key=lambda import_time: import_time.cumulative_ms, reverse=True)
+
+    for import_time in modules[:args.top]:
+        print(f"  {import_time.module:<44} {import_time.cumulative_ms:8.1f}ms  self {import_time.self_ms:.1f}ms")
+
+    budget = args.budget if args.budget is not None else IMPORT_BUDGETS_MS.get(args.module)
+
+    if budget is not None and total_ms > budget:
+        sys.exit(f"import {args.module} took {total_ms:.0f}ms, over the {budget:.0f}ms budget")
+
+
+if __name__ == "__main__":
+    main()
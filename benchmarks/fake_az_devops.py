@@ -0,0 +1,90 @@
+"""
+Local stand-in for the Azure DevOps REST API used by the benchmarks
+
+It answers the calls done by AzDevOpsClient: the SDK discovery calls,
+the team settings and the work items creation, also through $batch.
+"""
+
+import json
+import re
+
+from benchmarks.fake_server import FakeHandler, FakeServer
+
+API_LOCATIONS = [
+    {
+        "id": "e81700f7-3be2-46de-8624-2eb35882fcaa",
+        "area": "Location",
+        "resourceName": "ResourceAreas",
+        "routeTemplate": "_apis/{resource}/{areaId}",
+        "resourceVersion": 1,
+        "minVersion": 3.2,
+        "maxVersion": 7.0,
+        "releasedVersion": "0.0"
+    },
+    {
+        "id": "62d3d110-0047-428c-ad3c-4fe872c91c74",
+        "area": "wit",
+        "resourceName": "workItems",
+        "routeTemplate": "{project}/_apis/{area}/{resource}/${type}",
+        "resourceVersion": 3,
+        "minVersion": 3.2,
+        "maxVersion": 7.0,
+        "releasedVersion": "6.0"
+    }
+]
+
+
+class FakeAzDevOpsHandler(FakeHandler):
+
+    def do_OPTIONS(self):
+        self.reply(200, {"count": len(API_LOCATIONS), "value": API_LOCATIONS})
+
+    def do_GET(self):
+        if "/_apis/resourceareas" in self.path.lower():
+            self.reply(200, {"count": 0, "value": []})
+        elif "/_apis/work/teamsettings" in self.path.lower():
+            self.reply(200, {"defaultIteration": {"path": "Sprint 1"}})
+        else:
+            self.reply(404, {"message": f"{self.path} not found"})
+
+    def do_POST(self):
+        content = self.read_body()
+
+        if re.search(r"/_apis/wit/workitems/\$", self.path, re.IGNORECASE):
+            self.reply(200, {"id": self.server.count("work_items"), "rev": 1, "fields": {}})
+        elif "/_apis/wit/$batch" in self.path.lower():
+            self.server.count("batches")
+            self.reply(200, {"count": len(json.loads(content)), "value": [
+                self.batch_item_response(request) for request in json.loads(content)
+            ]})
+        else:
+            self.reply(404, {"message": f"{self.path} not found"})
+
+    def batch_item_response(self, request: dict) -> dict:
+        work_item_type = request["uri"].split("$")[-1].split("?")[0]
+
+        if work_item_type in self.server.rejected_work_item_types:
+            code, body = 400, {"message": f"Work item type {work_item_type} not found"}
+        else:
+            code, body = 200, {"id": self.server.count("work_items"), "rev": 1, "fields": {}}
+
+        return {"code": code, "headers": {"Content-Type": "application/json"}, "body": json.dumps(body)}
+
+    def do_PATCH(self):
+        self.read_body()
+        self.reply(200, {"id": int(self.path.split("/")[-1].split("?")[0]), "rev": 2, "fields": {}})
+
+
+class FakeAzDevOpsServer(FakeServer):
+    """
+    Fake Azure DevOps server running on a background thread
+
+    Args:
+        latency: Seconds added to every response
+        error_rate: Fraction of the responses replaced by a 503 error
+        rejected_work_item_types: Work item types that fail inside a $batch call
+    """
+
+    def __init__(self, latency: float = 0, error_rate: float = 0, rejected_work_item_types: tuple = ()):
+        super().__init__(FakeAzDevOpsHandler, latency=latency, error_rate=error_rate)
+        self.rejected_work_item_types = rejected_work_item_types
@@ -0,0 +1,46 @@
+"""
+Local stand-in for an OTLP/HTTP collector used by the benchmarks
+
+It accepts the OTLP/JSON traces posted on /v1/traces, keeping their spans
+"""
+
+import json
+
+from benchmarks.fake_server import FakeHandler, FakeServer
+
+
+class FakeOTLPHandler(FakeHandler):
+
+    def do_POST(self):
+        content = self.read_body()
+
+        if self.path != "/v1/traces":
+            return self.reply(404, {"message": f"{self.path} not found"})
+
+        for resource_spans in json.loads(content)["resourceSpans"]:
+            for scope_spans in resource_spans["scopeSpans"]:
+                self.server.spans.extend(scope_spans["spans"])
+
+        self.reply(200, {})
+
+
+class FakeOTLPCollector(FakeServer):
+    """
+    Fake OTLP/HTTP collector running on a background thread
+
+    Attributes:
+        spans: The received spans, on the OTLP/JSON format
+    """
+
+    def __init__(self):
+        super().__init__(FakeOTLPHandler)
+        self.spans = list()
+
+    def traces(self) -> dict:
+        """Get the received spans by trace id"""
+        traces = dict()
+
+        for span in list(self.spans):
+            traces.setdefault(span["traceId"], []).append(span)
+
+        return traces
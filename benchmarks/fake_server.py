@@ -0,0 +1,131 @@
+"""
+Base of the local stand-in servers used by the benchmarks
+"""
+
+import json
+import random
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    """
+    Request handler with keep-alive, latency and error injection
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def parse_request(self) -> bool:
+        if not super().parse_request():
+            return False
+
+        if self.server.take_throttled():
+            self.read_body()
+            self.reply(
+                429, {"ok": False, "error": "ratelimited", "message": "Too many requests"},
+                headers={"Retry-After": str(self.server.retry_after)}
+            )
+            return False
+
+        return True
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def reply(self, status: int, body: dict, headers: dict = None, error: tuple = (503, {"message": "Injected error"})) -> None:
+        self.server.count("requests")
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if status < 400 and random.random() < self.server.error_rate:  # nosec
+            status, body = error
+
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class FakeServer(ThreadingHTTPServer):
+    """
+    Fake server running on a background thread
+
+    Args:
+        handler_class: Request handler with the fake endpoints
+        latency: Seconds added to every response
+        error_rate: Fraction of the responses replaced by an error
+        rate_limit: Requests per second accepted, the others get HTTP 429. 0 disables it
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, handler_class: type, latency: float = 0, error_rate: float = 0, rate_limit: float = 0):
+        super().__init__(("127.0.0.1", 0), handler_class)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.counters = dict()
+        self.throttled = 0
+        self.retry_after = 1
+        self._window = (0, 0)
+        self._counters_lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, counter: str) -> int:
+        with self._counters_lock:
+            self.counters[counter] = self.counters.get(counter, 0) + 1
+            return self.counters[counter]
+
+    def throttle(self, responses: int, retry_after: int = 1) -> None:
+        """Reply the next responses with HTTP 429 and a Retry-After header"""
+        with self._counters_lock:
+            self.throttled = responses
+            self.retry_after = retry_after
+
+    def take_throttled(self) -> bool:
+        with self._counters_lock:
+            if self.rate_limit:
+                second, requests = self._window
+                second, requests = (second, requests + 1) if second == int(time.time()) else (int(time.time()), 1)
+                self._window = (second, requests)
+
+                if requests > self.rate_limit:
+                    self.counters["throttled"] = self.counters.get("throttled", 0) + 1
+                    return True
+
+            if self.throttled <= 0:
+                return False
+
+            self.throttled -= 1
+            self.counters["throttled"] = self.counters.get("throttled", 0) + 1
+            return True
+
+    def __enter__(self) -> "FakeServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_details) -> None:
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,138 @@
+"""
+Local stand-in for the Slack Web API used by the benchmarks
+
+It answers the Web API methods called by the bot and records the
+arrival time of every chat.postMessage, so the load tests measure
+the time from the event sent to the reply posted.
+"""
+
+import itertools
+import json
+import time
+
+from collections import defaultdict
+
+from urllib.parse import parse_qsl
+
+from benchmarks.fake_server import FakeHandler, FakeServer
+
+BOT_ID = "B0000BOT"
+BOT_USER_ID = "U0000BOT"
+
+
+class FakeSlackHandler(FakeHandler):
+
+    def do_GET(self):
+        self.do_POST()
+
+    def do_POST(self):
+        path, _, query = self.path.partition("?")
+        method = path.rstrip("/").split("/")[-1]
+        content = self.read_body().decode()
+
+        if "json" in self.headers.get("Content-Type", ""):
+            params = dict(parse_qsl(query), **json.loads(content or "{}"))
+        else:
+            params = dict(parse_qsl(query), **dict(parse_qsl(content)))
+
+        self.server.count(f"calls.{method}")
+        self.server.record_call(method, params)
+        handler = getattr(self, "method_" + method.replace(".", "_"), None)
+        body = handler(params) if handler else {}
+
+        self.reply(200, dict({"ok": True}, **body), error=(200, {"ok": False, "error": "internal_error"}))
+
+    def method_auth_test(self, params: dict) -> dict:
+        return {"user_id": BOT_USER_ID, "bot_id": BOT_ID, "team_id": "T0000001", "user": "bot", "team": "team"}
+
+    def method_bots_info(self, params: dict) -> dict:
+        return {"bot": {"id": BOT_ID, "user_id": BOT_USER_ID}}
+
+    def method_conversations_info(self, params: dict) -> dict:
+        return {"channel": {"id": params.get("channel"), "name": self.server.channel_name(params.get("channel"))}}
+
+    def method_users_conversations(self, params: dict) -> dict:
+        return {
+            "channels": [{"id": channel_id, "name": name} for channel_id, name in self.server.channels.items()],
+            "response_metadata": {"next_cursor": ""}
+        }
+
+    def method_chat_postMessage(self, params: dict) -> dict:
+        ts = self.server.next_ts()
+        self.server.record_message(params, ts)
+        return {"channel": params.get("channel"), "ts": ts, "message": {"text": params.get("text"), "ts": ts}}
+
+    def method_chat_postEphemeral(self, params: dict) -> dict:
+        return {"message_ts": self.server.next_ts()}
+
+    def method_chat_update(self, params: dict) -> dict:
+        return {"channel": params.get("channel"), "ts": params.get("ts")}
+
+    def method_chat_getPermalink(self, params: dict) -> dict:
+        channel, ts = params.get("channel"), params.get("message_ts", "")
+        return {"channel": channel, "permalink": f"https://fake.slack.com/archives/{channel}/p{ts.replace('.', '')}"}
+
+    def method_conversations_replies(self, params: dict) -> dict:
+        ts = params.get("ts")
+        return {"messages": [{"ts": ts, "thread_ts": ts, "text": "message"}], "has_more": False}
+
+    def method_views_open(self, params: dict) -> dict:
+        return {"view": {"id": "V0000001"}}
+
+    def method_usergroups_list(self, params: dict) -> dict:
+        return {"usergroups": self.server.usergroups}
+
+    def method_apps_connections_open(self, params: dict) -> dict:
+        return {"url": self.server.socket_mode_url}
+
+
+class FakeSlackServer(FakeServer):
+    """
+    Fake Slack Web API server running on a background thread
+
+    Args:
+        latency: Seconds added to every response
+        error_rate: Fraction of the responses replaced by an error
+        rate_limit: Requests per second accepted, the others get HTTP 429
+        channels: Channels names by id, the other channels are named after their id
+
+    Attributes:
+        socket_mode_url: WebSocket url returned by apps.connections.open
+        calls: The calls received by method, as (arrival time, params) tuples
+        messages: The chat.postMessage calls received, as (arrival time, params) tuples,
+            with the ts given to each message
+    """
+
+    def __init__(self, latency: float = 0, error_rate: float = 0, rate_limit: float = 0, channels: dict = None):
+        super().__init__(FakeSlackHandler, latency=latency, error_rate=error_rate, rate_limit=rate_limit)
+        self.channels = dict(channels or {})
+        self.usergroups = list()
+        self.socket_mode_url = None
+        self.calls = defaultdict(list)
+        self.messages = list()
+        self._ts = itertools.count(1)
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}/api/"
+
+    def channel_name(self, channel_id: str) -> str:
+        return self.channels.get(channel_id, (channel_id or "").lower())
+
+    def next_ts(self) -> str:
+        return f"{int(time.time())}.{next(self._ts):06d}"
+
+    def record_call(self, method: str, params: dict) -> None:
+        with self._counters_lock:
+            self.calls[method].append((time.monotonic(), params))
+
+    def reset(self) -> None:
+        """Clear the recorded calls and the counters"""
+        with self._counters_lock:
+            self.counters.clear()
+            self.calls.clear()
+            self.messages.clear()
+
+    def record_message(self, params: dict, ts: str) -> None:
+        with self._counters_lock:
+            self.messages.append((time.monotonic(), dict(params, ts=ts)))
@@ -0,0 +1,115 @@
+"""
+Local stand-in for the Slack Socket Mode WebSocket used by the benchmarks
+
+It accepts the bot connection, says hello and sends the Slack requests
+as envelopes, recording when each envelope is acknowledged. Point
+apps.connections.open to it with FakeSlackServer.socket_mode_url.
+"""
+
+import asyncio
+import itertools
+import json
+import socket
+import threading
+import time
+
+from typing import Optional
+
+from aiohttp import WSMsgType, web
+
+
+class FakeSocketModeServer:
+    """
+    Fake Socket Mode server running on a background event loop
+
+    Attributes:
+        sent_at: Send time of each envelope by envelope id
+        acks: The acks received by envelope id, as (arrival time, ack) tuples
+        connections: Number of WebSocket connections accepted
+    """
+
+    def __init__(self):
+        self.sent_at = dict()
+        self.acks = dict()
+        self.connections = 0
+        self.port = None
+        self._ids = itertools.count(1)
+        self._socket = None
+        self._connected = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="fake-socket-mode", daemon=True)
+        self._runner = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/link"
+
+    def __enter__(self) -> "FakeSocketModeServer":
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result(10)
+        return self
+
+    def __exit__(self, *exc_details) -> None:
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(10)
+
+    async def _start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/link", self._handle_link)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+
+    async def _handle_link(self, request: web.Request) -> web.WebSocketResponse:
+        websocket = web.WebSocketResponse(autoping=True)
+        await websocket.prepare(request)
+        self.connections += 1
+        await websocket.send_str(json.dumps({"type": "hello", "num_connections": 1}))
+        self._socket = websocket
+        self._connected.set()
+
+        async for message in websocket:
+            if message.type == WSMsgType.TEXT:
+                ack = json.loads(message.data)
+
+                if "envelope_id" in ack:
+                    self.acks[ack["envelope_id"]] = (time.monotonic(), ack)
+
+        return websocket
+
+    def wait_connection(self, timeout: float = 30) -> bool:
+        """Wait the bot to connect
+
+        Returns:
+            Whether the bot connected before the timeout
+        """
+        return self._connected.wait(timeout)
+
+    def send(self, envelope_type: str, payload: dict, envelope_id: Optional[str] = None) -> str:
+        """Send a Slack request to the bot
+
+        Args:
+            envelope_type: events_api, interactive or slash_commands
+            payload: The Slack request body
+            envelope_id: The envelope id, a new one when not set
+
+        Returns:
+            The envelope id
+        """
+        envelope_id = envelope_id or f"envelope-{next(self._ids)}"
+        envelope = {
+            "envelope_id": envelope_id,
+            "type": envelope_type,
+            "payload": payload,
+            "accepts_response_payload": envelope_type != "events_api",
+            "retry_attempt": 0,
+            "retry_reason": ""
+        }
+        self.sent_at[envelope_id] = time.monotonic()
+        asyncio.run_coroutine_threadsafe(self._socket.send_str(json.dumps(envelope)), self._loop).result(10)
+        return envelope_id
@@ -0,0 +1,305 @@
+"""
+Load generation helpers shared by the end-to-end benchmarks
+"""
+
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess  # nosec
+import sys
+import time
+import urllib.request
+
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import aiohttp
+
+from slack_sdk.signature import SignatureVerifier
+
+from benchmarks.fake_slack import BOT_ID
+from benchmarks.fake_socket_mode import FakeSocketModeServer
+
+PYTHON = sys.executable
+SIGNING_SECRET = "benchmark-signing-secret"  # nosec
+TEAM_ID = "T0000001"
+
+ENTRY_POINTS = {
+    "gunicorn": [PYTHON, "-m", "gunicorn", "--workers", "{workers}", "--threads", "8", "--bind", "127.0.0.1:{port}", "bot.main:app"],
+    "uvicorn": [PYTHON, "-m", "uvicorn", "--port", "{port}", "--log-level", "warning", "bot.main_async:app"],
+    "socket_mode": [PYTHON, "-m", "bot.main_socket_mode"]
+}
+
+# The stand-ins have no rate limits, so the bot ones don't cap the measured throughput
+UNLIMITED_RATE_LIMITS = json.dumps({
+    limit_name: [1000000, 1000] for limit_name in ["tier1", "tier2", "tier3", "tier4", "chat.postMessage", "az_devops"]
+})
+
+# (key, body, Socket Mode envelope type) of a Slack request
+SlackRequest = Tuple[str, dict, str]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, math.ceil(len(values) * percent / 100) - 1))]
+
+
+def bot_env(slack_url: str, az_devops_url: str, rate_limits: bool = False) -> dict:
+    """Environment that points the bot to the stand-in servers
+
+    Args:
+        slack_url: The fake Slack Web API url
+        az_devops_url: The fake Azure DevOps url
+        rate_limits: Whether the bot keeps its Slack and Azure DevOps rate limits
+    """
+    env = {
+        "SLACK_API_URL": slack_url,
+        "SLACK_BOT_TOKEN": "xoxb-benchmark",
+        "SLACK_SIGNING_SECRET": SIGNING_SECRET,
+        "SLACK_APP_TOKEN": "xapp-benchmark",
+        "AZ_DEVOPS_ORGANIZATION_URL": az_devops_url,
+        "AZ_DEVOPS_PERSONAL_ACCESS_TOKEN": "benchmark",
+        # Every message is replied, so each one has a completion to measure
+        "SLACK_REPLY_CHANNEL_COOLDOWN": "0"
+    }
+
+    if not rate_limits:
+        env.update(SLACK_RATE_LIMITS=UNLIMITED_RATE_LIMITS, AZ_DEVOPS_RATE_LIMITS=UNLIMITED_RATE_LIMITS)
+
+    return env
+
+
+def message_event(index: int, channel: str, text: str = "Preciso de ajuda") -> dict:
+    return {
+        "token": "verification-token",
+        "team_id": TEAM_ID,
+        "api_app_id": "A0000001",
+        "type": "event_callback",
+        "event_id": f"Ev{index:08d}",
+        "event_time": int(time.time()),
+        "event": {
+            "type": "message",
+            "channel": channel,
+            "channel_type": "channel",
+            "user": f"U{index:08d}",
+            "text": text,
+            "ts": f"{int(time.time())}.{index:06d}"
+        }
+    }
+
+
+def shortcut_payload(index: int, callback_id: str) -> dict:
+    return {
+        "type": "shortcut",
+        "token": "verification-token",
+        "action_ts": f"{time.time():.6f}",
+        "team": {"id": TEAM_ID, "domain": "benchmark"},
+        "user": {"id": f"U{index:08d}", "username": f"user-{index}", "team_id": TEAM_ID},
+        "callback_id": callback_id,
+        "trigger_id": f"trigger-{index:08d}"
+    }
+
+
+def view_submission_payload(index: int, callback_id: str) -> dict:
+    def selected(value):
+        return {"type": "static_select", "selected_option": {"value": value}}
+
+    return {
+        "type": "view_submission",
+        "token": "verification-token",
+        "team": {"id": TEAM_ID, "domain": "benchmark"},
+        "user": {"id": f"U{index:08d}", "name": f"user-{index}", "username": f"user-{index}", "team_id": TEAM_ID},
+        "api_app_id": "A0000001",
+        "trigger_id": f"trigger-{index:08d}",
+        "view": {
+            "id": f"V{index:08d}",
+            "team_id": TEAM_ID,
+            "type": "modal",
+            "callback_id": callback_id,
+            "bot_id": BOT_ID,
+            "hash": f"hash-{index}",
+            "state": {
+                "values": {
+                    "title_block": {"title": {"type": "plain_text_input", "value": f"Ticket {index}"}},
+                    "environment_block": {"environment": selected("Production")},
+                    "infrastructure_block": {"infrastructure": selected("Azure")},
+                    "product_block": {"product": selected("AKS")},
+                    "description_block": {"description": {"type": "plain_text_input", "value": "Load test"}}
+                }
+            }
+        }
+    }
+
+
+def event_request(event: dict) -> SlackRequest:
+    return event["event_id"], event, "events_api"
+
+
+def payload_request(key: str, payload: dict) -> SlackRequest:
+    return key, payload, "interactive"
+
+
+def http_body(body: dict, envelope_type: str) -> Tuple[str, str]:
+    """Serialize a Slack request like Slack sends it to the HTTP endpoint
+
+    Returns:
+        The request body and its content type
+    """
+    if envelope_type == "events_api":
+        return json.dumps(body), "application/json"
+
+    return urlencode({"payload": json.dumps(body)}), "application/x-www-form-urlencoded"
+
+
+def signed_headers(body: str, content_type: str = "application/json", signing_secret: str = SIGNING_SECRET) -> dict:
+    timestamp = str(int(time.time()))
+
+    return {
+        "Content-Type": content_type,
+        "X-Slack-Request-Timestamp": timestamp,
+        "X-Slack-Signature": SignatureVerifier(signing_secret).generate_signature(timestamp=timestamp, body=body)
+    }
+
+
+async def send_requests(url: str, requests: Iterable[SlackRequest], concurrency: int, rate: Optional[float] = None) -> dict:
+    """Send signed requests to the bot
+
+    Args:
+        url: The bot /slack/events url
+        requests: The requests to send
+        concurrency: Max requests in flight
+        rate: Requests started per second, None to send them as fast as the concurrency allows
+
+    Returns:
+        The send time and the ack latency of each request by key, and the failed acks count
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    sent_at = dict()
+    ack_latencies = dict()
+    failures = 0
+    started_at = time.monotonic()
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency)) as session:
+        async def send(index: int, key: str, request_body: dict, envelope_type: str) -> None:
+            nonlocal failures
+            body, content_type = http_body(request_body, envelope_type)
+
+            if rate:
+                await asyncio.sleep(max(started_at + index / rate - time.monotonic(), 0))
+
+            async with semaphore:
+                sent_at[key] = time.monotonic()
+
+                try:
+                    async with session.post(url, data=body, headers=signed_headers(body, content_type)) as response:
+                        await response.read()
+                        failures += response.status != 200
+                except aiohttp.ClientError:
+                    failures += 1
+
+                ack_latencies[key] = time.monotonic() - sent_at[key]
+
+        await asyncio.gather(*(send(index, *request) for index, request in enumerate(requests)))
+
+    return dict(sent_at=sent_at, ack_latencies=ack_latencies, failures=failures)
+
+
+async def send_events(url: str, events: Iterable[dict], concurrency: int) -> dict:
+    """Send Slack events to the bot with a limited number of requests in flight
+
+    Returns:
+        The send time of each event by event id and the failed acks count
+    """
+    return await send_requests(url, [event_request(event) for event in events], concurrency)
+
+
+def send_envelopes(socket_mode_server: FakeSocketModeServer, requests: List[SlackRequest], rate: Optional[float] = None) -> dict:
+    """Send the requests to the bot through the fake Socket Mode server,
+    keyed by envelope id
+
+    The acks arrive later on the socket, see envelope_acks
+
+    Args:
+        socket_mode_server: The server the bot is connected to
+        requests: The requests to send
+        rate: Requests sent per second, None to send them at once
+
+    Returns:
+        The send time of each request by key
+    """
+    started_at = time.monotonic()
+
+    for index, (key, body, envelope_type) in enumerate(requests):
+        if rate:
+            time.sleep(max(started_at + index / rate - time.monotonic(), 0))
+
+        socket_mode_server.send(envelope_type, body, envelope_id=key)
+
+    return dict(sent_at={key: socket_mode_server.sent_at[key] for key, _, _ in requests}, ack_latencies={}, failures=0)
+
+
+def envelope_acks(socket_mode_server: FakeSocketModeServer, sent: dict) -> dict:
+    """Add the ack latency of each envelope and the missing acks count to send_envelopes results"""
+    acks = dict(socket_mode_server.acks)
+    ack_latencies = {key: acks[key][0] - sent_at for key, sent_at in sent["sent_at"].items() if key in acks}
+
+    return dict(sent, ack_latencies=ack_latencies, failures=len(sent["sent_at"]) - len(ack_latencies))
+
+
+class BotServer:
+    """
+    Runs a bot entry point on a subprocess, like it runs on production
+
+    Args:
+        command: Server command, formatted with the port and the workers
+        env: Environment variables added to the current ones
+        workers: Server worker processes
+    """
+
+    def __init__(self, command: List[str], env: dict, workers: int = 1):
+        self.port = free_port()
+        self.command = [part.format(port=self.port, workers=workers) for part in command]
+        self.env = dict(os.environ, PORT=str(self.port), **env)
+        self.process = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "BotServer":
+        self.process = subprocess.Popen(  # nosec
+            self.command, env=self.env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + 30
+
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"{' '.join(self.command)} exited with {self.process.returncode}")
+
+            try:
+                urllib.request.urlopen(f"{self.url}/health", timeout=1)  # nosec
+                return self
+            except OSError:
+                time.sleep(0.1)
+
+        self.__exit__()
+        raise RuntimeError(f"{' '.join(self.command)} didn't start")
+
+    def __exit__(self, *exc_details) -> None:
+        self.process.terminate()
+
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
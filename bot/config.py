@@ -2,11 +2,12 @@
 Configuration module
 """
 
-import json
 import os
+import json
 import logging
 
 from base64 import b64encode
+from types import MappingProxyType
 from typing import Optional, Union
 from jinja2 import (
     Environment,
@@ -15,12 +16,8 @@ from jinja2 import (
     select_autoescape
 )
 
-# Logging configuration
-logging.basicConfig(
-    format="[%(asctime)s] [%(process)s] [%(levelname)s] %(filename)s:%(lineno)s:%(funcName)s() - %(message)s",
-    datefmt="%F %T %z",
-    level=logging.INFO
-)
+from bot.libs.json_template import JsonTemplate
+from bot.libs.logs import setup_logging
 
 
 class Config:
@@ -30,19 +27,120 @@ class Config:
     Args:
         port: Bot listening http port. Default: 5000
         logger: Instance of logging to manage logs info
-        template_env: Jinja2 templates dir environment
+        log_level: Root logger level. Default: INFO
+        log_format: text or json, a JSON object by line with the traceback as a field. Default: text
+        log_queue_size: Max log records waiting to be written by the listener thread, the
+            next ones are dropped so logging never blocks a request. Default: 10000
+        log_sampling_burst: Warnings and errors logged by call site each sampling window,
+            the next ones are suppressed and counted. 0 logs all of them. Default: 10
+        log_sampling_window: Seconds of each log sampling window. Default: 60
+        startup_warmup: Create the Azure DevOps client and load the team settings on a background
+            thread after the startup, set to false to create them on the first ticket. Default: true
         az_organization_url: Azure organization url
         az_devops_pat: Azure Devops personal access token
+        az_devops_pool_size: Max keep-alive connections to Azure DevOps. Default: 10
+        az_devops_timeout: Seconds to wait the Azure DevOps responses. Default: 30
+        az_devops_team_settings_ttl: Seconds that the team settings are cached. Default: 3600
+        az_devops_batch_window: Seconds that the work items creations are collected
+            to be sent on a single $batch call, 0 disables the batching. Default: 0
+        az_devops_batch_max_size: Max work items created by a $batch call, up to 200. Default: 50
+        az_devops_rate_limits: [requests per minute, burst] of the Azure DevOps calls,
+            JSON merged over the defaults. Default: {"az_devops": [600, 20]}
+        tracing_enabled: Trace each Slack request, with a span for its handlers, steps and
+            Slack and Azure DevOps calls. Default: true
+        tracing_slow_request_threshold: Seconds after which a request is logged with its spans
+            breakdown, 0 disables the log. Default: 5
+        tracing_otlp_file: File where the traces are appended as OTLP/JSON lines
+        tracing_otlp_endpoint: OTLP/HTTP collector base url where the traces are posted as JSON
+        tracing_service_name: service.name of the exported traces. Default: slack-bot
+        cache_db: SQLite database where the Slack and Azure DevOps metadata caches are
+            shared by the workers of a host, when not set each process caches them in memory
+        rate_limit_deadline: Max seconds an outbound call waits its turn and retries. Default: 30
+        work_queue_workers: Threads processing the acknowledged requests. Default: 4
+        work_queue_size: Max requests waiting to be processed. Default: 100
+        work_queue_shutdown_timeout: Seconds to drain the queue on shutdown. Default: 30
+        step_graph_workers: Threads running the concurrent steps of a request. Default: 8
         slack_bot_token: Bot token from https://api.slack.com/apps
         slack_signing_secret: Bot signing secret token from https://api.slack.com/apps
-        slack_shortcuts: Slack shortcuts configurations
+        slack_app_token: App-level token with connections:write, used by the Socket Mode entry point
+        slack_socket_mode_concurrency: Threads handling the Socket Mode requests. Default: 10
+        slack_api_url: Slack Web API base url. Default: https://slack.com/api/
+        slack_channels_cache_size: Max number of channels info cached. Default: 1024
+        slack_channels_cache_ttl: Seconds that a channel info is cached. Default: 3600
+        slack_conversations_page_size: Channels fetched per users_conversations page. Default: 200
+        slack_dedup_ttl: Seconds that a Slack delivery is remembered to ignore its retries. Default: 3600
+        slack_dedup_size: Max Slack deliveries remembered. Default: 10000
+        slack_dedup_db: SQLite database shared by the workers to remember the Slack
+            deliveries, when not set they are remembered by each process
+        slack_rate_limits: [requests per minute, burst] by Slack Web API tier, JSON merged
+            over the defaults. chat.postMessage is limited by channel. Default: tier1 [1, 1],
+            tier2 [20, 5], tier3 [50, 10], tier4 [100, 20], chat.postMessage [60, 3]
+        slack_thread_parents_cache_size: Max number of thread parents cached for the reactions. Default: 4096
+        slack_thread_parents_cache_ttl: Seconds that a thread parent is cached. Default: 86400
+        slack_reaction_rules: Rules by reaction name, JSON merged over the defaults. The
+            thread_reply action replies the text on the reacted message thread, formatted
+            with the user and the reaction. Default: eyes replies that the user is looking
+        slack_reply_channel_cooldown: Seconds between the bot replies on a channel, the
+            messages sent in between are not replied. 0 replies every message. Default: 300
+        slack_reply_user_cooldown: Seconds between the ephemeral replies to a user on a
+            channel, sent when the channel reply is on cooldown. 0 disables them. Default: 3600
+        slack_reply_cooldown_size: Max channels and users whose last reply is kept. Default: 10000
+        slack_merged_thread_reply: Post the SLA, the support team mention and the card link
+            as a single thread reply, updated when the card is created. Default: false
+        slack_channel_reply_text: Bot reply for messages sent to the shortcuts channels
+        slack_shortcuts: Slack shortcuts configurations, slack_support_team is the
+            handle of the usergroup mentioned on the tickets
+        slack_shortcuts_path: JSON or YAML file, or directory of them, with the shortcuts
+            configurations by callback_id. When set, it replaces slack_shortcuts
+        slack_shortcuts_reload_interval: Seconds between the checks for changes on
+            slack_shortcuts_path, 0 loads it only on startup. Default: 10
     """
     logger = logging.getLogger(__name__)
+    log_level = os.environ.get("LOG_LEVEL", "INFO")
+    log_format = os.environ.get("LOG_FORMAT", "text").lower()
+    log_queue_size = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+    log_sampling_burst = int(os.environ.get("LOG_SAMPLING_BURST", 10))
+    log_sampling_window = float(os.environ.get("LOG_SAMPLING_WINDOW", 60))
+    _channels_index = None
+    _templates = dict()
+    _templates_env = None
     port = os.environ.get('PORT', 5000)
-    templates_env = Environment(
-        loader=PackageLoader("bot"),
-        autoescape=select_autoescape()
-    )
+    startup_warmup = os.environ.get("STARTUP_WARMUP", "true").lower() == "true"
+
+    @classmethod
+    def get_templates_env(cls) -> Environment:
+        """Get the Jinja2 templates dir environment, created on the first use
+
+        Returns:
+            The templates environment
+        """
+        if cls._templates_env is None:
+            cls._templates_env = Environment(
+                loader=PackageLoader("bot"),
+                autoescape=select_autoescape()
+            )
+
+        return cls._templates_env
+
+    @classmethod
+    def get_template(cls, template: str) -> JsonTemplate:
+        """Get a template from templates dir, parsed once and cached
+
+        Args:
+            template: Template file name
+
+        Returns:
+            The parsed template
+        """
+        json_template = cls._templates.get(template)
+
+        if json_template is None:
+            templates_env = cls.get_templates_env()
+            source = templates_env.loader.get_source(templates_env, template)[0]
+            json_template = JsonTemplate(templates_env.get_template(template), source)
+            cls._templates[template] = json_template
+
+        return json_template
 
     @classmethod
     def load_template(cls, template: str, **kwargs) -> Optional[Union[list, dict]]:
@@ -56,39 +154,204 @@ class Config:
             The template file content
         """
         try:
-            template = cls.templates_env.get_template(template)
-            return json.loads(template.render(**kwargs), strict=False)
+            return cls.get_template(template).render(**kwargs)
         except TemplateNotFound:
-            return cls.logger.error(f"Template {template} not found.")
+            return cls.logger.error("Template %s not found.", template)
 
     @classmethod
-    def get_channel_shortcuts(cls, channel_name: str) -> list:
+    def validate_templates(cls, slack_shortcuts: dict = None) -> None:
+        """Load all the templates used by Config.slack_shortcuts,
+        so the missing and invalid templates are found on startup
+
+        Args:
+            slack_shortcuts: Shortcuts configurations to validate instead of Config.slack_shortcuts
+
+        Raises:
+            ValueError: When a template is missing or invalid
+        """
+        errors = list()
+
+        if slack_shortcuts is None:
+            slack_shortcuts = cls.slack_shortcuts
+
+        for shortcut, shortcut_config in slack_shortcuts.items():
+            for template_key in ["slack_template", "az_devops_board_template"]:
+                template = shortcut_config.get(template_key)
+
+                try:
+                    cls.get_template(template)
+                except TemplateNotFound:
+                    errors.append(f"{shortcut}.{template_key}: template {template} not found")
+                except ValueError as error:
+                    errors.append(f"{shortcut}.{template_key}: template {template} is not a valid JSON: {error}")
+
+        if errors:
+            raise ValueError("Invalid templates: " + "; ".join(errors))
+
+    @classmethod
+    def build_channels_index(cls, slack_shortcuts: dict) -> tuple:
+        """Build the channel -> shortcuts index and the channels reply text
+
+        Args:
+            slack_shortcuts: Slack shortcuts configurations
+
+        Returns:
+            A tuple with the indexed slack_shortcuts, the shortcuts
+            names by channel and the reply text by channel
+        """
+        channels_shortcuts = dict()
+
+        for shortcut, shortcut_config in slack_shortcuts.items():
+            channel_name = shortcut_config.get("slack_channel")
+            channels_shortcuts.setdefault(channel_name, []).append(shortcut)
+
+        channels_shortcuts = {
+            channel_name: tuple(shortcuts)
+            for channel_name, shortcuts in channels_shortcuts.items()
+        }
+        channels_reply_text = {
+            channel_name: cls.slack_channel_reply_text.format(
+                shortcuts=", ".join("/" + shortcut for shortcut in shortcuts)
+            )
+            for channel_name, shortcuts in channels_shortcuts.items()
+        }
+
+        return (
+            slack_shortcuts,
+            MappingProxyType(channels_shortcuts),
+            MappingProxyType(channels_reply_text)
+        )
+
+    @classmethod
+    def get_channels_index(cls) -> tuple:
+        """Get the channels index, rebuilding it when slack_shortcuts changes
+
+        Returns:
+            A tuple with the indexed slack_shortcuts, the shortcuts
+            names by channel and the reply text by channel
+        """
+        channels_index = cls._channels_index
+
+        if channels_index is None or channels_index[0] is not cls.slack_shortcuts:
+            channels_index = cls.build_channels_index(cls.slack_shortcuts)
+            cls._channels_index = channels_index
+
+        return channels_index
+
+    @classmethod
+    def set_slack_shortcuts(cls, slack_shortcuts: dict) -> None:
+        """Replace the shortcuts configurations while the bot is running
+
+        The channels index is built before the swap and each one is
+        replaced by a single assignment, so the handlers read either the
+        previous or the new configurations without a lock
+
+        Args:
+            slack_shortcuts: The new shortcuts configurations
+        """
+        channels_index = cls.build_channels_index(slack_shortcuts)
+        cls.slack_shortcuts = slack_shortcuts
+        cls._channels_index = channels_index
+
+    @classmethod
+    def get_channel_shortcuts(cls, channel_name: str) -> tuple:
         """Get the shortcuts associated to a Slack Channel
 
         Args:
             channel_name: The channel name
 
         Returns:
-            A list with shortcuts names
+            A tuple with shortcuts names
         """
-        channel_shortcuts = list()
+        return cls.get_channels_index()[1].get(channel_name, ())
 
-        try:
-            for shortcut in cls.slack_shortcuts:
-                if cls.slack_shortcuts[shortcut].get("slack_channel") == channel_name:
-                    channel_shortcuts.append(shortcut)
-            return channel_shortcuts
-        except Exception:
-            cls.logger.error(f"No shortcuts found for channel {channel_name}", exc_info=True)
+    @classmethod
+    def get_channel_reply_text(cls, channel_name: str) -> str:
+        """Get the bot reply text for messages sent to a Slack Channel
+
+        Args:
+            channel_name: The channel name
+
+        Returns:
+            The reply text listing the channel shortcuts
+        """
+        reply_text = cls.get_channels_index()[2].get(channel_name)
+
+        if reply_text is None:
+            reply_text = cls.slack_channel_reply_text.format(shortcuts="")
+
+        return reply_text
 
     # Azure DevOps configurations
     az_devops_organization_url = os.environ.get("AZ_DEVOPS_ORGANIZATION_URL")
     az_devops_pat = os.environ.get("AZ_DEVOPS_PERSONAL_ACCESS_TOKEN")
     az_devops_pat_b64 = b64encode(f"'':{az_devops_pat}".encode()).decode()
+    az_devops_pool_size = int(os.environ.get("AZ_DEVOPS_POOL_SIZE", 10))
+    az_devops_timeout = int(os.environ.get("AZ_DEVOPS_TIMEOUT", 30))
+    az_devops_team_settings_ttl = int(os.environ.get("AZ_DEVOPS_TEAM_SETTINGS_TTL", 3600))
+    az_devops_batch_window = float(os.environ.get("AZ_DEVOPS_BATCH_WINDOW", 0))
+    az_devops_batch_max_size = int(os.environ.get("AZ_DEVOPS_BATCH_MAX_SIZE", 50))
+    az_devops_rate_limits = dict(
+        {"az_devops": [600, 20]},
+        **json.loads(os.environ.get("AZ_DEVOPS_RATE_LIMITS", "{}"))
+    )
+    tracing_enabled = os.environ.get("TRACING_ENABLED", "true").lower() == "true"
+    tracing_slow_request_threshold = float(os.environ.get("TRACING_SLOW_REQUEST_THRESHOLD", 5))
+    tracing_otlp_file = os.environ.get("TRACING_OTLP_FILE")
+    tracing_otlp_endpoint = os.environ.get("TRACING_OTLP_ENDPOINT")
+    tracing_service_name = os.environ.get("TRACING_SERVICE_NAME", "slack-bot")
+    cache_db = os.environ.get("CACHE_DB")
+    rate_limit_deadline = float(os.environ.get("RATE_LIMIT_DEADLINE", 30))
+
+    # Background work queue configurations
+    work_queue_workers = int(os.environ.get("WORK_QUEUE_WORKERS", 4))
+    work_queue_size = int(os.environ.get("WORK_QUEUE_SIZE", 100))
+    work_queue_shutdown_timeout = int(os.environ.get("WORK_QUEUE_SHUTDOWN_TIMEOUT", 30))
+    step_graph_workers = int(os.environ.get("STEP_GRAPH_WORKERS", 8))
 
     # Slack configurations
     slack_bot_token = os.environ.get("SLACK_BOT_TOKEN")
     slack_signing_secret = os.environ.get("SLACK_SIGNING_SECRET")
+    slack_app_token = os.environ.get("SLACK_APP_TOKEN")
+    slack_socket_mode_concurrency = int(os.environ.get("SLACK_SOCKET_MODE_CONCURRENCY", 10))
+    slack_api_url = os.environ.get("SLACK_API_URL", "https://slack.com/api/")
+    slack_channels_cache_size = int(os.environ.get("SLACK_CHANNELS_CACHE_SIZE", 1024))
+    slack_channels_cache_ttl = int(os.environ.get("SLACK_CHANNELS_CACHE_TTL", 3600))
+    slack_conversations_page_size = int(os.environ.get("SLACK_CONVERSATIONS_PAGE_SIZE", 200))
+    slack_dedup_ttl = int(os.environ.get("SLACK_DEDUP_TTL", 3600))
+    slack_dedup_size = int(os.environ.get("SLACK_DEDUP_SIZE", 10000))
+    slack_dedup_db = os.environ.get("SLACK_DEDUP_DB")
+    slack_rate_limits = dict(
+        {
+            "tier1": [1, 1],
+            "tier2": [20, 5],
+            "tier3": [50, 10],
+            "tier4": [100, 20],
+            "chat.postMessage": [60, 3]
+        },
+        **json.loads(os.environ.get("SLACK_RATE_LIMITS", "{}"))
+    )
+    slack_thread_parents_cache_size = int(os.environ.get("SLACK_THREAD_PARENTS_CACHE_SIZE", 4096))
+    slack_thread_parents_cache_ttl = int(os.environ.get("SLACK_THREAD_PARENTS_CACHE_TTL", 86400))
+    slack_reaction_rules = dict(
+        {
+            "eyes": {
+                "action": "thread_reply",
+                "text": ":eyes: <@{user}> está de olho na sua solicitação!"
+            }
+        },
+        **json.loads(os.environ.get("SLACK_REACTION_RULES", "{}"))
+    )
+    slack_reply_channel_cooldown = int(os.environ.get("SLACK_REPLY_CHANNEL_COOLDOWN", 300))
+    slack_reply_user_cooldown = int(os.environ.get("SLACK_REPLY_USER_COOLDOWN", 3600))
+    slack_reply_cooldown_size = int(os.environ.get("SLACK_REPLY_COOLDOWN_SIZE", 10000))
+    slack_merged_thread_reply = os.environ.get("SLACK_MERGED_THREAD_REPLY", "false").lower() == "true"
+    slack_shortcuts_path = os.environ.get("SLACK_SHORTCUTS_PATH")
+    slack_shortcuts_reload_interval = float(os.environ.get("SLACK_SHORTCUTS_RELOAD_INTERVAL", 10))
+    slack_channel_reply_text = (
+        ":robot_face: Para suporte, favor utilizar o(s) atalho(s): "
+        "*{shortcuts}* e preencha o formulário correspondente."
+    )
     slack_shortcuts = {
         "devops_support": {
             "az_devops_board": "devops",
@@ -102,6 +365,7 @@ class Config:
                 "Production": "3 days"
             },
             "slack_channel": "devops-support",
+            "slack_support_team": "tis-administration",
             "slack_template": "slack/devops_shortcut_support.json"
         },
         "coud_support": {
@@ -116,6 +380,17 @@ class Config:
                 "Production": "3 days"
             },
             "slack_channel": "cloud-support",
+            "slack_support_team": "tis-administration",
             "slack_template": "slack/cloud_shortcut_support.json"
         }
     }
+
+
+# Logging configuration, the records are written by a listener thread
+setup_logging(
+    level=Config.log_level,
+    json_output=Config.log_format == "json",
+    queue_size=Config.log_queue_size,
+    sampling_burst=Config.log_sampling_burst,
+    sampling_window=Config.log_sampling_window
+)
@@ -2,18 +2,121 @@
 Slack messages handler module
 """
 
+from typing import Optional
+
 from bot.config import Config
+from bot.libs.metrics import SLACK_AUTO_REPLIES, instrument_handler
+from bot.libs.cache import create_cache
 from bot.handlers.slack.handle_reactions import HandleReactions
 
+IGNORED_MESSAGE_SUBTYPES = frozenset([
+    "bot_message",
+    "channel_leave",
+    "channel_join",
+    "channel_topic",
+    "channel_purpose",
+    "message_deleted",
+    "message_changed"
+])
+
+
 class HandleMessages(HandleReactions):
     """
     Class to handle slack channel messages
+
+    The bot replies a channel once per Config.slack_reply_channel_cooldown.
+    The users that send a message while it's on cooldown get the reply as
+    an ephemeral message, once per Config.slack_reply_user_cooldown.
+
+    Attributes:
+        channels_cache: Channels info cached by channel id
+        channel_reply_cooldowns: Channels replied in the cooldown window
+        user_reply_cooldowns: (channel, user) replied in the cooldown window
     """
 
     def __init__(self, slack_app: object):
+        self.channels_cache = create_cache(
+            "slack-channels",
+            maxsize=Config.slack_channels_cache_size,
+            ttl=Config.slack_channels_cache_ttl
+        )
+        self.channel_reply_cooldowns = create_cache(
+            "slack-channel-reply-cooldowns",
+            maxsize=Config.slack_reply_cooldown_size,
+            ttl=Config.slack_reply_channel_cooldown
+        )
+        self.user_reply_cooldowns = create_cache(
+            "slack-user-reply-cooldowns",
+            maxsize=Config.slack_reply_cooldown_size,
+            ttl=Config.slack_reply_user_cooldown
+        )
+        self.auto_replies = {
+            result: SLACK_AUTO_REPLIES.labels(result=result) for result in ["sent", "ephemeral", "suppressed"]
+        }
         slack_app.event("message")(self.handle_message)
+
+        for channel_event in ["channel_rename", "channel_archive", "channel_deleted"]:
+            slack_app.event(channel_event)(self.handle_channel_changed)
+
         super().__init__(slack_app)
 
+    def get_channel_info(self, client: object, channel_id: str) -> dict:
+        """Get a channel info from the cache or from the Slack API
+
+        Args:
+            client: Slack App instance
+            channel_id: The channel id
+
+        Returns:
+            The channel info
+        """
+        channel_info = self.channels_cache.get(channel_id)
+
+        if channel_info is None:
+            channel_info = client.conversations_info(channel=channel_id)["channel"]
+            self.channels_cache.set(channel_id, channel_info)
+
+        return channel_info
+
+    def handle_channel_changed(self, event: dict) -> None:
+        """Evict a renamed, archived or deleted channel from the channels cache
+
+        Args:
+            event: Slack event info
+        """
+        channel = event.get("channel")
+
+        if isinstance(channel, dict):
+            channel = channel.get("id")
+
+        self.channels_cache.delete(channel)
+
+    def get_reply_kind(self, message: dict) -> Optional[str]:
+        """Claim the reply of a message on the channel and user cooldowns
+
+        Args:
+            message: Slack message object
+
+        Returns:
+            sent when the channel is replied, ephemeral when only the
+            user is replied or None when the reply is suppressed
+        """
+        user_key = (message["channel"], message.get("user"))
+
+        if self.channel_reply_cooldowns.add(message["channel"], True):
+            reply_kind = "sent"
+
+            # The user just saw the channel reply, so it isn't sent again as ephemeral
+            self.user_reply_cooldowns.set(user_key, True)
+        elif Config.slack_reply_user_cooldown > 0 and message.get("user") and self.user_reply_cooldowns.add(user_key, True):
+            reply_kind = "ephemeral"
+        else:
+            reply_kind = None
+
+        self.auto_replies[reply_kind or "suppressed"].inc()
+        return reply_kind
+
+    @instrument_handler("handle_message")
     def handle_message(self, client: object, message: dict, say: object) -> None:
         """Handle messages from slack channel
 
@@ -23,28 +126,20 @@ class HandleMessages(HandleReactions):
             say: Slack client say function
         """
 
-        channel_info = client.conversations_info(channel=message["channel"])["channel"]
-        channel_shortcuts_list = Config.get_channel_shortcuts(channel_info["name"])
-        channel_shortcuts = ", ".join(map(lambda x: "/" + x, channel_shortcuts_list))
-        bot_message_text = (
-            f":robot_face: Para suporte, favor utilizar o(s) atalho(s): "
-            f"*{channel_shortcuts}* e preencha o formulário correspondente."
-        )
+        if message.get("thread_ts") or message.get("subtype") in IGNORED_MESSAGE_SUBTYPES:
+            return
+
+        reply_kind = self.get_reply_kind(message)
 
-        if message.get("thread_ts"):
+        if reply_kind is None:
             return
 
-        if not message.get("subtype") in [
-            "bot_message",
-            "channel_leave",
-            "channel_join",
-            "channel_topic",
-            "channel_purpose",
-            "message_deleted",
-            "message_changed"
-        ]:
-            say(bot_message_text)
+        channel_info = self.get_channel_info(client, message["channel"])
+        bot_message_text = Config.get_channel_reply_text(channel_info["name"])
 
-            return bot_message_text
+        if reply_kind == "ephemeral":
+            client.chat_postEphemeral(channel=message["channel"], user=message["user"], text=bot_message_text)
+        else:
+            say(bot_message_text)
 
-        return
+        return bot_message_text
@@ -2,16 +2,115 @@
 Slack message reactions handler module
 """
 
+from typing import Optional
+
 from bot.config import Config
+from bot.libs.cache import create_cache
+from bot.libs.metrics import instrument_handler
+
 
 class HandleReactions:
     """
     Class to handle slack message reactions
+
+    The reactions are matched against Config.slack_reaction_rules
+    before any Slack call, so the reactions without a rule cost nothing
+
+    Attributes:
+        reaction_rules: Rules by reaction name
+        reaction_actions: Action functions by action name
+        thread_parents_cache: Thread parent ts cached by (channel, message ts), only
+            for the messages found on a thread
     """
 
     def __init__(self, slack_app: object):
+        self.reaction_actions = {"thread_reply": self.reply_in_thread}
+        self.reaction_rules = dict(Config.slack_reaction_rules)
+        self.thread_parents_cache = create_cache(
+            "slack-thread-parents",
+            maxsize=Config.slack_thread_parents_cache_size,
+            ttl=Config.slack_thread_parents_cache_ttl
+        )
+
+        for reaction, rule in self.reaction_rules.items():
+            if rule.get("action") not in self.reaction_actions:
+                raise ValueError(f"Reaction {reaction}: unknown action {rule.get('action')}")
+
         slack_app.event("reaction_added")(self.handle_reactions_added)
 
+    def get_reaction_rule(self, event: dict) -> Optional[dict]:
+        """Get the rule of a reaction added to a message
+
+        Args:
+            event: Slack event trigger info
+
+        Returns:
+            The reaction rule or None when the reaction is ignored
+        """
+        if not event or event.get("item", {}).get("type") != "message":
+            return None
+
+        return self.reaction_rules.get(event.get("reaction"))
+
+    def get_thread_parent_ts(self, client: object, channel_id: str, message_ts: str) -> Optional[str]:
+        """Get the thread parent of a message from the cache or from the Slack API
+
+        Args:
+            client: Slack App instance
+            channel_id: The message channel id
+            message_ts: The message timestamp
+
+        Returns:
+            The thread parent timestamp, None when the message isn't on a thread
+        """
+        parent_thread_ts = self.thread_parents_cache.get((channel_id, message_ts))
+
+        if not parent_thread_ts:
+            message = client.conversations_replies(channel=channel_id, ts=message_ts, limit=1)["messages"][0]
+            parent_thread_ts = message.get("thread_ts")
+
+            # A message starts a thread with its first reply, so the messages
+            # without a thread are looked up again on their next reaction
+            if parent_thread_ts:
+                self.thread_parents_cache.set((channel_id, message_ts), parent_thread_ts)
+
+        return parent_thread_ts
+
+    @staticmethod
+    def build_thread_reply(rule: dict, event: dict, thread_ts: str) -> dict:
+        """Build the thread reply of a reaction rule
+
+        Args:
+            rule: The reaction rule
+            event: Slack event trigger info
+            thread_ts: The thread parent timestamp
+
+        Returns:
+            The chat_postMessage arguments
+        """
+        return dict(
+            text=rule["text"].format(user=event["user"], reaction=event["reaction"]),
+            channel=event["item"]["channel"],
+            thread_ts=thread_ts
+        )
+
+    def reply_in_thread(self, client: object, rule: dict, event: dict) -> None:
+        """Reply a reaction on the thread of the reacted message, the
+        reactions on messages that aren't on a thread are not replied
+
+        Args:
+            client: Slack App instance
+            rule: The reaction rule
+            event: Slack event trigger info
+        """
+        thread_ts = self.get_thread_parent_ts(client, event["item"]["channel"], event["item"]["ts"])
+
+        if thread_ts is None:
+            return
+
+        client.chat_postMessage(**self.build_thread_reply(rule, event, thread_ts))
+
+    @instrument_handler("handle_reactions_added")
     def handle_reactions_added(self, client: object, body: dict, event: dict, logger: Config.logger) -> None:
         """Handle reactions on messages
 
@@ -19,23 +118,12 @@ class HandleReactions:
             client: Slack App instance
             event: Slack event trigger info
         """
+        rule = self.get_reaction_rule(event)
 
-        if not event:
+        if rule is None:
             return
 
         try:
-            oldest_thread_reply = client.conversations_replies(
-                channel=event["item"]["channel"],
-                ts=event["item"]["ts"],
-                limit=1
-            )
-            parent_thread_ts = oldest_thread_reply["messages"][0]["thread_ts"]
-
-            if event["reaction"] == "eyes":
-                client.chat_postMessage(
-                    text=f":eyes: <@{event['user']}> está de olho na sua solicitação!",
-                    channel=event["item"]["channel"],
-                    thread_ts=parent_thread_ts
-                )
-        except Exception as error:
-            logger.error(f"Error: failed to process the reaction: {event['reaction']}", exc_info=True)
+            self.reaction_actions[rule["action"]](client, rule, event)
+        except Exception:
+            logger.error("Error: failed to process the reaction: %s", event["reaction"], exc_info=True)
@@ -1,29 +1,66 @@
 """
 Slack handle shortcut support module
 """
+import re
+
+from typing import Optional
+
 from bot.config import Config
+from bot.libs.metrics import instrument_handler
 from bot.libs.az_devops_client import AzDevOpsClient
-from bot.handlers.slack.handle_reactions import HandleReactions
+from bot.libs.slack_resolver import SlackResolver
+from bot.libs.step_graph import StepGraph
+from bot.libs.work_queue import WorkQueue
 
 
-class HandleShortcutSupport(HandleReactions):
+class HandleShortcutSupport:
     """Class to handle slack channel support shortcut
 
+    The listeners are registered only once and the shortcuts and
+    view submissions are routed by their callback_id, matched against
+    the current shortcuts so the ones reloaded while running are routed
+
     Attributes:
-        callback_id: Slack shortcut callback_id
+        shortcuts: Dispatch table with the shortcut configs by callback_id,
+                   read once by request so it keeps the same config
+        slack_resolver: Cached bot identity and subscribed channels
+        work_queue: Queue where the submissions are processed,
+                    when not set they are processed on the request thread
     """
 
-    callback_id = None
+    resolver_class = SlackResolver
+
+    def __init__(self, slack_app: object, work_queue: WorkQueue = None):
+        self.slack_resolver = self.resolver_class()
+        self.work_queue = work_queue
+        callback_ids = re.compile(".+")
+        slack_app.shortcut(callback_ids, matchers=[self.is_shortcut])(self.handle_shortcut)
+        slack_app.view_submission(callback_ids, matchers=[self.is_shortcut])(self.handle_shortcut_submission)
+        slack_app.event("member_joined_channel")(self.slack_resolver.handle_member_joined_channel)
+        slack_app.event("channel_left")(self.slack_resolver.handle_channel_left)
+
+        for subteam_event in ["subteam_created", "subteam_updated"]:
+            slack_app.event(subteam_event)(self.slack_resolver.handle_subteam_changed)
 
-    def __init__(self, slack_app: object):
-        self.shortcut_config = Config.slack_shortcuts.get(self.callback_id)
-        slack_app.shortcut(self.callback_id)(self.handle_shortcut)
-        slack_app.view_submission("")(self.handle_shortcut_submission)
-        super().__init__(slack_app)
+    @property
+    def shortcuts(self) -> dict:
+        return Config.slack_shortcuts
 
+    def is_shortcut(self, body: dict) -> bool:
+        """Listener matcher of the shortcuts and view submissions with a shortcut config
+
+        Args:
+            body: Slack shortcut or view submission body
+        """
+        return (body.get("view") or body).get("callback_id") in self.shortcuts
+
+    @instrument_handler("handle_shortcut")
     def handle_shortcut(self, ack: object, client: object, shortcut: dict, logger: Config.logger) -> None:
         """Handle shortcut modal view openning
 
+        The modal view receives the shortcut callback_id, so its
+        submission can be routed to the same shortcut config
+
         Args:
             ack: Acknowledge the command request
             client: Slack App instance
@@ -31,158 +68,458 @@ class HandleShortcutSupport(HandleReactions):
         """
         ack()
 
-        if self.shortcut_config:
+        callback_id = shortcut.get("callback_id")
+        shortcut_config = self.shortcuts.get(callback_id)
+
+        if shortcut_config:
             client.views_open(
                 trigger_id=shortcut["trigger_id"],
-                view=Config.load_template(
-                    self.shortcut_config["slack_template"]
-                )
+                view=dict(Config.load_template(shortcut_config["slack_template"]), callback_id=callback_id)
             )
         else:
-            logger.error(f"No config found for the shortcut {self.callback_id}")
-
+            logger.error("No config found for the shortcut %s", callback_id)
 
+    @instrument_handler("handle_shortcut_submission")
     def handle_shortcut_submission(
-        self, ack: object, body: dict, client: object, event: dict, logger: Config.logger
+        self, ack: object, body: dict, client: object, event: dict, logger: Config.logger, context: dict = None
     ) -> None:
         """Handle shortcut modal view submission
 
+        The submission is acknowledged right away and processed on the
+        work queue. When the queue is full, the modal shows an error
+        so the user can submit it again, and the submission is released
+        from the deduplication so the same view is accepted again.
+
         Args:
             ack: Acknowledge the command request
             body: Slack message body info
             client: Slack App instance
             event: Slack events info
             logger: Logging instance
+            context: Bolt context, with the release_delivery function of the Deduplicator
         """
-        ack()
+        shortcut_config = self.shortcuts.get(body["view"]["callback_id"])
 
-        az_devops_client = AzDevOpsClient()
-        az_devops_team_settings = az_devops_client.get_team_settings(
-            self.shortcut_config["az_devops_project"]
-        )
+        if not shortcut_config:
+            ack()
+            return logger.error("No config found for the shortcut %s", body["view"]["callback_id"])
 
-        # view_blocks = list(map(lambda x: x["block_id"], body["view"]["blocks"]))
-        view_state_values = body["view"]["state"]["values"]
+        if not self.work_queue:
+            ack()
+            return self.process_shortcut_submission(body, client, logger, shortcut_config)
 
-        support_team_id = "S02L8NJ4T27"  # @tis-administration
-        user_name = body["user"]["name"]
-        title = view_state_values["title_block"]["title"]["value"].replace('"', "'")
-        environment = view_state_values["environment_block"]["environment"]["selected_option"]["value"]
-        infrastructure = view_state_values["infrastructure_block"]["infrastructure"]["selected_option"]["value"]
-        product = view_state_values["product_block"]["product"]["selected_option"]["value"]
-        description = view_state_values["description_block"]["description"]["value"].replace('"', "'")
-        bot_message_text = (
-            f"*Resumo da Solicitação:* {title}\n"
-            f"*Ambiente:* {environment}\n"
-            f"*Infraestrutura:* {infrastructure}\n"
-            f"*Produto ou Serviço:* {product}\n"
-            f"*Informações Complementares:* {description}"
-        )
+        if self.work_queue.submit(self.process_shortcut_submission, body, client, logger, shortcut_config):
+            ack()
+        else:
+            if context and context.get("release_delivery"):
+                context["release_delivery"]()
 
-        # Get bot user_id and channels that it's subscribed
-        bot_id = body["view"]["bot_id"]
-        bot_user_id = client.bots_info(bot=bot_id).get("bot").get("user_id")
-        bot_subscribed_channels = client.users_conversations(user=bot_user_id).get("channels", [])
+            ack(
+                response_action="errors",
+                errors={"title_block": "Muitas solicitações no momento, tente novamente."}
+            )
+
+    @instrument_handler("process_shortcut_submission")
+    def process_shortcut_submission(
+        self, body: dict, client: object, logger: Config.logger, shortcut_config: dict
+    ) -> None:
+        """Process an acknowledged shortcut modal view submission
+
+        Args:
+            body: Slack message body info
+            client: Slack App instance
+            logger: Logging instance
+            shortcut_config: The submitted shortcut config
+        """
+        az_devops_client = AzDevOpsClient.get_instance()
+        submission = self.get_submission(body)
 
         # Verifying if bot is subscribed in the slack channel
         # specified in config.py
-        channel_id = None
-        channels_filter = list(
-            filter(
-                lambda chn: chn["id"]
-                if chn["name"] == self.shortcut_config["slack_channel"]
-                else None,
-                bot_subscribed_channels,
-            )
+        channel_id = self.slack_resolver.get_channel_id(
+            client, body["view"]["bot_id"], shortcut_config["slack_channel"]
         )
 
-        if channels_filter:
-            channel_id = channels_filter[0]["id"]
-        else:
+        if not channel_id:
             raise ValueError(
-                f"Bot not subscribed in the channel #{self.shortcut_config['slack_channel']}."
+                f"Bot not subscribed in the channel #{shortcut_config['slack_channel']}."
             )
 
+        # The steps below run concurrently as soon as their dependencies
+        # finish. The thread replies depend on each other to keep their order.
+        steps = StepGraph(f"Shortcut {body['view']['callback_id']} submission")
+
+        board_item_depends_on = ["thread_link"]
+
+        # The default iteration is used when the shortcut has no iteration
+        if not shortcut_config["az_devops_work_item_iteration"]:
+            steps.add(
+                "default_iteration",
+                lambda results: az_devops_client.get_default_iteration(shortcut_config["az_devops_project"])
+            )
+            board_item_depends_on.append("default_iteration")
+
         # Posts a message in the channel with the support form data
-        post_bot_message = client.chat_postMessage(
-            text=f"*Solicitante:* <@{user_name}>\n{bot_message_text}",
-            channel=channel_id
+        steps.add(
+            "post_bot_message",
+            lambda results: client.chat_postMessage(
+                **self.build_bot_message(submission, channel_id)
+            )
         )
 
+        steps.add("support_team_id", lambda results: self.get_support_team_id(client, shortcut_config))
+
+        if Config.slack_merged_thread_reply:
+            # A single reply with the SLA, the support team mention and
+            # a placeholder, updated with the card link once it's created
+            steps.add(
+                "thread_reply",
+                lambda results: client.chat_postMessage(
+                    **self.build_thread_reply(
+                        submission, shortcut_config, channel_id, results["post_bot_message"]["ts"],
+                        results["support_team_id"]
+                    )
+                ),
+                depends_on=["post_bot_message", "support_team_id"]
+            )
+        else:
+            steps.add(
+                "sla_reply",
+                lambda results: client.chat_postMessage(
+                    **self.build_sla_reply(submission, shortcut_config, channel_id, results["post_bot_message"]["ts"])
+                ),
+                depends_on=["post_bot_message"]
+            )
+
+            # Sending message mentioning the support_team
+            steps.add(
+                "mention_reply",
+                lambda results: client.chat_postMessage(
+                    **self.build_mention_reply(
+                        shortcut_config, channel_id, results["post_bot_message"]["ts"], results["support_team_id"]
+                    )
+                ),
+                depends_on=["post_bot_message", "sla_reply", "support_team_id"]
+            )
+
+        # Get the thread permanent link
+        steps.add(
+            "thread_link",
+            lambda results: client.chat_getPermalink(
+                channel=channel_id,
+                message_ts=results["post_bot_message"]["ts"]
+            ),
+            depends_on=["post_bot_message"]
+        )
+
+        def create_board_item(results: dict) -> object:
+            board_item = az_devops_client.add_item_to_project_board(
+                work_item_type=shortcut_config["az_devops_work_item_type"],
+                project=shortcut_config["az_devops_project"],
+                document=self.build_board_item_document(
+                    submission, shortcut_config,
+                    results["thread_link"].get("permalink"),
+                    results.get("default_iteration")
+                )
+            )
+
+            # The client logs its errors and returns None, the step fails so the replies depending on it are skipped
+            if not board_item:
+                raise RuntimeError(f"No work item created on {shortcut_config['az_devops_project']}.")
+
+            return board_item
+
+        # Creates a card on Azure DevOps Boards
+        steps.add("board_item", create_board_item, depends_on=board_item_depends_on)
+
+        if Config.slack_merged_thread_reply:
+            steps.add(
+                "board_item_reply",
+                lambda results: client.chat_update(
+                    **self.build_thread_reply(
+                        submission, shortcut_config, channel_id, results["post_bot_message"]["ts"],
+                        results["support_team_id"], board_item_id=results["board_item"].id,
+                        reply_ts=results["thread_reply"]["ts"]
+                    )
+                ),
+                depends_on=["post_bot_message", "support_team_id", "thread_reply", "board_item"]
+            )
+        else:
+            steps.add(
+                "board_item_reply",
+                lambda results: client.chat_postMessage(
+                    **self.build_board_item_reply(
+                        shortcut_config, channel_id, results["post_bot_message"]["ts"], results["board_item"].id
+                    )
+                ),
+                depends_on=["post_bot_message", "mention_reply", "board_item"]
+            )
+
+        steps.run()
+
         logger.info(
-            f"New message received on channel #{self.shortcut_config['slack_channel']} from "
-            f"{user_name}: {repr(bot_message_text)}"
+            "New ticket received on channel #%s from %s: %s",
+            shortcut_config["slack_channel"], submission["user_name"], submission["title"]
+        )
+
+        for step in ["post_bot_message", "sla_reply", "mention_reply", "thread_reply", "thread_link"]:
+            if step in steps.errors:
+                raise steps.errors[step]
+
+        board_item_error = next(
+            (
+                steps.errors[step]
+                for step in ["default_iteration", "board_item", "board_item_reply"]
+                if step in steps.errors
+            ),
+            None
+        )
+
+        if board_item_error:
+            logger.error("Failed to create Azure Boards Work Item.", exc_info=board_item_error)
+
+            if Config.slack_merged_thread_reply and steps.results.get("board_item") is None:
+                # Without a card, the placeholder is removed from the reply
+                client.chat_update(
+                    **self.build_thread_reply(
+                        submission, shortcut_config, channel_id, steps.results["post_bot_message"]["ts"],
+                        steps.results["support_team_id"], pending=False, reply_ts=steps.results["thread_reply"]["ts"]
+                    )
+                )
+
+    def get_support_team_id(self, client: object, shortcut_config: dict) -> Optional[str]:
+        """Get the id of the usergroup mentioned on the shortcut tickets
+
+        Args:
+            client: Slack App instance
+            shortcut_config: The submitted shortcut config
+
+        Returns:
+            The usergroup id or None when it's not found
+        """
+        try:
+            support_team_id = self.slack_resolver.get_usergroup_id(client, shortcut_config["slack_support_team"])
+        except Exception:
+            support_team_id = None
+            Config.logger.error("Failed to load the Slack usergroups.", exc_info=True)
+
+        if support_team_id is None:
+            Config.logger.warning("Usergroup @%s not found.", shortcut_config["slack_support_team"])
+
+        return support_team_id
+
+    @staticmethod
+    def get_submission(body: dict) -> dict:
+        """Get the support form values from a modal view submission
+
+        Args:
+            body: Slack message body info
+
+        Returns:
+            A dict with the form values and the bot message text
+        """
+        view_state_values = body["view"]["state"]["values"]
+        submission = dict(
+            user_name=body["user"]["name"],
+            title=view_state_values["title_block"]["title"]["value"].replace('"', "'"),
+            environment=view_state_values["environment_block"]["environment"]["selected_option"]["value"],
+            infrastructure=view_state_values["infrastructure_block"]["infrastructure"]["selected_option"]["value"],
+            product=view_state_values["product_block"]["product"]["selected_option"]["value"],
+            description=view_state_values["description_block"]["description"]["value"].replace('"', "'")
         )
+        submission["bot_message_text"] = (
+            f"*Resumo da Solicitação:* {submission['title']}\n"
+            f"*Ambiente:* {submission['environment']}\n"
+            f"*Infraestrutura:* {submission['infrastructure']}\n"
+            f"*Produto ou Serviço:* {submission['product']}\n"
+            f"*Informações Complementares:* {submission['description']}"
+        )
+
+        return submission
 
-        client.chat_postMessage(
+    @staticmethod
+    def build_bot_message(submission: dict, channel_id: str) -> dict:
+        """Build the channel message with the support form data
+
+        Args:
+            submission: The support form values
+            channel_id: The support channel id
+
+        Returns:
+            The chat_postMessage arguments
+        """
+        return dict(
+            text=f"*Solicitante:* <@{submission['user_name']}>\n{submission['bot_message_text']}",
+            channel=channel_id
+        )
+
+    @staticmethod
+    def build_sla_reply(submission: dict, shortcut_config: dict, channel_id: str, thread_ts: str) -> dict:
+        """Build the thread reply with the support SLA
+
+        Args:
+            submission: The support form values
+            shortcut_config: The submitted shortcut config
+            channel_id: The support channel id
+            thread_ts: The support thread timestamp
+
+        Returns:
+            The chat_postMessage arguments
+        """
+        sla = shortcut_config["az_devops_sla"][submission["environment"]]
+
+        return dict(
             blocks=[{
                 "type": "section",
                 "text": {
                     "type": "mrkdwn",
                     "text": (f":eyes: O time está de olho e logo irá responder...\n"
-                             f"O SLA de Atendimento é de *{self.shortcut_config['az_devops_sla'][environment]}*.")
+                             f"O SLA de Atendimento é de *{sla}*.")
                 }
             }],
             text=(f"O time está de olho e logo irá responder... "
-                  f"O SLA de Atendimento é de {self.shortcut_config['az_devops_sla'][environment]}."),
+                  f"O SLA de Atendimento é de {sla}."),
             channel=channel_id,
-            thread_ts=post_bot_message["ts"]
+            thread_ts=thread_ts
         )
 
-        # Sending message mentioning the support_team
-        client.chat_postMessage(
-            text=f"Estou marcando o time <!subteam^{support_team_id}> para ajudar no problema!",
-            channel=channel_id,
-            thread_ts=post_bot_message["ts"]
-        )
+    @staticmethod
+    def build_mention_reply(
+        shortcut_config: dict, channel_id: str, thread_ts: str, support_team_id: Optional[str]
+    ) -> dict:
+        """Build the thread reply mentioning the support team
 
-        # Get the thread permanent link
-        thread_link = client.chat_getPermalink(
+        Args:
+            shortcut_config: The submitted shortcut config
+            channel_id: The support channel id
+            thread_ts: The support thread timestamp
+            support_team_id: The support usergroup id, when it's None
+                             the usergroup handle is written instead
+
+        Returns:
+            The chat_postMessage arguments
+        """
+        if support_team_id:
+            support_team = f"<!subteam^{support_team_id}>"
+        else:
+            support_team = f"@{shortcut_config['slack_support_team']}"
+
+        return dict(
+            text=f"Estou marcando o time {support_team} para ajudar no problema!",
             channel=channel_id,
-            message_ts=post_bot_message["ts"]
+            thread_ts=thread_ts
         )
 
-        try:
-            # Creates a card on Azure DevOps Boards
-            board_item = az_devops_client.add_item_to_project_board(
-                work_item_type=self.shortcut_config["az_devops_work_item_type"],
-                project=self.shortcut_config["az_devops_project"],
-                document=Config.load_template(
-                    template=self.shortcut_config["az_devops_board_template"],
-                    title=title,
-                    description=(
-                        f"<b>Solicitante:</b> {user_name}<br/>"
-                        f"<b>Referência:</b> <a href='{thread_link.get('permalink')}'>Link da thread</a>"
-                        f"<br/><br/>{description}"
-                    ),
-                    environment=environment,
-                    infrastructure=infrastructure,
-                    product=product,
-                    area_path=self.shortcut_config["az_devops_work_item_area"],
-                    iteration_path=self.shortcut_config["az_devops_work_item_iteration"] or (
-                        f'{self.shortcut_config["az_devops_project"]}'
-                        f'\\{az_devops_team_settings["defaultIteration"]["path"]}'
-                    )
-                )
-            )
+    @classmethod
+    def build_thread_reply(
+        cls, submission: dict, shortcut_config: dict, channel_id: str, thread_ts: str,
+        support_team_id: Optional[str], board_item_id: Optional[int] = None, pending: bool = True,
+        reply_ts: Optional[str] = None
+    ) -> dict:
+        """Build the single thread reply with the support SLA, the support
+        team mention and the Azure DevOps Boards card link
 
-            board_item_url = (
-                f"{Config.az_devops_organization_url}"
-                f"/{self.shortcut_config['az_devops_project']}"
-                f"/_workitems/edit/{board_item.id}"
-            )
+        It's posted with a placeholder while the card is created, then
+        updated with the card link, with the same content of the
+        separate thread replies
 
-            client.chat_postMessage(
-                blocks=[{
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f":azure_board: O seguinte card de suporte foi criado: <{board_item_url}|#{board_item.id}>"
-                    }
-                }],
-                text=f"O seguinte card de suporte foi criado: {board_item_url}",
-                channel=channel_id,
-                thread_ts=post_bot_message["ts"]
+        Args:
+            submission: The support form values
+            shortcut_config: The submitted shortcut config
+            channel_id: The support channel id
+            thread_ts: The support thread timestamp
+            support_team_id: The support usergroup id
+            board_item_id: The board item created id, None while it's created
+            pending: Whether the placeholder is shown when there's no board item
+            reply_ts: The posted reply timestamp, when set the reply is built to be updated
+
+        Returns:
+            The chat_postMessage arguments, or the chat_update ones when reply_ts is set
+        """
+        sla_reply = cls.build_sla_reply(submission, shortcut_config, channel_id, thread_ts)
+        mention_reply = cls.build_mention_reply(shortcut_config, channel_id, thread_ts, support_team_id)
+        blocks = sla_reply["blocks"] + [{"type": "section", "text": {"type": "mrkdwn", "text": mention_reply["text"]}}]
+        texts = [sla_reply["text"], mention_reply["text"]]
+
+        if board_item_id is not None:
+            board_item_reply = cls.build_board_item_reply(shortcut_config, channel_id, thread_ts, board_item_id)
+            blocks += board_item_reply["blocks"]
+            texts.append(board_item_reply["text"])
+        elif pending:
+            blocks.append({
+                "type": "context",
+                "elements": [{"type": "mrkdwn", "text": ":hourglass_flowing_sand: Criando o card no Azure Boards..."}]
+            })
+
+        thread_reply = dict(blocks=blocks, text="\n".join(texts), channel=channel_id)
+
+        if reply_ts:
+            return dict(thread_reply, ts=reply_ts)
+
+        return dict(thread_reply, thread_ts=thread_ts)
+
+    @staticmethod
+    def build_board_item_document(
+        submission: dict, shortcut_config: dict, permalink: str, default_iteration: str = None
+    ) -> list:
+        """Build the Azure DevOps Boards work item document
+
+        Args:
+            submission: The support form values
+            shortcut_config: The submitted shortcut config
+            permalink: The support thread permanent link
+            default_iteration: The team default iteration path, used
+                               when the shortcut has no iteration
+
+        Returns:
+            The work item JSON-Patch document
+        """
+        return Config.load_template(
+            template=shortcut_config["az_devops_board_template"],
+            title=submission["title"],
+            description=(
+                f"<b>Solicitante:</b> {submission['user_name']}<br/>"
+                f"<b>Referência:</b> <a href='{permalink}'>Link da thread</a>"
+                f"<br/><br/>{submission['description']}"
+            ),
+            environment=submission["environment"],
+            infrastructure=submission["infrastructure"],
+            product=submission["product"],
+            area_path=shortcut_config["az_devops_work_item_area"],
+            iteration_path=shortcut_config["az_devops_work_item_iteration"] or (
+                f'{shortcut_config["az_devops_project"]}'
+                f'\\{default_iteration}'
             )
-        except Exception:
-            logger.error("Failed to create Azure Boards Work Item.", exc_info=True)
+        )
+
+    @staticmethod
+    def build_board_item_reply(shortcut_config: dict, channel_id: str, thread_ts: str, board_item_id: int) -> dict:
+        """Build the thread reply with the Azure DevOps Boards card link
+
+        Args:
+            shortcut_config: The submitted shortcut config
+            channel_id: The support channel id
+            thread_ts: The support thread timestamp
+            board_item_id: The board item created id
+
+        Returns:
+            The chat_postMessage arguments
+        """
+        board_item_url = (
+            f"{Config.az_devops_organization_url}"
+            f"/{shortcut_config['az_devops_project']}"
+            f"/_workitems/edit/{board_item_id}"
+        )
+
+        return dict(
+            blocks=[{
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f":azure_board: O seguinte card de suporte foi criado: <{board_item_url}|#{board_item_id}>"
+                }
+            }],
+            text=f"O seguinte card de suporte foi criado: {board_item_url}",
+            channel=channel_id,
+            thread_ts=thread_ts
+        )
@@ -0,0 +1,68 @@
+"""
+Slack messages async handler module
+"""
+
+from bot.config import Config
+from bot.libs.metrics import instrument_handler
+from bot.handlers.slack.handle_messages import HandleMessages, IGNORED_MESSAGE_SUBTYPES
+from bot.handlers.slack_async.handle_reactions import AsyncHandleReactions
+
+
+class AsyncHandleMessages(AsyncHandleReactions, HandleMessages):
+    """
+    Class to handle slack channel messages on the asyncio entry point
+    """
+
+    async def get_channel_info(self, client: object, channel_id: str) -> dict:
+        """Get a channel info from the cache or from the Slack API
+
+        Args:
+            client: Slack App async instance
+            channel_id: The channel id
+
+        Returns:
+            The channel info
+        """
+        channel_info = self.channels_cache.get(channel_id)
+
+        if channel_info is None:
+            channel_info = (await client.conversations_info(channel=channel_id))["channel"]
+            self.channels_cache.set(channel_id, channel_info)
+
+        return channel_info
+
+    async def handle_channel_changed(self, event: dict) -> None:
+        """Evict a renamed, archived or deleted channel from the channels cache
+
+        Args:
+            event: Slack event info
+        """
+        super().handle_channel_changed(event)
+
+    @instrument_handler("handle_message")
+    async def handle_message(self, client: object, message: dict, say: object) -> None:
+        """Handle messages from slack channel
+
+        Args:
+            client: Slack App async instance
+            message: Slack message object
+            say: Slack client say function
+        """
+
+        if message.get("thread_ts") or message.get("subtype") in IGNORED_MESSAGE_SUBTYPES:
+            return
+
+        reply_kind = self.get_reply_kind(message)
+
+        if reply_kind is None:
+            return
+
+        channel_info = await self.get_channel_info(client, message["channel"])
+        bot_message_text = Config.get_channel_reply_text(channel_info["name"])
+
+        if reply_kind == "ephemeral":
+            await client.chat_postEphemeral(channel=message["channel"], user=message["user"], text=bot_message_text)
+        else:
+            await say(bot_message_text)
+
+        return bot_message_text
@@ -0,0 +1,72 @@
+"""
+Slack message reactions async handler module
+"""
+
+from typing import Optional
+
+from bot.config import Config
+from bot.libs.metrics import instrument_handler
+from bot.handlers.slack.handle_reactions import HandleReactions
+
+
+class AsyncHandleReactions(HandleReactions):
+    """
+    Class to handle slack message reactions on the asyncio entry point
+    """
+
+    async def get_thread_parent_ts(self, client: object, channel_id: str, message_ts: str) -> Optional[str]:
+        """Get the thread parent of a message from the cache or from the Slack API
+
+        Args:
+            client: Slack App async instance
+            channel_id: The message channel id
+            message_ts: The message timestamp
+
+        Returns:
+            The thread parent timestamp, None when the message isn't on a thread
+        """
+        parent_thread_ts = self.thread_parents_cache.get((channel_id, message_ts))
+
+        if not parent_thread_ts:
+            replies = await client.conversations_replies(channel=channel_id, ts=message_ts, limit=1)
+            message = replies["messages"][0]
+            parent_thread_ts = message.get("thread_ts")
+
+            if parent_thread_ts:
+                self.thread_parents_cache.set((channel_id, message_ts), parent_thread_ts)
+
+        return parent_thread_ts
+
+    async def reply_in_thread(self, client: object, rule: dict, event: dict) -> None:
+        """Reply a reaction on the thread of the reacted message, the
+        reactions on messages that aren't on a thread are not replied
+
+        Args:
+            client: Slack App async instance
+            rule: The reaction rule
+            event: Slack event trigger info
+        """
+        thread_ts = await self.get_thread_parent_ts(client, event["item"]["channel"], event["item"]["ts"])
+
+        if thread_ts is None:
+            return
+
+        await client.chat_postMessage(**self.build_thread_reply(rule, event, thread_ts))
+
+    @instrument_handler("handle_reactions_added")
+    async def handle_reactions_added(self, client: object, body: dict, event: dict, logger: Config.logger) -> None:
+        """Handle reactions on messages
+
+        Args:
+            client: Slack App async instance
+            event: Slack event trigger info
+        """
+        rule = self.get_reaction_rule(event)
+
+        if rule is None:
+            return
+
+        try:
+            await self.reaction_actions[rule["action"]](client, rule, event)
+        except Exception:
+            logger.error("Error: failed to process the reaction: %s", event["reaction"], exc_info=True)
@@ -0,0 +1,231 @@
+"""
+Slack handle shortcut support async module
+"""
+import asyncio
+
+from typing import Optional
+
+from bot.config import Config
+from bot.libs.metrics import instrument_handler
+from bot.libs.async_az_devops_client import AsyncAzDevOpsClient
+from bot.libs.slack_resolver import AsyncSlackResolver
+from bot.handlers.slack.handle_shortcut_support import HandleShortcutSupport
+
+
+class AsyncHandleShortcutSupport(HandleShortcutSupport):
+    """Class to handle slack channel support shortcut on the asyncio entry point
+
+    The submissions run on the event loop after the ack, so no
+    work queue is used
+    """
+
+    resolver_class = AsyncSlackResolver
+
+    async def is_shortcut(self, body: dict) -> bool:
+        """Listener matcher of the shortcuts and view submissions with a shortcut config,
+        AsyncApp awaits the matchers
+
+        Args:
+            body: Slack shortcut or view submission body
+        """
+        return super().is_shortcut(body)
+
+    @instrument_handler("handle_shortcut")
+    async def handle_shortcut(self, ack: object, client: object, shortcut: dict, logger: Config.logger) -> None:
+        """Handle shortcut modal view openning
+
+        Args:
+            ack: Acknowledge the command request
+            client: Slack App async instance
+            shortcut: Slack shortcut trigger info
+        """
+        await ack()
+
+        callback_id = shortcut.get("callback_id")
+        shortcut_config = self.shortcuts.get(callback_id)
+
+        if shortcut_config:
+            await client.views_open(
+                trigger_id=shortcut["trigger_id"],
+                view=dict(Config.load_template(shortcut_config["slack_template"]), callback_id=callback_id)
+            )
+        else:
+            logger.error("No config found for the shortcut %s", callback_id)
+
+    @instrument_handler("handle_shortcut_submission")
+    async def handle_shortcut_submission(
+        self, ack: object, body: dict, client: object, logger: Config.logger
+    ) -> None:
+        """Handle shortcut modal view submission
+
+        Args:
+            ack: Acknowledge the command request
+            body: Slack message body info
+            client: Slack App async instance
+            logger: Logging instance
+        """
+        await ack()
+
+        shortcut_config = self.shortcuts.get(body["view"]["callback_id"])
+
+        if not shortcut_config:
+            return logger.error("No config found for the shortcut %s", body["view"]["callback_id"])
+
+        await self.process_shortcut_submission(body, client, logger, shortcut_config)
+
+    @instrument_handler("process_shortcut_submission")
+    async def process_shortcut_submission(
+        self, body: dict, client: object, logger: Config.logger, shortcut_config: dict
+    ) -> None:
+        """Process an acknowledged shortcut modal view submission
+
+        The thread replies, the permalink and the work item creation
+        run concurrently, keeping the thread replies order
+
+        Args:
+            body: Slack message body info
+            client: Slack App async instance
+            logger: Logging instance
+            shortcut_config: The submitted shortcut config
+        """
+        az_devops_client = AsyncAzDevOpsClient.get_instance()
+        submission = self.get_submission(body)
+
+        channel_id = await self.slack_resolver.get_channel_id(
+            client, body["view"]["bot_id"], shortcut_config["slack_channel"]
+        )
+
+        if not channel_id:
+            raise ValueError(
+                f"Bot not subscribed in the channel #{shortcut_config['slack_channel']}."
+            )
+
+        default_iteration = None
+
+        if not shortcut_config["az_devops_work_item_iteration"]:
+            default_iteration = asyncio.ensure_future(
+                az_devops_client.get_default_iteration(shortcut_config["az_devops_project"])
+            )
+
+        support_team_id = asyncio.ensure_future(self.get_support_team_id(client, shortcut_config))
+        post_bot_message = await client.chat_postMessage(**self.build_bot_message(submission, channel_id))
+        thread_ts = post_bot_message["ts"]
+
+        logger.info(
+            "New ticket received on channel #%s from %s: %s",
+            shortcut_config["slack_channel"], submission["user_name"], submission["title"]
+        )
+
+        thread_replies = asyncio.ensure_future(
+            self.post_thread_replies(client, submission, shortcut_config, channel_id, thread_ts, support_team_id)
+        )
+
+        try:
+            thread_link = await client.chat_getPermalink(channel=channel_id, message_ts=thread_ts)
+            board_item = None
+            board_item_error = None
+
+            try:
+                board_item = await az_devops_client.add_item_to_project_board(
+                    work_item_type=shortcut_config["az_devops_work_item_type"],
+                    project=shortcut_config["az_devops_project"],
+                    document=self.build_board_item_document(
+                        submission, shortcut_config,
+                        thread_link.get("permalink"),
+                        await default_iteration if default_iteration else None
+                    )
+                )
+            except Exception as error:
+                board_item_error = error
+
+            # The card link is replied after the other thread replies, their errors aren't work item errors
+            thread_reply = await thread_replies
+
+            if board_item is not None:
+                try:
+                    if Config.slack_merged_thread_reply:
+                        await client.chat_update(
+                            **self.build_thread_reply(
+                                submission, shortcut_config, channel_id, thread_ts, await support_team_id,
+                                board_item_id=board_item["id"], reply_ts=thread_reply["ts"]
+                            )
+                        )
+                    else:
+                        await client.chat_postMessage(
+                            **self.build_board_item_reply(shortcut_config, channel_id, thread_ts, board_item["id"])
+                        )
+                except Exception as error:
+                    board_item_error = error
+
+            if board_item_error:
+                logger.error("Failed to create Azure Boards Work Item.", exc_info=board_item_error)
+
+            if Config.slack_merged_thread_reply and board_item is None:
+                # Without a card, the placeholder is removed from the reply
+                await client.chat_update(
+                    **self.build_thread_reply(
+                        submission, shortcut_config, channel_id, thread_ts, await support_team_id,
+                        pending=False, reply_ts=thread_reply["ts"]
+                    )
+                )
+        finally:
+            # On an error the work item lookup is dropped and the replies
+            # already started are finished, as the sync steps do
+            pending = [support_team_id, thread_replies]
+
+            if default_iteration is not None:
+                default_iteration.cancel()
+                pending.append(default_iteration)
+
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def get_support_team_id(self, client: object, shortcut_config: dict) -> Optional[str]:
+        """Get the id of the usergroup mentioned on the shortcut tickets
+
+        Args:
+            client: Slack App async instance
+            shortcut_config: The submitted shortcut config
+
+        Returns:
+            The usergroup id or None when it's not found
+        """
+        try:
+            support_team_id = await self.slack_resolver.get_usergroup_id(
+                client, shortcut_config["slack_support_team"]
+            )
+        except Exception:
+            support_team_id = None
+            Config.logger.error("Failed to load the Slack usergroups.", exc_info=True)
+
+        if support_team_id is None:
+            Config.logger.warning("Usergroup @%s not found.", shortcut_config["slack_support_team"])
+
+        return support_team_id
+
+    async def post_thread_replies(
+        self, client: object, submission: dict, shortcut_config: dict, channel_id: str, thread_ts: str,
+        support_team_id: asyncio.Future
+    ) -> Optional[dict]:
+        """Post the SLA and the support team mention replies, in this order,
+        or the single thread reply when Config.slack_merged_thread_reply is set
+
+        Args:
+            client: Slack App async instance
+            submission: The support form values
+            shortcut_config: The submitted shortcut config
+            channel_id: The support channel id
+            thread_ts: The support thread timestamp
+            support_team_id: The support usergroup id being resolved
+
+        Returns:
+            The single thread reply response, None for the separate replies
+        """
+        if Config.slack_merged_thread_reply:
+            return await client.chat_postMessage(
+                **self.build_thread_reply(submission, shortcut_config, channel_id, thread_ts, await support_team_id)
+            )
+
+        await client.chat_postMessage(**self.build_sla_reply(submission, shortcut_config, channel_id, thread_ts))
+        await client.chat_postMessage(
+            **self.build_mention_reply(shortcut_config, channel_id, thread_ts, await support_team_id)
+        )
@@ -0,0 +1,201 @@
+"""
+Azure DevOps async client module
+"""
+
+import asyncio
+import time
+import aiohttp
+
+from urllib.parse import quote
+
+from bot.config import Config
+from bot.libs.az_devops_client import check_rate_limit, get_rate_limiter
+from bot.libs.metrics import az_devops_method, observe_outbound_call
+from bot.libs.tracing import SPAN_KIND_CLIENT, span
+
+
+class AsyncAzDevOpsClient:
+    """
+    Class that calls the Azure DevOps REST API with aiohttp,
+    used by the asyncio entry point
+
+    Use get_instance() to get the process wide client, that keeps
+    its connections alive and is shared by all the requests.
+
+    Attributes:
+        session: Pooled aiohttp session used on all the Azure DevOps calls
+        team_settings: Last loaded team settings and their load time by project
+    """
+
+    _instance = None
+
+    def __init__(self):
+        self.session = None
+        self.team_settings = dict()
+        self._refreshing = dict()
+
+    @classmethod
+    def get_instance(cls) -> "AsyncAzDevOpsClient":
+        """Get the process wide Azure DevOps async client
+
+        Returns:
+            The shared AsyncAzDevOpsClient instance
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+
+        return cls._instance
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get the aiohttp session, created on the running event loop
+        with a connection pool sized by Config.az_devops_pool_size
+
+        Returns:
+            The session object
+        """
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=Config.az_devops_pool_size, ssl=False),  # nosec
+                headers={"Authorization": f"Basic {Config.az_devops_pat_b64}"},
+                timeout=aiohttp.ClientTimeout(total=Config.az_devops_timeout)
+            )
+
+        return self.session
+
+    async def close(self) -> None:
+        """Close the aiohttp session"""
+        if self.session is not None:
+            await self.session.close()
+
+    async def request(self, method: str, url: str, **kwargs) -> aiohttp.ClientResponse:
+        """Send a request through the shared Azure DevOps rate limiter
+
+        Args:
+            method: HTTP method
+            url: Request url
+            kwargs: Arguments passed to aiohttp request
+
+        Returns:
+            The response, with its body already read
+        """
+        api_method = az_devops_method(method, url)
+
+        with span(f"az_devops {api_method}", SPAN_KIND_CLIENT, service="az_devops", method=api_method):
+            return await get_rate_limiter().acall("az_devops", self._send_request, method, url, **kwargs)
+
+    async def _send_request(self, method: str, url: str, **kwargs) -> aiohttp.ClientResponse:
+        started_at = time.perf_counter()
+        status = None
+
+        try:
+            async with self.get_session().request(method, url, **kwargs) as response:
+                await response.read()
+                status = response.status
+        finally:
+            observe_outbound_call("az_devops", az_devops_method(method, url), started_at, status is None or status >= 400)
+
+        check_rate_limit(response.status, response.headers)
+        return response
+
+    async def get_team_settings(self, project: str) -> dict:
+        """Get team_settings"""
+
+        team_settings_url = (
+            f"{Config.az_devops_organization_url}/{project}"
+            "/_apis/work/teamsettings?api-version=6.1-preview.1"
+        )
+
+        response = await self.request("GET", team_settings_url)
+
+        try:
+            return await response.json(content_type=None)
+        except Exception:
+            Config.logger.error("%s %s: %s", response.status, response.reason, response.url)
+            return
+
+    async def load_team_settings(self, project: str) -> dict:
+        """Load the team settings of a project, keeping the
+        last loaded value if it fails
+
+        Args:
+            project: Project name
+
+        Returns:
+            The loaded team settings or the last loaded ones
+        """
+        try:
+            team_settings = await self.get_team_settings(project)
+        except Exception:
+            team_settings = None
+            Config.logger.error("Failed to load the team settings of %s", project, exc_info=True)
+        finally:
+            self._refreshing.pop(project, None)
+
+        if team_settings:
+            self.team_settings[project] = (team_settings, time.monotonic())
+            return team_settings
+
+        return self.team_settings.get(project, (None, None))[0]
+
+    async def get_default_iteration(self, project: str) -> str:
+        """Get the team default iteration path, refreshing the
+        team settings in the background before they expire
+
+        Args:
+            project: Project name
+
+        Returns:
+            The default iteration path
+        """
+        team_settings, loaded_at = self.team_settings.get(project, (None, None))
+
+        if team_settings is None:
+            team_settings = await self.load_team_settings(project)
+        elif time.monotonic() - loaded_at >= Config.az_devops_team_settings_ttl * 0.8:
+            if project not in self._refreshing:
+                self._refreshing[project] = asyncio.ensure_future(self.load_team_settings(project))
+
+        if not team_settings:
+            raise ValueError(f"No team settings found for the project {project}.")
+
+        return team_settings["defaultIteration"]["path"]
+
+    async def prewarm_team_settings(self, projects: list) -> None:
+        """Load the team settings of the projects
+
+        Args:
+            projects: Projects names
+        """
+        await asyncio.gather(*[self.load_team_settings(project) for project in set(projects)])
+
+    async def add_item_to_project_board(
+        self, project: str, document: list, work_item_type: str
+    ) -> dict:
+        """Add new items to Azure DevOps Boards
+
+        Reference: https://docs.microsoft.com/en-us/rest/api/azure/devops/wit/work%20items/create?view=azure-devops-rest-6.1
+
+        Args:
+            project: Project name
+            document: Work item document template.
+            work_item_type: Work item type. Example: Support
+
+        Retuns:
+            The board item created
+        """
+        if not project or not work_item_type:
+            raise ValueError("project and work_item_type must be set.")
+
+        work_item_url = (
+            f"{Config.az_devops_organization_url}/{quote(project)}"
+            f"/_apis/wit/workitems/${quote(work_item_type)}?api-version=6.0"
+        )
+
+        response = await self.request(
+            "POST",
+            work_item_url,
+            json=document,
+            headers={"Content-Type": "application/json-patch+json"}
+        )
+        response.raise_for_status()
+        return await response.json(content_type=None)
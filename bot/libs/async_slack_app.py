@@ -0,0 +1,35 @@
+"""
+Slack async client module
+"""
+
+from slack_bolt.async_app import AsyncApp
+from bot.config import Config
+from bot.libs.async_slack_web_client import AsyncRateLimitedWebClient
+from bot.libs.tracing import trace_slack_request
+
+
+class AsyncSlackApp(AsyncApp):
+    """
+    Slack AsyncApp instance class, used by the asyncio entry point
+
+    Returns:
+        object: A slack_bolt AsyncApp instance
+    """
+
+    def __init__(self):
+        super().__init__(
+            signing_secret=Config.slack_signing_secret,
+            client=AsyncRateLimitedWebClient(token=Config.slack_bot_token, base_url=Config.slack_api_url)
+        )
+
+    async def async_dispatch(self, req: object) -> object:
+        with trace_slack_request(req.body):
+            return await super().async_dispatch(req)
+
+    def _init_context(self, req: object) -> None:
+        super()._init_context(req)
+
+        # Newer Bolt versions give each request a plain client copy,
+        # so the listeners calls would skip the rate limiter and metrics
+        if not isinstance(req.context.client, AsyncRateLimitedWebClient):
+            req.context["client"] = self.client
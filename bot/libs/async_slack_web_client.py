@@ -0,0 +1,40 @@
+"""
+Rate limited Slack Web API asyncio client module
+"""
+
+import time
+
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+
+from bot.libs.metrics import observe_outbound_call
+from bot.libs.slack_web_client import get_rate_limit_key, get_rate_limiter, rate_limited_error
+from bot.libs.tracing import SPAN_KIND_CLIENT, span
+
+
+class AsyncRateLimitedWebClient(AsyncWebClient):
+    """
+    Slack AsyncWebClient that sends the calls through the shared rate
+    limiter, respecting the tier of each method and Retry-After
+    """
+
+    async def api_call(self, api_method: str, **kwargs) -> object:
+        params = kwargs.get("json") or kwargs.get("data") or kwargs.get("params") or {}
+
+        with span(f"slack {api_method}", SPAN_KIND_CLIENT, service="slack", method=api_method):
+            return await get_rate_limiter().acall(
+                get_rate_limit_key(api_method, params), self._send_api_call, api_method, **kwargs
+            )
+
+    async def _send_api_call(self, api_method: str, **kwargs) -> object:
+        started_at = time.perf_counter()
+        failed = True
+
+        try:
+            response = await super().api_call(api_method, **kwargs)
+            failed = False
+            return response
+        except SlackApiError as error:
+            raise rate_limited_error(error)
+        finally:
+            observe_outbound_call("slack", api_method, started_at, failed)
@@ -1,26 +1,160 @@
 """
 Azure DevOps client module
+
+The Azure DevOps SDK is a large generated package, it's imported when
+the first client is created so it doesn't slow down the bot startup
 """
 
+import json
+import threading
+import time
 import requests
 
-from azure.devops.connection import Connection
-from msrest.authentication import BasicAuthentication
+from urllib.parse import quote
+from requests.adapters import HTTPAdapter
 
 from bot.config import Config
+from bot.libs.batcher import Batcher
+from bot.libs.cache import RefreshingCache, create_shared_cache
+from bot.libs.metrics import az_devops_method, observe_outbound_call
+from bot.libs.rate_limiter import RateLimited, RateLimiter
+from bot.libs.tracing import SPAN_KIND_CLIENT, span
 
 requests.urllib3.disable_warnings()
 
 
+def get_rate_limiter() -> RateLimiter:
+    """Get the rate limiter shared by the Azure DevOps clients"""
+    return RateLimiter.get_instance("az_devops", Config.az_devops_rate_limits, default_limit="az_devops")
+
+
+def check_rate_limit(status: int, headers: dict) -> None:
+    """Check the Azure DevOps rate limit headers of a response
+
+    Reference: https://docs.microsoft.com/en-us/azure/devops/integrate/concepts/rate-limits
+
+    Args:
+        status: The response HTTP status
+        headers: The response headers
+
+    Raises:
+        RateLimited: When the request was rejected by a rate limit
+    """
+    retry_after = headers.get("Retry-After")
+
+    try:
+        retry_after = float(retry_after) if retry_after else None
+    except ValueError:
+        retry_after = None
+
+    if status == 429 or (status == 503 and retry_after is not None):
+        raise RateLimited(retry_after=retry_after, message=f"Azure DevOps rate limited with HTTP {status}")
+
+    if headers.get("X-RateLimit-Remaining") == "0" and headers.get("X-RateLimit-Reset"):
+        # The quota is used, the next requests would be delayed or rejected until it resets
+        get_rate_limiter().get_bucket("az_devops").pause(max(float(headers["X-RateLimit-Reset"]) - time.time(), 0))
+
+
+class RateLimitedSession(requests.Session):
+    """
+    requests session that sends the requests through the shared
+    Azure DevOps rate limiter, honoring Retry-After and X-RateLimit headers
+
+    Each request is a span of the current trace, including the rate limiter wait and the retries
+    """
+
+    def request(self, method: str, url: str, *args, **kwargs) -> requests.Response:
+        api_method = az_devops_method(method, url)
+
+        with span(f"az_devops {api_method}", SPAN_KIND_CLIENT, service="az_devops", method=api_method):
+            return get_rate_limiter().call("az_devops", self._send_request, method, url, *args, **kwargs)
+
+    def _send_request(self, method: str, url: str, *args, **kwargs) -> requests.Response:
+        started_at = time.perf_counter()
+        status = None
+
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            status = response.status_code
+        finally:
+            observe_outbound_call("az_devops", az_devops_method(method, url), started_at, status is None or status >= 400)
+
+        check_rate_limit(response.status_code, response.headers)
+        return response
+
+
 class AzDevOpsClient:
     """
     Class that provides a wrapper for the Azure DevOps Python API
     More info at https://github.com/microsoft/azure-devops-python-api
+
+    Use get_instance() to get the process wide client, that keeps
+    its connections alive and is shared by all the requests.
+
+    Attributes:
+        session: Pooled requests session used on all the Azure DevOps calls
+        connection: Azure DevOps SDK connection
+        work_item_tracking_client: Azure DevOps Boards SDK client
+        team_settings_cache: Team settings cached by project
+        work_item_batcher: Collects the work items creations sent on a single
+            $batch call, when Config.az_devops_batch_window is set
     """
 
+    _instance = None
+    _instance_lock = threading.Lock()
+
     def __init__(self):
+        self.session = self.create_session()
         self.connection = self.connect()
         self.work_item_tracking_client = None
+        self.team_settings_cache = RefreshingCache(
+            loader=lambda project: self.get_team_settings(project),
+            ttl=Config.az_devops_team_settings_ttl,
+            name="team-settings",
+            store=create_shared_cache("az-devops-team-settings", ttl=Config.az_devops_team_settings_ttl)
+        )
+        self.work_item_batcher = None
+        self._lock = threading.Lock()
+
+        if Config.az_devops_batch_window > 0:
+            self.work_item_batcher = Batcher(
+                send=self.create_work_items_batch,
+                window=Config.az_devops_batch_window,
+                max_size=min(Config.az_devops_batch_max_size, 200),
+                name="work-items-batch"
+            )
+
+    @classmethod
+    def get_instance(cls) -> "AzDevOpsClient":
+        """Get the process wide Azure DevOps client
+
+        Returns:
+            The shared AzDevOpsClient instance
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+
+        return cls._instance
+
+    def create_session(self) -> requests.Session:
+        """Creates a rate limited requests session with a connection
+        pool sized by Config.az_devops_pool_size
+
+        Returns:
+            The session object
+        """
+        session = RateLimitedSession()
+        adapter = HTTPAdapter(
+            pool_connections=Config.az_devops_pool_size,
+            pool_maxsize=Config.az_devops_pool_size
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Authorization"] = f"Basic {Config.az_devops_pat_b64}"
+        session.verify = False  # nosec
+        return session
 
     def connect(self) -> object:
         """Cretes a new connection with on Azure Devops
@@ -28,6 +162,9 @@ class AzDevOpsClient:
         Returns:
             The connection object
         """
+        from azure.devops.connection import Connection
+        from msrest.authentication import BasicAuthentication
+
         credentials = BasicAuthentication("", Config.az_devops_pat)
         connection = Connection(
             base_url=Config.az_devops_organization_url,
@@ -38,10 +175,38 @@ class AzDevOpsClient:
     def provide_work_item_tracking_client(self) -> object:
         """Set work_item_tracking_client
         to communicates with Azure DevOps Boards
+
+        The client is created once and sends its requests
+        through the pooled session
         """
-        self.work_item_tracking_client = (
-            self.connection.clients.get_work_item_tracking_client()
-        )
+        with self._lock:
+            if self.work_item_tracking_client is None:
+                work_item_tracking_client = self.connection.clients.get_work_item_tracking_client()
+                self.share_session(work_item_tracking_client)
+                self.work_item_tracking_client = work_item_tracking_client
+
+    def share_session(self, client: object) -> None:
+        """Make an Azure DevOps SDK client use the pooled session
+
+        msrest keeps a session per thread and closes it after each
+        request, so the client is kept alive and its session
+        configuration callback sends each request on the pooled session
+
+        Args:
+            client: Azure DevOps SDK client
+        """
+        client.config.keep_alive = True
+        client.config.connection.timeout = Config.az_devops_timeout
+        client.config.session_configuration_callback = self.configure_sdk_request
+
+    def configure_sdk_request(self, session: object, global_config: object, local_config: dict, **kwargs) -> dict:
+        """msrest session configuration callback, that replaces the thread session by the pooled one
+
+        Returns:
+            The requests kwargs
+        """
+        kwargs["session"] = self.session
+        return kwargs
 
     def get_team_settings(self, project: str) -> dict:
         """Get team_settings"""
@@ -51,19 +216,45 @@ class AzDevOpsClient:
             "/_apis/work/teamsettings?api-version=6.1-preview.1"
         )
 
-        request = requests.get(
+        request = self.session.get(
             url=team_settings_url,
-            headers={"Authorization": f"Basic {Config.az_devops_pat_b64}"},
-            verify=False  # nosec
+            timeout=Config.az_devops_timeout
         )
 
         try:
             return request.json()
         except Exception:
-            message = f"{request.status_code} {request.reason}: {request.url}"
-            Config.logger.error(message)
+            Config.logger.error("%s %s: %s", request.status_code, request.reason, request.url)
             return
 
+    def get_default_iteration(self, project: str) -> str:
+        """Get the team default iteration path from the team settings cache
+
+        Args:
+            project: Project name
+
+        Returns:
+            The default iteration path
+        """
+        team_settings = self.team_settings_cache.get(project)
+
+        if not team_settings:
+            raise ValueError(f"No team settings found for the project {project}.")
+
+        return team_settings["defaultIteration"]["path"]
+
+    def prewarm_team_settings(self, projects: list) -> object:
+        """Load the team settings of the projects in the background
+        and keep them refreshed before they expire
+
+        Args:
+            projects: Projects names
+
+        Returns:
+            The prewarm thread
+        """
+        return self.team_settings_cache.prewarm(set(projects))
+
     def add_item_to_project_board(
         self, project: str, document: list, work_item_type: str
     ) -> dict:
@@ -79,6 +270,19 @@ class AzDevOpsClient:
         Retuns:
             The board item created
         """
+        if self.work_item_batcher:
+            if not project or not work_item_type:
+                raise ValueError("project and work_item_type must be set.")
+
+            # The batch call is bounded by the rate limiter deadline and the request
+            # timeout, the result is awaited until then so a card created late isn't
+            # left without its Slack link
+            try:
+                return self.work_item_batcher.submit((project, work_item_type, document)).result()
+            except Exception as error:
+                Config.logger.error(str(error))
+                return
+
         if not self.work_item_tracking_client:
             self.provide_work_item_tracking_client()
 
@@ -96,6 +300,50 @@ class AzDevOpsClient:
         except Exception as error:
             Config.logger.error(str(error))
 
+    def create_work_items_batch(self, items: list) -> list:
+        """Create work items on a single call to the Azure DevOps $batch endpoint
+
+        Reference: https://docs.microsoft.com/en-us/rest/api/azure/devops/wit/work%20items/create?view=azure-devops-rest-6.0
+
+        Args:
+            items: (project, work_item_type, document) tuples
+
+        Returns:
+            The work item created for each item, or the error when it failed
+        """
+        from azure.devops.released.work_item_tracking import WorkItem
+
+        response = self.session.post(
+            url=f"{Config.az_devops_organization_url}/_apis/wit/$batch?api-version=6.0",
+            json=[
+                {
+                    "method": "PATCH",
+                    "uri": f"/{quote(project)}/_apis/wit/workitems/${quote(work_item_type)}?api-version=6.0",
+                    "headers": {"Content-Type": "application/json-patch+json"},
+                    "body": document
+                }
+                for project, work_item_type, document in items
+            ],
+            timeout=Config.az_devops_timeout
+        )
+        response.raise_for_status()
+
+        results = list()
+
+        for item_response in response.json()["value"]:
+            body = item_response.get("body")
+
+            if isinstance(body, str):
+                body = json.loads(body)
+
+            if item_response["code"] >= 400:
+                message = (body or {}).get("message") if isinstance(body, dict) else body
+                results.append(RuntimeError(f"{item_response['code']}: {message}"))
+            else:
+                results.append(WorkItem.deserialize(body))
+
+        return results
+
     def update_work_item(self, project: str, document: list, work_item_id: str) -> dict:
         """Update an work item on Azure DevOps Boards
 
@@ -0,0 +1,99 @@
+"""
+Requests batching module
+"""
+
+import queue
+import threading
+import time
+
+from concurrent.futures import Future
+from typing import Callable, List
+
+from bot.config import Config
+
+
+class Batcher:
+    """
+    Collects the items submitted by many threads during a short window
+    and sends them together, giving each caller its own result
+
+    The window starts when the first item arrives, so a lone item waits
+    at most one window. A batch is sent earlier when it reaches max_size.
+
+    Args:
+        send: Function that receives a list of items and returns a list
+            with the result of each one, in the same order. An exception
+            in the list fails only its item, a raised one fails the batch
+        window: Seconds that the items are collected
+        max_size: Max items sent together
+        name: Name used on the sender thread and logs
+    """
+
+    def __init__(self, send: Callable[[list], list], window: float, max_size: int, name: str = "batcher"):
+        self.send = send
+        self.window = window
+        self.max_size = max_size
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self.queue = queue.Queue()
+        self._thread = threading.Thread(target=self._sender, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: object) -> Future:
+        """Add an item to the next batch
+
+        Args:
+            item: The item sent
+
+        Returns:
+            A future with the item result
+        """
+        future = Future()
+        self.queue.put((item, future))
+        return future
+
+    def collect(self) -> List[tuple]:
+        """Wait the next batch of items
+
+        Returns:
+            The (item, future) pairs of the batch
+        """
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.window
+
+        while len(batch) < self.max_size:
+            timeout = deadline - time.monotonic()
+
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _sender(self) -> None:
+        while True:
+            batch = self.collect()
+            futures = [future for _, future in batch]
+
+            try:
+                results = self.send([item for item, _ in batch])
+
+                if len(results) != len(batch):
+                    raise RuntimeError(f"{self.name}: {len(results)} results received for {len(batch)} items.")
+            except Exception as error:
+                Config.logger.error("%s: batch of %d items failed", self.name, len(batch), exc_info=True)
+                results = [error] * len(batch)
+
+            self.batches += 1
+            self.items += len(batch)
+
+            for future, result in zip(futures, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
@@ -0,0 +1,478 @@
+"""
+Cache module
+
+The metadata caches are created with create_cache: an in-process
+TTLCache, or a SQLiteCache shared by all the workers of a host when
+Config.cache_db is set, so N workers don't repeat the same lookups.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional, Union
+
+from bot.config import Config
+from bot.libs.metrics import CACHE_LOOKUPS
+
+
+class TTLCache:
+    """
+    Thread safe LRU cache where the entries expire after a TTL
+
+    Args:
+        maxsize: Maximum number of entries kept, the least recently
+                 used entry is evicted when it's exceeded
+        ttl: Time in seconds that an entry is kept
+        name: Cache label of the hits and misses metric, not counted when not set
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600, name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits, self._misses = bind_lookups_metric(name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[Any]:
+        """Get a cached value
+
+        Args:
+            key: The entry key
+            default: Value returned when the entry is missing or expired
+
+        Returns:
+            The cached value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if self._hits is not None:
+            (self._misses if entry is None else self._hits).inc()
+
+        return default if entry is None else entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Add or replace a cached value
+
+        Args:
+            key: The entry key
+            value: The value to cache
+        """
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def add(self, key: Hashable, value: Any) -> bool:
+        """Cache a value only when the key is missing or expired
+
+        Args:
+            key: The entry key
+            value: The value to cache
+
+        Returns:
+            Whether the value was added
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[1] > time.monotonic():
+                return False
+
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+            return True
+
+    def delete(self, key: Hashable) -> None:
+        """Evict a cached value
+
+        Args:
+            key: The entry key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Evict all cached values"""
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache:
+    """
+    Cache shared by all the processes of a host, kept on a SQLite
+    database in WAL mode with one table for all the caches
+
+    The reads take no lock: each thread reads on its own connection
+    and WAL readers don't wait the writers. The keys and values are
+    stored as JSON. The expired entries are deleted every purge_every
+    writes, when the oldest written entries beyond maxsize are evicted.
+
+    Args:
+        path: The database file path
+        name: The cache name, that namespaces its entries on the table
+        maxsize: Maximum number of entries kept
+        ttl: Time in seconds that an entry is kept
+        purge_every: Writes between the expired entries purges
+    """
+
+    def __init__(self, path: str, name: str, maxsize: int = 1024, ttl: float = 3600, purge_every: int = 100):
+        self.path = path
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._local = threading.local()
+        self._hits, self._misses = bind_lookups_metric(name)
+
+        # The connection isn't kept, so the forked workers don't share it
+        with sqlite3.connect(path, timeout=5) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache (name TEXT NOT NULL, key TEXT NOT NULL, "
+                "value TEXT NOT NULL, expires_at REAL NOT NULL, PRIMARY KEY (name, key))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (name, expires_at)")
+
+        connection.close()
+
+    def __len__(self) -> int:
+        row = self.connection().execute(
+            "SELECT COUNT(*) FROM cache WHERE name = ? AND expires_at > ?", (self.name, time.time())
+        ).fetchone()
+        return row[0]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def connection(self) -> sqlite3.Connection:
+        """Get the database connection of the current thread"""
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute("PRAGMA synchronous=NORMAL")
+
+        return connection
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[Any]:
+        """Get a cached value
+
+        Args:
+            key: The entry key
+            default: Value returned when the entry is missing or expired
+
+        Returns:
+            The cached value
+        """
+        row = self.connection().execute(
+            "SELECT value FROM cache WHERE name = ? AND key = ? AND expires_at > ?",
+            (self.name, json.dumps(key), time.time())
+        ).fetchone()
+
+        (self._misses if row is None else self._hits).inc()
+
+        return default if row is None else json.loads(row[0])
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Add or replace a cached value
+
+        Args:
+            key: The entry key
+            value: The value to cache, must be JSON serializable
+        """
+        self._write(
+            "INSERT OR REPLACE INTO cache (name, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (self.name, json.dumps(key), json.dumps(value), time.time() + self.ttl)
+        )
+
+    def add(self, key: Hashable, value: Any) -> bool:
+        """Cache a value only when the key is missing or expired
+
+        Args:
+            key: The entry key
+            value: The value to cache, must be JSON serializable
+
+        Returns:
+            Whether the value was added
+        """
+        now = time.time()
+
+        return self._write(
+            "INSERT INTO cache (name, key, value, expires_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (name, key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE cache.expires_at <= ?",
+            (self.name, json.dumps(key), json.dumps(value), now + self.ttl, now)
+        ) == 1
+
+    def delete(self, key: Hashable) -> None:
+        """Evict a cached value, on all the processes
+
+        Args:
+            key: The entry key
+        """
+        self._write("DELETE FROM cache WHERE name = ? AND key = ?", (self.name, json.dumps(key)))
+
+    def clear(self) -> None:
+        """Evict all cached values, on all the processes"""
+        self._write("DELETE FROM cache WHERE name = ?", (self.name,))
+
+    def _write(self, statement: str, params: tuple) -> int:
+        with self._writes_lock:
+            self._writes += 1
+            purge = self._writes % self.purge_every == 0
+
+        with self.connection() as connection:
+            rowcount = connection.execute(statement, params).rowcount
+
+            if purge:
+                connection.execute("DELETE FROM cache WHERE name = ? AND expires_at <= ?", (self.name, time.time()))
+                connection.execute(
+                    "DELETE FROM cache WHERE name = ? AND key IN (SELECT key FROM cache WHERE name = ? "
+                    "ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self.name, self.name, self.maxsize)
+                )
+
+        return rowcount
+
+
+def bind_lookups_metric(name: Optional[str]) -> tuple:
+    """Get the hits and misses counters of a cache, None when it has no name"""
+    if name is None:
+        return None, None
+
+    return CACHE_LOOKUPS.labels(cache=name, result="hit"), CACHE_LOOKUPS.labels(cache=name, result="miss")
+
+
+def create_shared_cache(name: str, maxsize: int = 1024, ttl: float = 3600) -> Optional[SQLiteCache]:
+    """Create a cache shared by the workers on Config.cache_db
+
+    Args:
+        name: The cache name
+        maxsize: Maximum number of entries kept
+        ttl: Time in seconds that an entry is kept
+
+    Returns:
+        The SQLiteCache, None when Config.cache_db is not set
+    """
+    if not Config.cache_db:
+        return None
+
+    os.makedirs(os.path.dirname(os.path.abspath(Config.cache_db)), exist_ok=True)
+    return SQLiteCache(Config.cache_db, name, maxsize=maxsize, ttl=ttl)
+
+
+def create_cache(name: str, maxsize: int = 1024, ttl: float = 3600) -> Union[TTLCache, SQLiteCache]:
+    """Create a metadata cache, shared by the workers when Config.cache_db is set
+
+    Args:
+        name: The cache name
+        maxsize: Maximum number of entries kept
+        ttl: Time in seconds that an entry is kept
+
+    Returns:
+        A SQLiteCache on Config.cache_db, or an in-process TTLCache
+    """
+    shared_cache = create_shared_cache(name, maxsize=maxsize, ttl=ttl)
+
+    if shared_cache is not None:
+        return shared_cache
+
+    return TTLCache(maxsize=maxsize, ttl=ttl, name=name)
+
+
+class RefreshingCache:
+    """
+    Thread safe cache that loads its values with a loader function
+    and refreshes them in the background before they expire
+
+    A value is loaded on the caller thread only when it was never
+    loaded. After that, it's refreshed in the background and the last
+    loaded value is served while the refresh runs or when it fails.
+    After a failed load the key isn't loaded again for retry_after
+    seconds, doubled on each failure up to refresh_after.
+
+    Args:
+        loader: Function that receives a key and returns its value,
+                a None return or an exception means the load failed
+        ttl: Seconds after which a value must be refreshed
+        refresh_ratio: Fraction of the ttl after which a value
+                       is refreshed in the background
+        name: Name used on the refresher thread and logs
+        store: SQLiteCache where the loaded values are shared with the
+               other workers, which use them instead of calling the loader
+        retry_after: Seconds before a key is loaded again after its first failure
+    """
+
+    def __init__(
+        self, loader: Callable, ttl: float = 3600, refresh_ratio: float = 0.8, name: str = "cache",
+        store: Optional[SQLiteCache] = None, retry_after: float = 1
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.refresh_after = ttl * refresh_ratio
+        self.name = name
+        self.store = store
+        self.retry_after = retry_after
+        self._entries = dict()
+        # Failed loads count and when the key can be loaded again, by key
+        self._failures = dict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._refresher = None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a value, loading it if it was never loaded
+
+        Args:
+            key: The value key
+
+        Returns:
+            The value or None if it could not be loaded
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return self.load(key) if not self._backing_off(key) else None
+
+        value, loaded_at = entry
+
+        if time.monotonic() - loaded_at >= self.refresh_after:
+            self.refresh(key)
+
+        return value
+
+    def load(self, key: Hashable) -> Optional[Any]:
+        """Load a value on the caller thread, keeping the last
+        loaded value if it fails
+
+        Args:
+            key: The value key
+
+        Returns:
+            The loaded value or the last loaded value
+        """
+        value, loaded_at = self.load_shared(key)
+
+        if value is None:
+            try:
+                value = self.loader(key)
+            except Exception:
+                value = None
+                Config.logger.error("%s: failed to load %s", self.name, key, exc_info=True)
+
+            if value is not None and self.store is not None:
+                self.store.set(key, [value, time.time()])
+
+        with self._lock:
+            self._refreshing.discard(key)
+
+            if value is not None:
+                self._entries[key] = (value, loaded_at)
+                self._failures.pop(key, None)
+                return value
+
+            failures = self._failures.get(key, (0, 0))[0] + 1
+            retry_delay = min(self.retry_after * 2 ** (failures - 1), self.refresh_after)
+            self._failures[key] = (failures, time.monotonic() + retry_delay)
+            entry = self._entries.get(key)
+
+        if entry is not None:
+            Config.logger.warning("%s: serving the last loaded value of %s", self.name, key)
+            return entry[0]
+
+    def load_shared(self, key: Hashable) -> tuple:
+        """Get a value loaded by another worker in the last refresh_after seconds
+
+        Args:
+            key: The value key
+
+        Returns:
+            The value, None when it's not shared, and when it was loaded on the monotonic clock
+        """
+        entry = self.store.get(key) if self.store is not None else None
+
+        if entry is None or time.time() - entry[1] >= self.refresh_after:
+            return None, time.monotonic()
+
+        value, loaded_at = entry
+        return value, time.monotonic() - max(time.time() - loaded_at, 0)
+
+    def refresh(self, key: Hashable) -> None:
+        """Load a value in the background, if it's not already loading
+        or waiting to be retried
+
+        Args:
+            key: The value key
+        """
+        if self._claim_refresh(key):
+            threading.Thread(target=self.load, args=(key,), name=f"{self.name}-refresh", daemon=True).start()
+
+    def prewarm(self, keys: Iterable[Hashable]) -> threading.Thread:
+        """Load the values in the background and start the refresher
+        that keeps them fresh before they expire
+
+        Args:
+            keys: The values keys
+
+        Returns:
+            The prewarm thread
+        """
+        prewarm = threading.Thread(
+            target=lambda: [self.load(key) for key in keys],
+            name=f"{self.name}-prewarm",
+            daemon=True
+        )
+        prewarm.start()
+
+        if self._refresher is None:
+            self._refresher = threading.Thread(target=self._refresh_all, name=f"{self.name}-refresher", daemon=True)
+            self._refresher.start()
+
+        return prewarm
+
+    def _backing_off(self, key: Hashable) -> bool:
+        failure = self._failures.get(key)
+        return failure is not None and time.monotonic() < failure[1]
+
+    def _claim_refresh(self, key: Hashable) -> bool:
+        with self._lock:
+            if key in self._refreshing or self._backing_off(key):
+                return False
+
+            self._refreshing.add(key)
+            return True
+
+    def _refresh_all(self) -> None:
+        while True:
+            time.sleep(self.refresh_after)
+
+            for key in list(self._entries):
+                if self._claim_refresh(key):
+                    self.load(key)
@@ -0,0 +1,136 @@
+"""
+Slack deliveries deduplication module
+
+Slack retries the events not acknowledged in 3 seconds, and a modal
+submitted twice sends the same view again. The deliveries are claimed
+by key on a cache, so the repeated ones are acknowledged without
+running the listeners again.
+"""
+
+import hashlib
+import json
+import os
+
+from typing import Callable, Optional, Union
+
+from slack_bolt import BoltResponse
+
+from bot.config import Config
+from bot.libs.cache import SQLiteCache, TTLCache
+from bot.libs.metrics import SLACK_DUPLICATE_DELIVERIES, slack_request_type
+
+
+def get_delivery_key(body: dict) -> Optional[str]:
+    """Get the key that identifies a Slack delivery across its retries
+
+    Args:
+        body: The Slack request body
+
+    Returns:
+        The event id of the events, the view id, hash and submitted values
+        of the view submissions or None for the requests that aren't deduplicated
+    """
+    if body.get("type") == "event_callback" and body.get("event_id"):
+        return f"event:{body['event_id']}"
+
+    if body.get("type") == "view_submission":
+        view = body.get("view") or {}
+
+        if view.get("id"):
+            values = json.dumps((view.get("state") or {}).get("values") or {}, sort_keys=True)
+            digest = hashlib.sha256(values.encode()).hexdigest()[:16]
+            return f"view:{view['id']}:{view.get('hash', '')}:{digest}"
+
+    return None
+
+
+class Deduplicator:
+    """
+    Bolt global middleware that acknowledges the repeated Slack
+    deliveries without running their listeners
+
+    Args:
+        deliveries: Cache where the deliveries are claimed, a TTLCache or
+                    a SQLiteCache to share them between processes
+    """
+
+    def __init__(self, deliveries: Union[TTLCache, SQLiteCache]):
+        self.deliveries = deliveries
+
+    @classmethod
+    def from_config(cls) -> "Deduplicator":
+        """Create the deduplicator with the deliveries cache set on Config"""
+        if Config.slack_dedup_db:
+            os.makedirs(os.path.dirname(os.path.abspath(Config.slack_dedup_db)), exist_ok=True)
+            return cls(SQLiteCache(
+                Config.slack_dedup_db, "slack-deliveries", maxsize=Config.slack_dedup_size, ttl=Config.slack_dedup_ttl
+            ))
+
+        return cls(TTLCache(maxsize=Config.slack_dedup_size, ttl=Config.slack_dedup_ttl))
+
+    def is_duplicate(self, body: dict, headers: dict) -> bool:
+        """Claim a delivery, logging the repeated ones
+
+        Args:
+            body: The Slack request body
+            headers: The Slack request headers
+
+        Returns:
+            Whether the delivery was already claimed
+        """
+        key = get_delivery_key(body)
+
+        if key is None:
+            return False
+
+        try:
+            if self.deliveries.add(key, True):
+                return False
+        except Exception:
+            # Processing a delivery twice is better than dropping it
+            Config.logger.error("Failed to claim the Slack delivery %s", key, exc_info=True)
+            return False
+
+        SLACK_DUPLICATE_DELIVERIES.labels(type=slack_request_type(body)).inc()
+        retry_num = (headers.get("x-slack-retry-num") or ["0"])[0]
+        Config.logger.info("Ignoring the Slack delivery %s, already received (retry %s)", key, retry_num)
+        return True
+
+    def release(self, body: dict) -> None:
+        """Forget a claimed delivery, when its listener rejected it and
+        asked the user to submit it again
+
+        Args:
+            body: The Slack request body
+        """
+        key = get_delivery_key(body)
+
+        if key is None:
+            return
+
+        try:
+            self.deliveries.delete(key)
+        except Exception:
+            Config.logger.error("Failed to release the Slack delivery %s", key, exc_info=True)
+
+    def middleware(self, body: dict, request: object, context: dict, next: Callable) -> Optional[BoltResponse]:
+        """Bolt global middleware that acknowledges the repeated deliveries
+
+        The listeners get a release_delivery function on the context, to
+        accept the delivery again after rejecting it
+        """
+        if self.is_duplicate(body, request.headers):
+            return BoltResponse(status=200, body="")
+
+        context["release_delivery"] = lambda: self.release(body)
+        return next()
+
+    async def async_middleware(
+        self, body: dict, request: object, context: dict, next: Callable
+    ) -> Optional[BoltResponse]:
+        """AsyncApp version of middleware"""
+        if self.is_duplicate(body, request.headers):
+            return BoltResponse(status=200, body="")
+
+        context["release_delivery"] = lambda: self.release(body)
+        return await next()
@@ -0,0 +1,146 @@
+"""
+JSON templates module
+"""
+
+import json
+import re
+
+from typing import Any, Callable, Union
+
+PLACEHOLDER = re.compile(r"{{\s*(\w+)\s*}}")
+MARKER = re.compile("\x00(\\w+)\x00")
+JSON_DECODER = json.JSONDecoder(strict=False)
+
+
+class JsonTemplate:
+    """
+    A jinja2 template of a JSON document, parsed once when it's loaded
+
+    Templates without placeholders, or where the placeholders are only
+    plain {{ variable }} inside JSON strings, are parsed to a builder
+    that creates a new document on each call without rendering and
+    parsing the JSON again. Other templates are rendered and parsed on
+    each call.
+
+    Args:
+        template: The jinja2 template
+        source: The template source
+    """
+
+    def __init__(self, template: object, source: str):
+        self.template = template
+        self.variables = PLACEHOLDER.findall(source)
+        self.document = None
+        self.builder = None
+
+        if "{%" in source or "{#" in source or source.count("{{") != len(self.variables):
+            return
+
+        if not self.variables:
+            self.document = json.loads(template.render(), strict=False)
+            self.builder = self.compile(self.document)
+            return
+
+        document = json.loads(
+            template.render(**{variable: f"\x00{variable}\x00" for variable in self.variables}),
+            strict=False
+        )
+
+        try:
+            self.builder = self.compile(document)
+        except ValueError:
+            pass
+
+    @property
+    def is_static(self) -> bool:
+        """Whether the template has no placeholders"""
+        return self.document is not None
+
+    def render(self, **kwargs) -> Union[list, dict]:
+        """Build the template document
+
+        Args:
+            kwargs: Values of the template variables
+
+        Returns:
+            A new document, that the caller can change
+        """
+        if self.builder is not None:
+            return self.builder(kwargs)
+
+        return json.loads(self.template.render(**kwargs), strict=False)
+
+    @classmethod
+    def compile(cls, node: Any) -> Callable:
+        """Compile a parsed document to a function that builds it
+
+        Args:
+            node: A parsed JSON document node
+
+        Returns:
+            A function that receives the variables values and
+            returns a new document node
+        """
+        if isinstance(node, dict):
+            if any(MARKER.search(key) for key in node):
+                raise ValueError("Placeholders are only supported on JSON values.")
+
+            # Values without placeholders are copied as they are
+            static_items = {
+                key: value for key, value in node.items()
+                if not isinstance(value, (dict, list)) and not (isinstance(value, str) and MARKER.search(value))
+            }
+            items = [(key, cls.compile(value)) for key, value in node.items() if key not in static_items]
+
+            def build_dict(values: dict) -> dict:
+                document = dict(static_items)
+
+                for key, build in items:
+                    document[key] = build(values)
+
+                return document
+
+            return build_dict
+
+        if isinstance(node, list):
+            builders = [cls.compile(value) for value in node]
+            return lambda values: [build(values) for build in builders]
+
+        if isinstance(node, str) and MARKER.search(node):
+            # Even indexes are the literal parts, odd indexes the variables names
+            parts = MARKER.split(node)
+
+            if len(parts) == 3 and not parts[0] and not parts[2]:
+                variable = parts[1]
+                return lambda values: cls.json_string(values.get(variable, ""))
+
+            return lambda values: "".join(
+                part if index % 2 == 0 else cls.json_string(values.get(part, ""))
+                for index, part in enumerate(parts)
+            )
+
+        return lambda values: node
+
+    @staticmethod
+    def json_string(value: Any) -> str:
+        """Convert a value to the string it had inside a rendered JSON string
+
+        The escape sequences, like the escaped backslashes on the
+        Azure DevOps paths, are decoded as json.loads did with the
+        rendered template
+
+        Args:
+            value: The variable value
+
+        Returns:
+            The decoded string
+        """
+        value = str(value)
+
+        if "\\" not in value:
+            return value
+
+        try:
+            return JSON_DECODER.decode(f'"{value}"')
+        except ValueError:
+            return value
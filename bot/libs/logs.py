@@ -0,0 +1,178 @@
+"""
+Logging pipeline module
+
+The request threads only put the log records on a queue, a listener
+thread formats them and writes them to stderr
+"""
+
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+TEXT_FORMAT = "[%(asctime)s] [%(process)s] [%(levelname)s] %(filename)s:%(lineno)s:%(funcName)s() - %(message)s"
+DATE_FORMAT = "%F %T %z"
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats the records as a JSON object by line, with the traceback as a field"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = dict(
+            time=self.formatTime(record, self.datefmt),
+            level=record.levelname,
+            logger=record.name,
+            process=record.process,
+            thread=record.threadName,
+            location=f"{record.filename}:{record.lineno}:{record.funcName}()",
+            message=record.getMessage()
+        )
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate limits the repeated warnings and errors, so a failing
+    dependency doesn't flood the logs with the same record
+
+    Each call site logs up to burst records by window, the next ones
+    are dropped and counted on the first record of the next window
+
+    Args:
+        burst: Records by call site and window, 0 disables the sampling
+        window: Seconds of each window
+        level: Min level sampled, the lower ones are always logged
+    """
+
+    def __init__(self, burst: int, window: float, level: int = logging.WARNING):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.level = level
+        self.suppressed = 0
+        self._sites = dict()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.burst <= 0 or record.levelno < self.level:
+            return True
+
+        key = (record.pathname, record.lineno, record.levelno)
+        now = time.monotonic()
+
+        with self._lock:
+            window_start, count, suppressed = self._sites.get(key, (now, 0, 0))
+
+            if now - window_start >= self.window:
+                window_start, count = now, 0
+
+            if count >= self.burst:
+                self._sites[key] = (window_start, count, suppressed + 1)
+                self.suppressed += 1
+                return False
+
+            self._sites[key] = (window_start, count + 1, 0)
+
+        if suppressed:
+            record.suppressed = suppressed
+            record.msg = f"{record.msg} ({suppressed} similar records suppressed)"
+
+        return True
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    Puts the records on the queue without formatting them
+
+    QueueHandler renders the message and the traceback on the logging
+    thread, here it's left to the listener handlers. The records are
+    dropped and counted when the queue is full, so logging never blocks.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stats(self) -> dict:
+        """Get the queued records and the records dropped by a full queue or suppressed by the sampling"""
+        return dict(
+            queue_depth=self.queue.qsize(),
+            dropped=self.dropped,
+            suppressed=sum(getattr(log_filter, "suppressed", 0) for log_filter in self.filters)
+        )
+
+
+def setup_logging(
+    level: str = "INFO", json_output: bool = False, queue_size: int = 10000,
+    sampling_burst: int = 10, sampling_window: float = 60
+) -> QueueListener:
+    """Replace the root logger handlers by the queue pipeline
+
+    Args:
+        level: Root logger level name
+        json_output: Write a JSON object by record instead of text lines
+        queue_size: Max records waiting to be written
+        sampling_burst: Warnings and errors logged by call site and window, 0 logs all of them
+        sampling_window: Seconds of each sampling window
+
+    Returns:
+        The started listener, stopped on exit after writing the queued records
+    """
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        JsonFormatter(datefmt=DATE_FORMAT) if json_output else logging.Formatter(TEXT_FORMAT, DATE_FORMAT)
+    )
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = LazyQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sampling_burst, sampling_window))
+
+    root_logger = logging.getLogger()
+
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(level.upper())
+
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_listener, listener)
+
+    return listener
+
+
+def stop_listener(listener: QueueListener) -> None:
+    """Write the queued records and stop the listener thread, when it's running"""
+    if listener._thread is not None:
+        listener.stop()
+
+
+def get_queue_handler(logger: Optional[logging.Logger] = None) -> Optional[LazyQueueHandler]:
+    """Get the queue handler installed by setup_logging on a logger, the root one by default"""
+    for handler in (logger or logging.getLogger()).handlers:
+        if isinstance(handler, LazyQueueHandler):
+            return handler
+
+    return None
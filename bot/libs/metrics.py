@@ -0,0 +1,279 @@
+"""
+Prometheus metrics module
+
+The latencies are observed on histograms with their labels bound
+once, and the queues and pools state is read only when /metrics is
+scraped, so the collection adds a couple of microseconds per call.
+"""
+
+import asyncio
+import functools
+import inspect
+import re
+import time
+
+from typing import Callable
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from bot.libs import tracing
+from bot.libs.logs import get_queue_handler
+from bot.libs.tracing import slack_request_type
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+AZ_DEVOPS_RESOURCE = re.compile(r"/_apis/([^/?]+(?:/[^/?]+)?)")
+
+HTTP_REQUEST_DURATION = Histogram(
+    "bot_http_request_duration_seconds", "HTTP requests served by the bot",
+    ["route", "status"], buckets=LATENCY_BUCKETS
+)
+BOLT_DISPATCH_DURATION = Histogram(
+    "bot_bolt_dispatch_duration_seconds", "Slack requests dispatched by Bolt until they are acknowledged",
+    ["type"], buckets=LATENCY_BUCKETS
+)
+HANDLER_DURATION = Histogram(
+    "bot_handler_duration_seconds", "Slack handlers run time",
+    ["handler"], buckets=LATENCY_BUCKETS
+)
+HANDLER_ERRORS = Counter(
+    "bot_handler_errors_total", "Slack handlers that raised an error",
+    ["handler"]
+)
+SLACK_AUTO_REPLIES = Counter(
+    "bot_slack_auto_replies_total", "Channel messages answered by the bot, by sent, ephemeral or suppressed reply",
+    ["result"]
+)
+SLACK_DUPLICATE_DELIVERIES = Counter(
+    "bot_slack_duplicate_deliveries_total", "Slack retries and resubmissions acknowledged without processing",
+    ["type"]
+)
+SHORTCUTS_RELOADS = Counter(
+    "bot_shortcuts_reloads_total", "Shortcuts configurations changes, by loaded or failed reload",
+    ["result"]
+)
+CACHE_LOOKUPS = Counter(
+    "bot_cache_lookups_total", "Metadata cache lookups, by cache and hit or miss",
+    ["cache", "result"]
+)
+OUTBOUND_CALL_DURATION = Histogram(
+    "bot_outbound_call_duration_seconds", "Slack and Azure DevOps API calls",
+    ["service", "method"], buckets=LATENCY_BUCKETS
+)
+OUTBOUND_CALL_ERRORS = Counter(
+    "bot_outbound_call_errors_total", "Slack and Azure DevOps API calls that failed",
+    ["service", "method"]
+)
+OUTBOUND_CALL_WAIT = Histogram(
+    "bot_outbound_call_wait_seconds", "Time the API calls waited the rate limiter to be sent",
+    ["service", "limit"], buckets=(0, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+# Outbound calls metrics with their labels bound, by (service, method)
+_outbound_call_metrics = dict()
+
+
+def instrument_handler(name: str) -> Callable:
+    """Decorator that observes the run time and the errors of a Slack handler,
+    traced as a span of the request
+
+    The wrapper keeps the handler signature on __signature__, read by the
+    inspect.getfullargspec Bolt uses to inject the listener arguments
+
+    Args:
+        name: The handler label
+
+    Returns:
+        The decorator
+    """
+    duration = HANDLER_DURATION.labels(handler=name)
+    errors = HANDLER_ERRORS.labels(handler=name)
+
+    def decorator(function: Callable) -> Callable:
+        signature = inspect.signature(function)
+
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                started_at = time.perf_counter()
+
+                try:
+                    with tracing.span(name):
+                        return await function(*args, **kwargs)
+                except Exception:
+                    errors.inc()
+                    raise
+                finally:
+                    duration.observe(time.perf_counter() - started_at)
+
+            async_wrapper.__signature__ = signature
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started_at = time.perf_counter()
+
+            try:
+                with tracing.span(name):
+                    return function(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                duration.observe(time.perf_counter() - started_at)
+
+        wrapper.__signature__ = signature
+        return wrapper
+
+    return decorator
+
+
+def observe_outbound_call(service: str, method: str, started_at: float, failed: bool) -> None:
+    """Observe a Slack or Azure DevOps API call
+
+    Args:
+        service: slack or az_devops
+        method: The Web API method or the Azure DevOps HTTP method and resource
+        started_at: time.perf_counter() when the call started
+        failed: Whether the call failed
+    """
+    call_metrics = _outbound_call_metrics.get((service, method))
+
+    if call_metrics is None:
+        call_metrics = _outbound_call_metrics[(service, method)] = (
+            OUTBOUND_CALL_DURATION.labels(service=service, method=method),
+            OUTBOUND_CALL_ERRORS.labels(service=service, method=method)
+        )
+
+    call_metrics[0].observe(time.perf_counter() - started_at)
+
+    if failed:
+        call_metrics[1].inc()
+
+
+def az_devops_method(http_method: str, url: str) -> str:
+    """Get the label of an Azure DevOps call, like "GET work/teamsettings"
+
+    Args:
+        http_method: The HTTP method
+        url: The request url
+
+    Returns:
+        The HTTP method and the API resource
+    """
+    resource = AZ_DEVOPS_RESOURCE.search(url)
+    return f"{http_method.upper()} {resource.group(1) if resource else 'other'}"
+
+
+def bolt_dispatch_middleware(body: dict, next: Callable) -> object:
+    """Bolt global middleware that observes the time until the request is acknowledged"""
+    started_at = time.perf_counter()
+
+    try:
+        return next()
+    finally:
+        BOLT_DISPATCH_DURATION.labels(type=slack_request_type(body)).observe(time.perf_counter() - started_at)
+
+
+async def async_bolt_dispatch_middleware(body: dict, next: Callable) -> object:
+    """AsyncApp version of bolt_dispatch_middleware"""
+    started_at = time.perf_counter()
+
+    try:
+        return await next()
+    finally:
+        BOLT_DISPATCH_DURATION.labels(type=slack_request_type(body)).observe(time.perf_counter() - started_at)
+
+
+def observe_http_request(route: str, status: int, started_at: float) -> None:
+    """Observe a HTTP request served by the bot
+
+    Args:
+        route: The route path
+        status: The response status
+        started_at: time.perf_counter() when the request started
+    """
+    HTTP_REQUEST_DURATION.labels(route=route, status=str(status)).observe(time.perf_counter() - started_at)
+
+
+class StateCollector:
+    """
+    Prometheus collector that reads the work queues, thread pools, rate
+    limiters and log queue state when /metrics is scraped
+
+    Attributes:
+        work_queues: Registered WorkQueue instances
+        executors: Registered ThreadPoolExecutor getters by name
+        rate_limiters: Registered RateLimiter getters
+    """
+
+    def __init__(self):
+        self.work_queues = list()
+        self.executors = dict()
+        self.rate_limiters = list()
+
+    def collect(self):
+        queue_depth = GaugeMetricFamily("bot_work_queue_depth", "Jobs waiting on the work queue", labels=["queue"])
+        queue_workers = GaugeMetricFamily("bot_work_queue_workers", "Work queue worker threads", labels=["queue"])
+        queue_jobs = CounterMetricFamily("bot_work_queue_jobs", "Work queue jobs by state", labels=["queue", "state"])
+
+        for work_queue in self.work_queues:
+            stats = work_queue.stats()
+            queue_depth.add_metric([work_queue.name], stats["queue_depth"])
+            queue_workers.add_metric([work_queue.name], stats["workers"])
+
+            for state in ["submitted", "rejected", "completed", "failed"]:
+                queue_jobs.add_metric([work_queue.name, state], stats[state])
+
+        pool_threads = GaugeMetricFamily("bot_thread_pool_threads", "Thread pool started threads", labels=["pool"])
+        pool_queue = GaugeMetricFamily("bot_thread_pool_queue_depth", "Tasks waiting on the thread pool", labels=["pool"])
+
+        for name, get_executor in self.executors.items():
+            executor = get_executor()
+
+            if executor is not None:
+                pool_threads.add_metric([name], len(executor._threads))
+                pool_queue.add_metric([name], executor._work_queue.qsize())
+
+        throttled = CounterMetricFamily(
+            "bot_outbound_calls_throttled", "API calls rejected by the remote rate limits", labels=["service"]
+        )
+        rejected = CounterMetricFamily(
+            "bot_outbound_calls_rejected", "API calls not sent before the rate limit deadline", labels=["service"]
+        )
+
+        for get_rate_limiter in self.rate_limiters:
+            rate_limiter = get_rate_limiter()
+            stats = rate_limiter.stats()
+            throttled.add_metric([rate_limiter.name], stats["throttled"])
+            rejected.add_metric([rate_limiter.name], stats["rejected"])
+
+        log_queue_depth = GaugeMetricFamily("bot_log_queue_depth", "Log records waiting to be written")
+        log_records_lost = CounterMetricFamily(
+            "bot_log_records_lost", "Log records dropped by a full queue or suppressed by the sampling", labels=["reason"]
+        )
+        queue_handler = get_queue_handler()
+
+        if queue_handler is not None:
+            stats = queue_handler.stats()
+            log_queue_depth.add_metric([], stats["queue_depth"])
+            log_records_lost.add_metric(["dropped"], stats["dropped"])
+            log_records_lost.add_metric(["suppressed"], stats["suppressed"])
+
+        return [
+            queue_depth, queue_workers, queue_jobs, pool_threads, pool_queue, throttled, rejected,
+            log_queue_depth, log_records_lost
+        ]
+
+
+state_collector = StateCollector()
+REGISTRY.register(state_collector)
+
+
+def export() -> tuple:
+    """Get the metrics on the Prometheus text format
+
+    Returns:
+        The metrics and their content type
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,277 @@
+"""
+Outbound calls rate limiting module
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+from typing import Callable, Optional
+
+from bot.config import Config
+from bot.libs.metrics import OUTBOUND_CALL_WAIT
+
+
+class RateLimited(Exception):
+    """
+    Raised when a call is rejected by a rate limit
+
+    Args:
+        retry_after: Seconds to wait before retrying, None when unknown
+        message: Error message
+    """
+
+    def __init__(self, retry_after: Optional[float] = None, message: str = "Rate limited"):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket that schedules the calls instead of rejecting them
+
+    Each call takes a token, and when there are none left the call
+    is scheduled for when its token is refilled. A pause, like the
+    one asked by a Retry-After header, stops the refill until it ends.
+
+    Args:
+        rate: Tokens refilled per second
+        burst: Max tokens stored
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """Take a token
+
+        Args:
+            max_wait: Max seconds the call can wait its token
+
+        Returns:
+            Seconds to wait before the call, or None when it would
+            wait more than max_wait, keeping the token on the bucket
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            if now > self.updated_at:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+
+            wait = (self.updated_at - now) + max(1 - self.tokens, 0) / self.rate
+
+            if wait > max_wait:
+                return None
+
+            self.tokens -= 1
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        """Stop giving tokens for some seconds, letting one call through when it ends
+
+        Args:
+            seconds: Pause duration
+        """
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+
+            if resume_at > self.updated_at:
+                self.updated_at = resume_at
+                self.tokens = min(self.tokens, 1)
+
+
+class RateLimiter:
+    """
+    Scheduler of the outbound calls to an API, with a token bucket by limit
+
+    The calls wait their turn on the bucket of their key, so they are
+    sent at the sustainable rate instead of failing. Calls rejected
+    with RateLimited are retried after the Retry-After, plus a jitter,
+    until the deadline.
+
+    Args:
+        limits: [requests per minute, burst] by limit name. The limit of
+            a key is the one named as the key part before ":", so
+            "chat.postMessage:C123" has its own bucket with the
+            "chat.postMessage" limit
+        default_limit: Limit name of the keys without a limit
+        deadline: Max seconds a call waits and retries
+        name: Name used on logs
+    """
+
+    _instances = dict()
+    _instances_lock = threading.Lock()
+
+    def __init__(self, limits: dict, default_limit: str, deadline: float = 30, name: str = "rate-limiter"):
+        self.limits = limits
+        self.default_limit = default_limit
+        self.deadline = deadline
+        self.name = name
+        self.buckets = dict()
+        self.wait_times = dict()
+        self.throttled = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls, name: str, limits: dict, default_limit: str) -> "RateLimiter":
+        """Get the process wide rate limiter of an API
+
+        Args:
+            name: API name
+            limits: [requests per minute, burst] by limit name
+            default_limit: Limit name of the keys without a limit
+
+        Returns:
+            The shared RateLimiter instance
+        """
+        if name not in cls._instances:
+            with cls._instances_lock:
+                if name not in cls._instances:
+                    cls._instances[name] = cls(limits, default_limit, deadline=Config.rate_limit_deadline, name=name)
+
+        return cls._instances[name]
+
+    def get_limit_name(self, key: str) -> str:
+        limit_name = key.split(":")[0]
+        return limit_name if limit_name in self.limits else self.default_limit
+
+    def get_bucket(self, key: str) -> TokenBucket:
+        bucket = self.buckets.get(key)
+
+        if bucket is None:
+            with self._lock:
+                bucket = self.buckets.get(key)
+
+                if bucket is None:
+                    per_minute, burst = self.limits[self.get_limit_name(key)]
+                    bucket = self.buckets[key] = TokenBucket(rate=per_minute / 60, burst=burst)
+
+        return bucket
+
+    def schedule(self, key: str, deadline: float) -> float:
+        """Reserve the next call of a key
+
+        Args:
+            key: Bucket key
+            deadline: time.monotonic() deadline of the call
+
+        Returns:
+            Seconds to wait before the call
+        """
+        wait = self.get_bucket(key).reserve(max(deadline - time.monotonic(), 0))
+
+        if wait is None:
+            with self._lock:
+                self.rejected += 1
+
+            raise RateLimited(message=f"{self.name}: {key} can't be sent before the {self.deadline}s deadline.")
+
+        self.record_wait(key, wait)
+        return wait
+
+    def backoff(self, key: str, error: RateLimited, attempt: int, deadline: float) -> float:
+        """Pause the key bucket after a rejected call
+
+        Returns:
+            Seconds to wait before the retry is scheduled
+        """
+        retry_after = error.retry_after if error.retry_after is not None else min(2 ** attempt, 30)
+
+        with self._lock:
+            self.throttled += 1
+
+        Config.logger.warning("%s: %s rate limited, retrying after %ss", self.name, key, retry_after)
+        self.get_bucket(key).pause(retry_after)
+
+        jitter = random.uniform(0, min(retry_after, 1) / 2)  # nosec
+
+        if time.monotonic() + retry_after + jitter > deadline:
+            raise error
+
+        return jitter
+
+    def call(self, key: str, function: Callable, *args, **kwargs) -> object:
+        """Call a function when the key bucket allows, retrying the rate limited calls
+
+        Args:
+            key: Bucket key
+            function: The outbound call, raising RateLimited when it's rejected
+            args: Positional arguments passed to the function
+            kwargs: Keyword arguments passed to the function
+
+        Returns:
+            The function result
+        """
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+
+        while True:
+            wait = self.schedule(key, deadline)
+
+            if wait > 0:
+                time.sleep(wait)
+
+            try:
+                return function(*args, **kwargs)
+            except RateLimited as error:
+                time.sleep(self.backoff(key, error, attempt, deadline))
+                attempt += 1
+
+    async def acall(self, key: str, function: Callable, *args, **kwargs) -> object:
+        """Await a coroutine function when the key bucket allows, retrying the rate limited calls
+
+        Args:
+            key: Bucket key
+            function: The outbound coroutine function, raising RateLimited when it's rejected
+            args: Positional arguments passed to the function
+            kwargs: Keyword arguments passed to the function
+
+        Returns:
+            The function result
+        """
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+
+        while True:
+            wait = self.schedule(key, deadline)
+
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            try:
+                return await function(*args, **kwargs)
+            except RateLimited as error:
+                await asyncio.sleep(self.backoff(key, error, attempt, deadline))
+                attempt += 1
+
+    def record_wait(self, key: str, wait: float) -> None:
+        limit_name = self.get_limit_name(key)
+        OUTBOUND_CALL_WAIT.labels(service=self.name, limit=limit_name).observe(wait)
+
+        with self._lock:
+            calls, total, maximum = self.wait_times.get(limit_name, (0, 0.0, 0.0))
+            self.wait_times[limit_name] = (calls + 1, total + wait, max(maximum, wait))
+
+    def stats(self) -> dict:
+        """Get the calls counters and the time they waited to be sent
+
+        Returns:
+            A dict with the throttled and rejected calls counters, and the
+            calls count, total and max wait time in seconds by limit name
+        """
+        with self._lock:
+            return dict(
+                throttled=self.throttled,
+                rejected=self.rejected,
+                wait_times={
+                    limit_name: dict(calls=calls, wait_time_total=total, wait_time_max=maximum)
+                    for limit_name, (calls, total, maximum) in self.wait_times.items()
+                }
+            )
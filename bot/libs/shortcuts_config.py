@@ -0,0 +1,277 @@
+"""
+Shortcuts configurations loading module
+"""
+
+import json
+import os
+import threading
+
+from types import MappingProxyType
+from typing import Callable, Optional
+
+from bot.config import Config
+from bot.libs import metrics
+
+SHORTCUTS_EXTENSIONS = (".json", ".yaml", ".yml")
+
+# Shortcut config keys with their type and default, None when the key is required
+SHORTCUT_SCHEMA = {
+    "az_devops_board": (str, None),
+    "az_devops_board_template": (str, None),
+    "az_devops_project": (str, None),
+    "az_devops_work_item_type": (str, None),
+    "az_devops_work_item_area": (str, None),
+    "az_devops_work_item_iteration": (str, ""),
+    "az_devops_sla": (dict, None),
+    "slack_channel": (str, None),
+    "slack_support_team": (str, None),
+    "slack_template": (str, None)
+}
+
+
+def list_shortcuts_files(path: str) -> list:
+    """List the shortcuts files of a path
+
+    Args:
+        path: A shortcuts file or a directory of them
+
+    Returns:
+        The file paths, sorted by name
+    """
+    if not os.path.isdir(path):
+        return [path]
+
+    return sorted(
+        os.path.join(path, file_name)
+        for file_name in os.listdir(path)
+        if file_name.endswith(SHORTCUTS_EXTENSIONS)
+    )
+
+
+def read_shortcuts_file(path: str) -> dict:
+    """Read a JSON or YAML shortcuts file
+
+    PyYAML is only imported for the YAML files, so it doesn't
+    add to the startup time when they aren't used
+
+    Args:
+        path: The file path
+
+    Returns:
+        The shortcuts configurations by callback_id
+
+    Raises:
+        ValueError: When the file can't be read or parsed
+    """
+    is_yaml = path.endswith((".yaml", ".yml"))
+
+    if is_yaml:
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f"{path}: PyYAML is required to load YAML shortcuts files")
+
+    try:
+        with open(path, encoding="utf-8") as shortcuts_file:
+            return yaml.safe_load(shortcuts_file) if is_yaml else json.load(shortcuts_file)
+    except Exception as error:
+        raise ValueError(f"{path}: {error}")
+
+
+def load_shortcuts(path: str) -> dict:
+    """Load the shortcuts configurations of a file or a directory
+
+    Args:
+        path: A shortcuts file or a directory of them
+
+    Returns:
+        The shortcuts configurations by callback_id
+
+    Raises:
+        ValueError: When a file can't be parsed or a shortcut is on more than one file
+    """
+    shortcuts = dict()
+    files = dict()
+
+    for file_path in list_shortcuts_files(path):
+        file_shortcuts = read_shortcuts_file(file_path)
+
+        if not isinstance(file_shortcuts, dict):
+            raise ValueError(f"{file_path}: expected the shortcuts configurations by callback_id")
+
+        for shortcut, shortcut_config in file_shortcuts.items():
+            if shortcut in files:
+                raise ValueError(f"{file_path}: shortcut {shortcut} already defined on {files[shortcut]}")
+
+            files[shortcut] = file_path
+            shortcuts[shortcut] = shortcut_config
+
+    return shortcuts
+
+
+def compile_shortcuts(shortcuts: dict) -> MappingProxyType:
+    """Validate the shortcuts configurations against SHORTCUT_SCHEMA
+    and freeze them, so a loaded config can't be changed while in use
+
+    Args:
+        shortcuts: The shortcuts configurations by callback_id
+
+    Returns:
+        The read-only shortcuts configurations, with the optional keys defaults
+
+    Raises:
+        ValueError: With all the schema errors found
+    """
+    errors = list()
+    compiled = dict()
+
+    for shortcut, shortcut_config in shortcuts.items():
+        if not isinstance(shortcut, str) or not shortcut:
+            errors.append(f"{shortcut!r}: the callback_id must be a non empty string")
+            continue
+
+        if not isinstance(shortcut_config, dict):
+            errors.append(f"{shortcut}: expected a mapping")
+            continue
+
+        errors.extend(f"{shortcut}.{key}: unknown key" for key in shortcut_config if key not in SHORTCUT_SCHEMA)
+        compiled_config = dict()
+
+        for key, (value_type, default) in SHORTCUT_SCHEMA.items():
+            value = shortcut_config.get(key, default)
+
+            if value is None:
+                errors.append(f"{shortcut}.{key}: required")
+            elif not isinstance(value, value_type):
+                errors.append(f"{shortcut}.{key}: expected {value_type.__name__}, got {type(value).__name__}")
+            else:
+                compiled_config[key] = value
+
+        sla = compiled_config.get("az_devops_sla")
+
+        if sla is not None:
+            if not sla or not all(isinstance(value, str) for value in sla.values()):
+                errors.append(f"{shortcut}.az_devops_sla: expected the SLA text by environment")
+
+            compiled_config["az_devops_sla"] = MappingProxyType(dict(sla))
+
+        compiled[shortcut] = MappingProxyType(compiled_config)
+
+    if errors:
+        raise ValueError("Invalid shortcuts: " + "; ".join(errors))
+
+    return MappingProxyType(compiled)
+
+
+class ShortcutsWatcher:
+    """
+    Loads the shortcuts configurations from a file or directory and
+    polls their mtimes, swapping the changed configurations on Config
+
+    A new config is validated, its templates parsed and its channels
+    index built before the swap, so the requests in flight keep the
+    config they read and the handlers never wait on a reload. An invalid
+    change is logged and the running config is kept.
+
+    Args:
+        path: A shortcuts file or a directory of them
+        interval: Seconds between the mtimes checks
+    """
+
+    def __init__(self, path: str, interval: float):
+        self.path = path
+        self.interval = interval
+        self.on_change = None
+        self.signature = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls) -> Optional["ShortcutsWatcher"]:
+        """Create the watcher of Config.slack_shortcuts_path and load it
+
+        Returns:
+            The watcher, None when no path is set
+
+        Raises:
+            ValueError: When the shortcuts configurations are invalid
+        """
+        if not Config.slack_shortcuts_path:
+            return None
+
+        watcher = cls(Config.slack_shortcuts_path, Config.slack_shortcuts_reload_interval)
+        watcher.load()
+        return watcher
+
+    def get_signature(self) -> tuple:
+        """Get the path, mtime and size of each shortcuts file, that change when they are edited"""
+        signature = list()
+
+        for file_path in list_shortcuts_files(self.path):
+            try:
+                stat = os.stat(file_path)
+                signature.append((file_path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((file_path, None, None))
+
+        return tuple(signature)
+
+    def load(self) -> None:
+        """Load, validate and swap the shortcuts configurations
+
+        Raises:
+            ValueError: When the shortcuts configurations are invalid
+        """
+        self.signature = self.get_signature()
+        shortcuts = compile_shortcuts(load_shortcuts(self.path))
+        Config.validate_templates(shortcuts)
+        Config.set_slack_shortcuts(shortcuts)
+        Config.logger.info("Loaded %d shortcuts from %s", len(shortcuts), self.path)
+
+    def reload(self) -> bool:
+        """Load the shortcuts configurations when the files changed
+
+        Returns:
+            Whether a new config was swapped
+        """
+        if self.get_signature() == self.signature:
+            return False
+
+        try:
+            self.load()
+        except ValueError as error:
+            metrics.SHORTCUTS_RELOADS.labels("failed").inc()
+            Config.logger.error("Keeping the current shortcuts, %s", error)
+            return False
+
+        metrics.SHORTCUTS_RELOADS.labels("loaded").inc()
+
+        if self.on_change:
+            try:
+                self.on_change()
+            except Exception as error:
+                Config.logger.error("Shortcuts change callback failed: %s", error)
+
+        return True
+
+    def start(self, on_change: Optional[Callable[[], None]] = None) -> None:
+        """Start polling the shortcuts files on a background thread
+
+        Args:
+            on_change: Called after a new config is swapped
+        """
+        self.on_change = on_change
+
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._poll, name="shortcuts-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _poll(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.reload()
+            except Exception as error:
+                Config.logger.error("Shortcuts reload failed: %s", error)
@@ -3,7 +3,12 @@ Slack client module
 """
 
 from slack_bolt import App
+from slack_bolt.adapter.socket_mode import SocketModeHandler
+from slack_sdk import WebClient
+
 from bot.config import Config
+from bot.libs.slack_web_client import RateLimitedWebClient
+from bot.libs.tracing import TracingExecutor, trace_slack_request
 
 
 class SlackApp(App):
@@ -17,18 +22,63 @@ class SlackApp(App):
     def __init__(self):
         super().__init__(
             signing_secret=Config.slack_signing_secret,
-            token=Config.slack_bot_token
+            client=RateLimitedWebClient(token=Config.slack_bot_token, base_url=Config.slack_api_url)
+        )
+
+        # The listeners run on the pool with the trace of their request. The
+        # pool is swapped on the listener runner, Bolt 1.6 has no
+        # listener_executor argument
+        listener_executor = TracingExecutor(max_workers=10, thread_name_prefix="bolt-listener")
+        self.listener_runner.listener_executor = listener_executor
+        self.listener_runner.lazy_listener_runner.executor = listener_executor
+
+    def dispatch(self, req: object) -> object:
+        with trace_slack_request(req.body):
+            return super().dispatch(req)
+
+    def _init_context(self, req: object) -> None:
+        super()._init_context(req)
+
+        # Newer Bolt versions give each request a plain client copy,
+        # so the listeners calls would skip the rate limiter and metrics
+        if not isinstance(req.context.client, RateLimitedWebClient):
+            req.context["client"] = self.client
+
+    def socket_mode_handler(self) -> SocketModeHandler:
+        """Create the Socket Mode handler, that receives the Slack
+        requests on a WebSocket instead of the HTTP endpoint
+
+        Raises:
+            ValueError: When the app-level token is not set
+
+        Returns:
+            The Socket Mode handler, with a pool of
+            Config.slack_socket_mode_concurrency threads
+        """
+        if not Config.slack_app_token:
+            raise ValueError("SLACK_APP_TOKEN is required by the Socket Mode entry point.")
+
+        return SocketModeHandler(
+            self,
+            app_token=Config.slack_app_token,
+            web_client=WebClient(base_url=Config.slack_api_url),
+            concurrency=Config.slack_socket_mode_concurrency
         )
 
     def get_usergroups_id(self, usergroups: list = []) -> dict:
-        usergroups_list = self.client.usergroups_list(types="public_channel,private_channel")
-        output = dict()
+        """Get the ids of some usergroups with a single usergroups_list call
+
+        The handlers use the usergroups index cached by SlackResolver instead
 
-        for usergroup in usergroups_list["usergroups"]:
-            usergroup_id = usergroup["id"]
-            usergroup_handle = usergroup["handle"]
+        Args:
+            usergroups: The usergroups handles
 
-            if usergroup_handle in usergroups:
-                output.update({usergroup_handle: usergroup_id})
+        Returns:
+            The usergroups ids by handle, without the handles not found
+        """
+        usergroups_ids = {
+            usergroup["handle"]: usergroup["id"]
+            for usergroup in self.client.usergroups_list()["usergroups"]
+        }
 
-        return output
+        return {handle: usergroups_ids[handle] for handle in usergroups if handle in usergroups_ids}
@@ -0,0 +1,406 @@
+"""
+Slack resolver module
+"""
+
+import threading
+
+from typing import Optional
+
+from bot.config import Config
+from bot.libs.cache import create_cache
+
+
+class SlackResolver:
+    """
+    Class that resolves and caches the bot identity, the channels
+    where the bot is subscribed and the workspace usergroups
+
+    Attributes:
+        bot_user_id: The bot user id, resolved once
+        channels: Channels ids by name where the bot is subscribed
+        usergroups: Usergroups ids by handle, loaded once and
+                    updated by the subteam events
+        cache: The bot user ids and the channels index, shared by
+               the workers when Config.cache_db is set
+    """
+
+    def __init__(self):
+        self.bot_user_id = None
+        self.channels = None
+        self.usergroups = None
+        self.cache = create_cache("slack-resolver", maxsize=16, ttl=Config.slack_channels_cache_ttl)
+        self._lock = threading.Lock()
+
+    def get_bot_user_id(self, client: object, bot_id: str) -> str:
+        """Get the bot user id
+
+        Args:
+            client: Slack App instance
+            bot_id: The bot id
+
+        Returns:
+            The bot user id
+        """
+        if self.bot_user_id is None:
+            bot_user_id = self.cache.get(f"bot:{bot_id}")
+
+            if bot_user_id is None:
+                bot_user_id = client.bots_info(bot=bot_id).get("bot").get("user_id")
+                self.cache.set(f"bot:{bot_id}", bot_user_id)
+
+            self.bot_user_id = bot_user_id
+
+        return self.bot_user_id
+
+    def load_channels(self, client: object, bot_user_id: str) -> dict:
+        """Load all the channels where the bot is subscribed
+
+        Args:
+            client: Slack App instance
+            bot_user_id: The bot user id
+
+        Returns:
+            The channels ids by name
+        """
+        channels = dict()
+        cursor = None
+
+        while True:
+            response = client.users_conversations(
+                user=bot_user_id,
+                exclude_archived=True,
+                limit=Config.slack_conversations_page_size,
+                cursor=cursor
+            )
+
+            for channel in response.get("channels", []):
+                channels[channel["name"]] = channel["id"]
+
+            cursor = (response.get("response_metadata") or {}).get("next_cursor")
+
+            if not cursor:
+                break
+
+        self.channels = channels
+        self.cache.set("channels", channels)
+        return channels
+
+    def get_channel_id(self, client: object, bot_id: str, channel_name: str) -> Optional[str]:
+        """Get the id of a channel where the bot is subscribed
+
+        The channels are loaded on the first call and reloaded only
+        when the channel is not found, like after a channel rename.
+        The channels loaded by another worker are used when they have it
+
+        Args:
+            client: Slack App instance
+            bot_id: The bot id
+            channel_name: The channel name
+
+        Returns:
+            The channel id or None if the bot is not subscribed on it
+        """
+        channels = self.channels
+
+        if channels is None or channel_name not in channels:
+            with self._lock:
+                if self.channels is channels:
+                    channels = self.get_shared_channels(channel_name)
+
+                    if channels is None:
+                        channels = self.load_channels(client, self.get_bot_user_id(client, bot_id))
+                else:
+                    channels = self.channels
+
+        return channels.get(channel_name)
+
+    def get_shared_channels(self, channel_name: str) -> Optional[dict]:
+        """Get the channels loaded by another worker, when they have a channel
+
+        Args:
+            channel_name: The channel name
+
+        Returns:
+            The channels ids by name, or None when the channel is not on them
+        """
+        channels = self.cache.get("channels")
+
+        if channels is None or channel_name not in channels:
+            return None
+
+        self.channels = channels
+        return channels
+
+    def get_event_bot_user_id(self, body: dict, context: dict) -> Optional[str]:
+        """Get the bot user id on an event, without calling the Slack API
+
+        The workers that use the channels loaded by another worker never
+        resolved it, so it's read from the cache or the event authorizations
+
+        Args:
+            body: Slack event body
+            context: Bolt request context, with the bot id
+
+        Returns:
+            The bot user id, None when it's not known
+        """
+        if self.bot_user_id is None and context.get("bot_id"):
+            self.bot_user_id = self.cache.get(f"bot:{context['bot_id']}")
+
+        if self.bot_user_id is not None:
+            return self.bot_user_id
+
+        return next(
+            (
+                authorization.get("user_id")
+                for authorization in body.get("authorizations") or []
+                if authorization.get("is_bot")
+            ),
+            None
+        )
+
+    def handle_member_joined_channel(self, client: object, body: dict, context: dict, event: dict) -> None:
+        """Add a channel to the cached channels when the bot joins it
+
+        Args:
+            client: Slack App instance
+            body: Slack event body
+            context: Bolt request context
+            event: Slack event info
+        """
+        if self.channels is None or event.get("user") != self.get_event_bot_user_id(body, context):
+            return
+
+        channel_info = client.conversations_info(channel=event["channel"])["channel"]
+
+        with self._lock:
+            self.channels = dict(self.channels, **{channel_info["name"]: channel_info["id"]})
+            self.cache.set("channels", self.channels)
+
+    def handle_channel_left(self, event: dict) -> None:
+        """Remove a channel from the cached channels when the bot leaves it
+
+        Args:
+            event: Slack event info
+        """
+        if self.channels is None:
+            return
+
+        with self._lock:
+            self.channels = {
+                channel_name: channel_id
+                for channel_name, channel_id in self.channels.items()
+                if channel_id != event.get("channel")
+            }
+            self.cache.set("channels", self.channels)
+
+    @staticmethod
+    def build_usergroups_index(usergroups: list) -> dict:
+        """Build the usergroups ids by handle, without the disabled ones
+
+        Args:
+            usergroups: The usergroups_list usergroups
+
+        Returns:
+            The usergroups ids by handle
+        """
+        return {
+            usergroup["handle"]: usergroup["id"]
+            for usergroup in usergroups
+            if not usergroup.get("date_delete")
+        }
+
+    def load_usergroups(self, client: object) -> dict:
+        """Load all the workspace usergroups
+
+        Args:
+            client: Slack App instance
+
+        Returns:
+            The usergroups ids by handle
+        """
+        self.usergroups = self.build_usergroups_index(client.usergroups_list()["usergroups"])
+        return self.usergroups
+
+    def get_usergroup_id(self, client: object, handle: str) -> Optional[str]:
+        """Get the id of a usergroup
+
+        The usergroups are loaded on the first call, after that they
+        are kept up to date by the subteam events, without API calls
+
+        Args:
+            client: Slack App instance
+            handle: The usergroup handle, without the @
+
+        Returns:
+            The usergroup id or None if there's no usergroup with the handle
+        """
+        usergroups = self.usergroups
+
+        if usergroups is None:
+            with self._lock:
+                usergroups = self.usergroups if self.usergroups is not None else self.load_usergroups(client)
+
+        return usergroups.get(handle)
+
+    def handle_subteam_changed(self, event: dict) -> None:
+        """Update the cached usergroups when one is created, renamed or disabled
+
+        Args:
+            event: Slack subteam_created or subteam_updated event info
+        """
+        subteam = event.get("subteam") or {}
+
+        if self.usergroups is None or not subteam.get("id"):
+            return
+
+        with self._lock:
+            usergroups = {
+                handle: usergroup_id
+                for handle, usergroup_id in self.usergroups.items()
+                if usergroup_id != subteam["id"]
+            }
+            usergroups.update(self.build_usergroups_index([subteam]))
+            self.usergroups = usergroups
+
+
+class AsyncSlackResolver(SlackResolver):
+    """
+    SlackResolver for the Slack async clients, used by the asyncio entry point
+    """
+
+    async def get_bot_user_id(self, client: object, bot_id: str) -> str:
+        """Get the bot user id
+
+        Args:
+            client: Slack App async instance
+            bot_id: The bot id
+
+        Returns:
+            The bot user id
+        """
+        if self.bot_user_id is None:
+            bot_user_id = self.cache.get(f"bot:{bot_id}")
+
+            if bot_user_id is None:
+                bot_user_id = (await client.bots_info(bot=bot_id)).get("bot").get("user_id")
+                self.cache.set(f"bot:{bot_id}", bot_user_id)
+
+            self.bot_user_id = bot_user_id
+
+        return self.bot_user_id
+
+    async def load_channels(self, client: object, bot_user_id: str) -> dict:
+        """Load all the channels where the bot is subscribed
+
+        Args:
+            client: Slack App async instance
+            bot_user_id: The bot user id
+
+        Returns:
+            The channels ids by name
+        """
+        channels = dict()
+        cursor = None
+
+        while True:
+            response = await client.users_conversations(
+                user=bot_user_id,
+                exclude_archived=True,
+                limit=Config.slack_conversations_page_size,
+                cursor=cursor
+            )
+
+            for channel in response.get("channels", []):
+                channels[channel["name"]] = channel["id"]
+
+            cursor = (response.get("response_metadata") or {}).get("next_cursor")
+
+            if not cursor:
+                break
+
+        self.channels = channels
+        self.cache.set("channels", channels)
+        return channels
+
+    async def get_channel_id(self, client: object, bot_id: str, channel_name: str) -> Optional[str]:
+        """Get the id of a channel where the bot is subscribed
+
+        Args:
+            client: Slack App async instance
+            bot_id: The bot id
+            channel_name: The channel name
+
+        Returns:
+            The channel id or None if the bot is not subscribed on it
+        """
+        channels = self.channels
+
+        if channels is None or channel_name not in channels:
+            channels = self.get_shared_channels(channel_name)
+
+            if channels is None:
+                channels = await self.load_channels(client, await self.get_bot_user_id(client, bot_id))
+
+        return channels.get(channel_name)
+
+    async def handle_member_joined_channel(self, client: object, body: dict, context: dict, event: dict) -> None:
+        """Add a channel to the cached channels when the bot joins it
+
+        Args:
+            client: Slack App async instance
+            body: Slack event body
+            context: Bolt request context
+            event: Slack event info
+        """
+        if self.channels is None or event.get("user") != self.get_event_bot_user_id(body, context):
+            return
+
+        channel_info = (await client.conversations_info(channel=event["channel"]))["channel"]
+        self.channels = dict(self.channels, **{channel_info["name"]: channel_info["id"]})
+        self.cache.set("channels", self.channels)
+
+    async def handle_channel_left(self, event: dict) -> None:
+        """Remove a channel from the cached channels when the bot leaves it
+
+        Args:
+            event: Slack event info
+        """
+        super().handle_channel_left(event)
+
+    async def load_usergroups(self, client: object) -> dict:
+        """Load all the workspace usergroups
+
+        Args:
+            client: Slack App async instance
+
+        Returns:
+            The usergroups ids by handle
+        """
+        self.usergroups = self.build_usergroups_index((await client.usergroups_list())["usergroups"])
+        return self.usergroups
+
+    async def get_usergroup_id(self, client: object, handle: str) -> Optional[str]:
+        """Get the id of a usergroup
+
+        Args:
+            client: Slack App async instance
+            handle: The usergroup handle, without the @
+
+        Returns:
+            The usergroup id or None if there's no usergroup with the handle
+        """
+        usergroups = self.usergroups
+
+        if usergroups is None:
+            usergroups = await self.load_usergroups(client)
+
+        return usergroups.get(handle)
+
+    async def handle_subteam_changed(self, event: dict) -> None:
+        """Update the cached usergroups when one is created, renamed or disabled
+
+        Args:
+            event: Slack subteam_created or subteam_updated event info
+        """
+        super().handle_subteam_changed(event)
@@ -0,0 +1,111 @@
+"""
+Rate limited Slack Web API client module
+
+The asyncio client is on bot.libs.async_slack_web_client, so the
+threaded entry points don't import aiohttp
+"""
+
+import time
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+
+from bot.config import Config
+from bot.libs.metrics import observe_outbound_call
+from bot.libs.rate_limiter import RateLimited, RateLimiter
+from bot.libs.tracing import SPAN_KIND_CLIENT, span
+
+# Rate limit tier of the Web API methods called by the bot, see https://api.slack.com/docs/rate-limits
+SLACK_METHOD_TIERS = {
+    "auth.test": "tier4",
+    "bots.info": "tier3",
+    "chat.getPermalink": "tier4",
+    "chat.postEphemeral": "tier4",
+    "chat.postMessage": "chat.postMessage",
+    "chat.update": "tier3",
+    "conversations.info": "tier3",
+    "conversations.replies": "tier3",
+    "usergroups.list": "tier2",
+    "users.conversations": "tier3",
+    "users.info": "tier4",
+    "views.open": "tier4"
+}
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the rate limiter shared by the Slack clients"""
+    return RateLimiter.get_instance("slack", Config.slack_rate_limits, default_limit="tier3")
+
+
+def get_rate_limit_key(api_method: str, params: dict) -> str:
+    """Get the rate limiter key of a Web API call
+
+    Args:
+        api_method: The Web API method
+        params: The call params
+
+    Returns:
+        The method tier, with the channel for the methods limited by channel
+    """
+    tier = SLACK_METHOD_TIERS.get(api_method, "tier3")
+
+    if tier == "chat.postMessage":
+        return f"{tier}:{params.get('channel')}"
+
+    return tier
+
+
+def rate_limited_error(error: SlackApiError) -> Exception:
+    """Convert a Web API error to RateLimited when it's a HTTP 429
+
+    Args:
+        error: The Web API error
+
+    Returns:
+        A RateLimited error with the Retry-After seconds, or the error itself
+    """
+    if error.response.status_code != 429:
+        return error
+
+    headers = {header.lower(): value for header, value in (error.response.headers or {}).items()}
+    retry_after = headers.get("retry-after")
+
+    if isinstance(retry_after, list):
+        retry_after = retry_after[0]
+
+    rate_limited = RateLimited(
+        retry_after=float(retry_after) if retry_after else None,
+        message=f"{error.response.api_url} rate limited"
+    )
+    rate_limited.__cause__ = error
+    return rate_limited
+
+
+class RateLimitedWebClient(WebClient):
+    """
+    Slack WebClient that sends the calls through the shared rate
+    limiter, respecting the tier of each method and Retry-After
+
+    Each call is a span of the current trace, including the rate limiter wait and the retries
+    """
+
+    def api_call(self, api_method: str, **kwargs) -> object:
+        params = kwargs.get("json") or kwargs.get("data") or kwargs.get("params") or {}
+
+        with span(f"slack {api_method}", SPAN_KIND_CLIENT, service="slack", method=api_method):
+            return get_rate_limiter().call(
+                get_rate_limit_key(api_method, params), self._send_api_call, api_method, **kwargs
+            )
+
+    def _send_api_call(self, api_method: str, **kwargs) -> object:
+        started_at = time.perf_counter()
+        failed = True
+
+        try:
+            response = super().api_call(api_method, **kwargs)
+            failed = False
+            return response
+        except SlackApiError as error:
+            raise rate_limited_error(error)
+        finally:
+            observe_outbound_call("slack", api_method, started_at, failed)
@@ -0,0 +1,135 @@
+"""
+Steps dependency graph module
+"""
+
+import logging
+import threading
+import time
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable
+
+from bot.config import Config
+from bot.libs import tracing
+
+
+class StepGraph:
+    """
+    Runs a set of steps concurrently, where each step starts as soon
+    as the steps it depends on finish
+
+    Each step function receives a dict with the results of the steps
+    already finished. When a step fails, the steps that depend on it
+    are skipped.
+
+    Args:
+        name: Graph name used on logs
+
+    Attributes:
+        results: Results by step name
+        errors: Exceptions by step name of the failed steps
+        timings: Duration in seconds by step name
+    """
+
+    executor = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, name: str = "steps"):
+        self.name = name
+        self.steps = dict()
+        self.results = dict()
+        self.errors = dict()
+        self.timings = dict()
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        """Get the thread pool shared by all the graphs"""
+        if cls.executor is None:
+            with cls._executor_lock:
+                if cls.executor is None:
+                    cls.executor = tracing.TracingExecutor(
+                        max_workers=Config.step_graph_workers,
+                        thread_name_prefix="step-graph"
+                    )
+
+        return cls.executor
+
+    def add(self, name: str, function: Callable, depends_on: Iterable[str] = ()) -> None:
+        """Add a step to the graph
+
+        Args:
+            name: Step name
+            function: Step function, called with the finished steps results
+            depends_on: Names of the steps that must finish before this one
+        """
+        for dependency in depends_on:
+            if dependency not in self.steps:
+                raise ValueError(f"Step {name} depends on the unknown step {dependency}.")
+
+        self.steps[name] = (function, tuple(depends_on))
+
+    def run(self) -> dict:
+        """Run all the steps
+
+        Returns:
+            The results by step name
+        """
+        executor = self.get_executor()
+        pending = dict(self.steps)
+        running = dict()
+        started_at = time.monotonic()
+
+        while pending or running:
+            for name, (function, depends_on) in list(pending.items()):
+                if any(dependency in self.errors for dependency in depends_on):
+                    self.errors[name] = RuntimeError(f"Step {name} skipped, a dependency failed.")
+                    del pending[name]
+                elif all(dependency in self.results for dependency in depends_on):
+                    running[self._submit(executor, name, function)] = name
+                    del pending[name]
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+
+                if error:
+                    self.errors[name] = error
+                else:
+                    self.results[name] = future.result()
+
+        self.timings["total"] = time.monotonic() - started_at
+
+        if Config.logger.isEnabledFor(logging.INFO):
+            timings = ", ".join(f"{name}={timing * 1000:.1f}ms" for name, timing in self.timings.items())
+            Config.logger.info("%s timings: %s", self.name, timings)
+
+        return self.results
+
+    def _submit(self, executor: ThreadPoolExecutor, name: str, function: Callable) -> Future:
+        try:
+            return executor.submit(self._run_step, name, function)
+        except RuntimeError:
+            # The pool refuses new work once the interpreter is exiting, so the
+            # jobs drained by the work queue at exit run their steps inline
+            future = Future()
+
+            try:
+                future.set_result(self._run_step(name, function))
+            except Exception as error:
+                future.set_exception(error)
+
+            return future
+
+    def _run_step(self, name: str, function: Callable) -> object:
+        started_at = time.monotonic()
+
+        try:
+            with tracing.span(f"{self.name}.{name}"):
+                return function(self.results)
+        finally:
+            self.timings[name] = time.monotonic() - started_at
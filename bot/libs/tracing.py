@@ -0,0 +1,420 @@
+"""
+Tracing module
+
+Each Slack request gets a trace with a root span for its dispatch and
+child spans for the handlers, the steps and every Slack and Azure
+DevOps call, tagged with the Slack event and trigger ids. The current
+span is kept on a context variable, copied to the threads and tasks
+that continue the request, and the trace ends when its last span does.
+
+The finished traces are exported as OTLP/JSON to a file or a collector,
+and the ones slower than Config.tracing_slow_request_threshold are
+logged with their spans breakdown.
+"""
+
+import asyncio
+import contextvars
+import json
+import os
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from bot.config import Config
+from bot.libs.batcher import Batcher
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_CODE_ERROR = 2
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Trace:
+    """
+    The spans of a Slack request, finished when no span is open and
+    no job or task continuing the request is pending
+
+    Args:
+        name: The root span name
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = os.urandom(16).hex()
+        self.spans = list()
+        self._open = 0
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> "Span":
+        return self.spans[0]
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the root span start to the last span end"""
+        return (max(span.end_ns for span in self.spans) - self.root.start_ns) / 1e9
+
+    def retain(self) -> None:
+        with self._lock:
+            self._open += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._open -= 1
+            finished = self._open == 0
+
+        if finished:
+            finish_trace(self)
+
+
+class Span:
+    """
+    A timed operation of a trace, the current span while entered
+
+    Args:
+        trace: The span trace
+        name: The span name
+        parent: The parent span, None for the root span
+        kind: The OTLP span kind
+        attributes: The span attributes
+    """
+
+    __slots__ = ("trace", "name", "span_id", "parent_id", "kind", "attributes", "start_ns", "end_ns", "error", "_token")
+
+    def __init__(self, trace: Trace, name: str, parent: Optional["Span"], kind: int, attributes: dict):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = None
+        self.end_ns = None
+        self.error = None
+        self._token = None
+
+    def __enter__(self) -> "Span":
+        self.trace.retain()
+        self.trace.spans.append(self)
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.end_ns = time.time_ns()
+
+        if exc_type is not None:
+            self.error = exc_type.__name__
+
+        _current_span.reset(self._token)
+        self.trace.release()
+
+
+class NoopSpan:
+    """Span returned when the request isn't traced"""
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+def start_trace(name: str, **attributes) -> object:
+    """Create the root span of a new trace
+
+    Args:
+        name: The root span name
+        attributes: The span attributes
+
+    Returns:
+        The span context manager, a no-op one when the tracing is disabled
+    """
+    if not Config.tracing_enabled:
+        return NOOP_SPAN
+
+    return Span(Trace(name), name, None, SPAN_KIND_SERVER, attributes)
+
+
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes) -> object:
+    """Create a child span of the current span
+
+    Args:
+        name: The span name
+        kind: The OTLP span kind, SPAN_KIND_CLIENT for the outbound calls
+        attributes: The span attributes
+
+    Returns:
+        The span context manager, a no-op one outside of a trace
+    """
+    parent = _current_span.get()
+
+    if parent is None:
+        return NOOP_SPAN
+
+    return Span(parent.trace, name, parent, kind, attributes)
+
+
+def get_current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+class TracedCall:
+    """
+    Function bound to the trace context where it was created, that
+    keeps the trace open until it runs on another thread or is cancelled
+    """
+
+    def __init__(self, function: Callable, trace: Trace):
+        self.function = function
+        self.__name__ = getattr(function, "__name__", "call")
+        self.trace = trace
+        self.context = contextvars.copy_context()
+        trace.retain()
+
+    def __call__(self, *args, **kwargs) -> object:
+        try:
+            return self.context.run(self.function, *args, **kwargs)
+        finally:
+            self.trace.release()
+
+    def cancel(self) -> None:
+        self.trace.release()
+
+
+def bind(function: Callable) -> Callable:
+    """Bind a function to the current trace, before handing it to another thread
+
+    Args:
+        function: The function
+
+    Returns:
+        A TracedCall, or the function itself outside of a trace
+    """
+    current_span = _current_span.get()
+
+    if current_span is None:
+        return function
+
+    return TracedCall(function, current_span.trace)
+
+
+class TracingExecutor(ThreadPoolExecutor):
+    """Thread pool that runs the submitted functions on the trace context of the submitter"""
+
+    def submit(self, function: Callable, *args, **kwargs):
+        return super().submit(bind(function), *args, **kwargs)
+
+
+def task_factory(loop: asyncio.AbstractEventLoop, coro, context: contextvars.Context = None) -> asyncio.Task:
+    """Event loop task factory that keeps the trace open until the tasks created on it finish
+
+    The tasks already copy the context, so the current span is kept
+    """
+    task = asyncio.Task(coro, loop=loop, context=context) if context is not None else asyncio.Task(coro, loop=loop)
+    current_span = (context or contextvars.copy_context()).get(_current_span)
+
+    if current_span is not None:
+        current_span.trace.retain()
+        task.add_done_callback(lambda _: current_span.trace.release())
+
+    return task
+
+
+def slack_request_type(body: dict) -> str:
+    """Get the label of a Slack request, the event type or the payload type"""
+    if body.get("type") == "event_callback":
+        return body.get("event", {}).get("type", "event_callback")
+
+    return body.get("type", "unknown")
+
+
+def slack_request_attributes(body: dict) -> dict:
+    """Get the Slack ids that tie a trace to its request"""
+    event = body.get("event") or {}
+    view = body.get("view") or {}
+    attributes = {
+        "slack.request_type": slack_request_type(body),
+        "slack.team_id": body.get("team_id") or (body.get("team") or {}).get("id"),
+        "slack.event_id": body.get("event_id"),
+        "slack.trigger_id": body.get("trigger_id"),
+        "slack.callback_id": body.get("callback_id") or view.get("callback_id"),
+        "slack.view_id": view.get("id"),
+        "slack.channel": event.get("channel")
+    }
+
+    return {key: value for key, value in attributes.items() if value}
+
+
+def trace_slack_request(body: dict) -> object:
+    """Start the trace of a Slack request, named by its type
+
+    Bolt runs the listeners after the middlewares return, so the
+    apps start it around their dispatch instead of on a middleware
+
+    Args:
+        body: The Slack request body
+
+    Returns:
+        The root span context manager
+    """
+    attributes = slack_request_attributes(body)
+    return start_trace(attributes["slack.request_type"], **attributes)
+
+
+def format_breakdown(trace: Trace) -> str:
+    """Format the trace spans as a tree, with their start offset from the root span and their duration"""
+    depths = {None: -1}
+    lines = list()
+
+    for trace_span in sorted(trace.spans, key=lambda trace_span: trace_span.start_ns):
+        depth = depths[trace_span.parent_id if trace_span.parent_id in depths else None] + 1
+        depths[trace_span.span_id] = depth
+        attributes = " ".join(f"{key}={value}" for key, value in trace_span.attributes.items())
+        lines.append(
+            f"  {(trace_span.start_ns - trace.root.start_ns) / 1e6:9.1f}ms "
+            f"{(trace_span.end_ns - trace_span.start_ns) / 1e6:9.1f}ms "
+            f"{'  ' * depth}{trace_span.name}"
+            f"{' ' + attributes if attributes else ''}"
+            f"{' error=' + trace_span.error if trace_span.error else ''}"
+        )
+
+    return "\n".join(lines)
+
+
+def finish_trace(trace: Trace) -> None:
+    """Export a finished trace and log it when it's slow"""
+    duration = trace.duration
+
+    if Config.tracing_slow_request_threshold and duration >= Config.tracing_slow_request_threshold:
+        Config.logger.warning(
+            "Slow request %s took %.0fms, trace %s:\n%s", trace.name, duration * 1000, trace.trace_id,
+            format_breakdown(trace)
+        )
+
+    exporter = get_exporter()
+
+    if exporter is not None:
+        exporter.submit(trace)
+
+
+def otlp_value(value: object) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+
+    return {"stringValue": str(value)}
+
+
+def otlp_span(trace_span: Span) -> dict:
+    otlp = {
+        "traceId": trace_span.trace.trace_id,
+        "spanId": trace_span.span_id,
+        "name": trace_span.name,
+        "kind": trace_span.kind,
+        "startTimeUnixNano": str(trace_span.start_ns),
+        "endTimeUnixNano": str(trace_span.end_ns),
+        "attributes": [{"key": key, "value": otlp_value(value)} for key, value in trace_span.attributes.items()]
+    }
+
+    if trace_span.parent_id:
+        otlp["parentSpanId"] = trace_span.parent_id
+
+    if trace_span.error:
+        otlp["status"] = {"code": STATUS_CODE_ERROR, "message": trace_span.error}
+
+    return otlp
+
+
+def otlp_traces(traces: List[Trace]) -> dict:
+    """Encode the traces as an OTLP/JSON ExportTraceServiceRequest
+
+    Args:
+        traces: The finished traces
+
+    Returns:
+        The request body
+    """
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": Config.tracing_service_name}}]},
+        "scopeSpans": [{
+            "scope": {"name": __name__},
+            "spans": [otlp_span(trace_span) for trace in traces for trace_span in trace.spans]
+        }]
+    }]}
+
+
+class OTLPExporter:
+    """
+    Exports the finished traces on a background thread, in batches, as
+    OTLP/JSON lines appended to a file or posted to the /v1/traces
+    endpoint of an OTLP/HTTP collector
+
+    Args:
+        file: JSON lines file path
+        endpoint: Collector base url
+        window: Seconds that the traces are collected before each export
+    """
+
+    def __init__(self, file: Optional[str] = None, endpoint: Optional[str] = None, window: float = 1):
+        self.file = file
+        self.endpoint = endpoint
+        self.exported = 0
+        self.batcher = Batcher(self.export, window=window, max_size=500, name="trace-exporter")
+
+    def submit(self, trace: Trace) -> None:
+        self.batcher.submit(trace)
+
+    def export(self, traces: List[Trace]) -> list:
+        """Batcher send function, that writes the traces"""
+        body = json.dumps(otlp_traces(traces))
+
+        if self.file:
+            with open(self.file, "a", encoding="utf-8") as traces_file:
+                traces_file.write(body + "\n")
+
+        if self.endpoint:
+            import urllib.request
+
+            request = urllib.request.Request(
+                self.endpoint.rstrip("/") + "/v1/traces", data=body.encode(),
+                headers={"Content-Type": "application/json"}, method="POST"
+            )
+            urllib.request.urlopen(request, timeout=10).close()  # nosec
+
+        self.exported += len(traces)
+        return [None] * len(traces)
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter() -> Optional[OTLPExporter]:
+    """Get the exporter set on Config, created on the first finished trace
+
+    Returns:
+        The exporter, None when no file or endpoint is set
+    """
+    global _exporter
+
+    if not (Config.tracing_otlp_file or Config.tracing_otlp_endpoint):
+        return None
+
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = OTLPExporter(Config.tracing_otlp_file, Config.tracing_otlp_endpoint)
+
+    return _exporter
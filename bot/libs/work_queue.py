@@ -0,0 +1,154 @@
+"""
+Background work queue module
+"""
+
+import queue
+import threading
+import time
+
+from typing import Callable
+
+from bot.config import Config
+from bot.libs import tracing
+
+
+class WorkQueue:
+    """
+    Bounded in-process queue served by a pool of worker threads,
+    used to process the Slack requests after they are acknowledged
+
+    Args:
+        workers: Number of worker threads
+        maxsize: Maximum number of jobs waiting on the queue
+        name: Name used on the worker threads and logs
+    """
+
+    def __init__(self, workers: int = 4, maxsize: int = 100, name: str = "work-queue"):
+        self.name = name
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self._accepting = True
+        self._lock = threading.Lock()
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"{name}-{index}", daemon=True)
+            for index in range(workers)
+        ]
+
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting on the queue"""
+        return self.queue.qsize()
+
+    def submit(self, function: Callable, *args, **kwargs) -> bool:
+        """Enqueue a job to run on a worker thread
+
+        Args:
+            function: The job function
+            args: Positional arguments passed to the function
+            kwargs: Keyword arguments passed to the function
+
+        Returns:
+            True if the job was enqueued, False if it was rejected
+            because the queue is full or shutting down
+        """
+        job = tracing.bind(function)
+
+        with self._lock:
+            if self._accepting:
+                try:
+                    self.queue.put_nowait((time.monotonic(), job, args, kwargs))
+                    self.submitted += 1
+                    return True
+                except queue.Full:
+                    pass
+
+            self.rejected += 1
+
+        if job is not function:
+            job.cancel()
+
+        Config.logger.warning("%s: job %s rejected, queue depth %d", self.name, function.__name__, self.queue_depth)
+        return False
+
+    def stats(self) -> dict:
+        """Get the queue counters
+
+        Returns:
+            A dict with the queue depth, jobs counters and wait times in seconds
+        """
+        with self._lock:
+            processed = self.completed + self.failed
+
+            return dict(
+                queue_depth=self.queue_depth,
+                workers=len(self._workers),
+                submitted=self.submitted,
+                rejected=self.rejected,
+                completed=self.completed,
+                failed=self.failed,
+                wait_time_avg=self.wait_time_total / processed if processed else 0.0,
+                wait_time_max=self.wait_time_max
+            )
+
+    def shutdown(self, timeout: float = None) -> None:
+        """Stop accepting jobs and wait the queued and in-flight jobs to finish
+
+        Args:
+            timeout: Maximum seconds to wait the workers
+        """
+        with self._lock:
+            if not self._accepting:
+                return
+
+            self._accepting = False
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        for _ in self._workers:
+            try:
+                self.queue.put((None, None, None, None), timeout=self._remaining(deadline))
+            except queue.Full:
+                Config.logger.warning("%s: shutdown timed out with %d jobs queued", self.name, self.queue_depth)
+                break
+
+        for worker in self._workers:
+            worker.join(self._remaining(deadline))
+
+        Config.logger.info("%s: shutdown with stats %s", self.name, self.stats())
+
+    @staticmethod
+    def _remaining(deadline: float = None) -> float:
+        return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+    def _worker(self) -> None:
+        while True:
+            enqueued_at, function, args, kwargs = self.queue.get()
+
+            if function is None:
+                return
+
+            wait_time = time.monotonic() - enqueued_at
+
+            try:
+                function(*args, **kwargs)
+                failed = False
+            except Exception:
+                failed = True
+                Config.logger.error("%s: job %s failed", self.name, function.__name__, exc_info=True)
+
+            with self._lock:
+                self.wait_time_total += wait_time
+                self.wait_time_max = max(self.wait_time_max, wait_time)
+
+                if failed:
+                    self.failed += 1
+                else:
+                    self.completed += 1
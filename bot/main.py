@@ -1,30 +1,93 @@
 """
 Slack Chat Bot
 """
-from flask import Flask, request
+import atexit
+import threading
+import time
+
+from flask import Flask, Response, g, request
 from slack_bolt.adapter.flask import SlackRequestHandler
 
+from bot.config import Config
+from bot.libs import metrics
+from bot.libs.deduplication import Deduplicator
+from bot.libs.az_devops_client import AzDevOpsClient, get_rate_limiter as get_az_devops_rate_limiter
 from bot.libs.slack_app import SlackApp
+from bot.libs.shortcuts_config import ShortcutsWatcher
+from bot.libs.slack_web_client import get_rate_limiter as get_slack_rate_limiter
+from bot.libs.step_graph import StepGraph
+from bot.libs.work_queue import WorkQueue
 from bot.handlers.slack.handle_messages import HandleMessages
 from bot.handlers.slack.handle_shortcut_support import HandleShortcutSupport
 
 app = Flask(__name__)
 slack_app = SlackApp()
+slack_request_handler = SlackRequestHandler(slack_app)
+work_queue = WorkQueue(
+    workers=Config.work_queue_workers,
+    maxsize=Config.work_queue_size
+)
+
+# Gunicorn exits the worker on SIGTERM after the running requests,
+# then the queued and in-flight jobs are drained before the process ends
+atexit.register(work_queue.shutdown, timeout=Config.work_queue_shutdown_timeout)
+
+# Queues, pools and rate limiters state, read when /metrics is scraped
+slack_app.use(metrics.bolt_dispatch_middleware)
+metrics.state_collector.work_queues.append(work_queue)
+metrics.state_collector.executors["step-graph"] = lambda: StepGraph.executor
+metrics.state_collector.rate_limiters.extend([get_slack_rate_limiter, get_az_devops_rate_limiter])
+
+# Slack retries and modals submitted twice are acknowledged without
+# running the listeners, so they don't repeat the calls and the tickets
+slack_app.use(Deduplicator.from_config().middleware)
 
+# Shortcuts loaded from SLACK_SHORTCUTS_PATH replace the defaults, and
+# their changes are swapped in while the bot runs
+shortcuts_watcher = ShortcutsWatcher.from_config()
+
+# Fails on startup when a shortcut template is missing or invalid
+Config.validate_templates()
 
 # Slack Handles
-@slack_app.middleware
-def manage_request(body, next):
+# Listeners are registered only once, when the module is imported
+HandleMessages(slack_app)
+HandleShortcutSupport(slack_app, work_queue)
+
+
+def warmup() -> None:
     """
-    Method to intercepts Slack events before goes to handles
+    Creates the Azure DevOps client and loads the team settings used by
+    the shortcuts without a fixed iteration, so the tickets don't wait on them
     """
-    HandleMessages(slack_app)
+    AzDevOpsClient.get_instance().prewarm_team_settings([
+        shortcut_config["az_devops_project"]
+        for shortcut_config in Config.slack_shortcuts.values()
+        if not shortcut_config.get("az_devops_work_item_iteration")
+    ])
+
 
-    if body.get("type") == "shortcut":
-        HandleShortcutSupport.callback_id = body["callback_id"]
-        HandleShortcutSupport(slack_app)
+# The container scales to zero, so the Azure DevOps SDK is imported on a
+# background thread and the first request isn't delayed by it
+if Config.startup_warmup:
+    threading.Thread(target=warmup, name="startup-warmup", daemon=True).start()
 
-    return next()
+# The team settings of the shortcuts added while running are loaded too
+if shortcuts_watcher:
+    shortcuts_watcher.start(on_change=warmup)
+
+
+@app.before_request
+def start_request_timer():
+    g.started_at = time.perf_counter()
+
+
+@app.after_request
+def observe_request(response: Response) -> Response:
+    if request.url_rule is not None:
+        metrics.observe_http_request(request.url_rule.rule, response.status_code, g.started_at)
+
+    return response
 
 
 @app.route("/slack/events", methods=["POST"])
@@ -32,7 +95,7 @@ def slack_events():
     """
     Method that handles Slack events and send to Flask
     """
-    return SlackRequestHandler(slack_app).handle(request)
+    return slack_request_handler.handle(request)
 
 
 @app.route("/health", methods=["GET", "POST"])
@@ -40,5 +103,11 @@ def healthcheck():
     return "Bot is running!!!\n", 200
 
 
+@app.route("/metrics", methods=["GET"])
+def metrics_export():
+    content, content_type = metrics.export()
+    return Response(content, content_type=content_type)
+
+
 if __name__ == "__main__":
     app.run(port=slack_app.port)
@@ -0,0 +1,113 @@
+"""
+Slack Chat Bot asyncio entry point
+
+Runs the bot on slack_bolt AsyncApp with an ASGI server:
+
+    uvicorn bot.main_async:app
+"""
+import asyncio
+import contextlib
+import time
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+from slack_bolt.adapter.starlette.async_handler import AsyncSlackRequestHandler
+
+from bot.config import Config
+from bot.libs import metrics, tracing
+from bot.libs.async_az_devops_client import AsyncAzDevOpsClient
+from bot.libs.async_slack_app import AsyncSlackApp
+from bot.libs.deduplication import Deduplicator
+from bot.libs.az_devops_client import get_rate_limiter as get_az_devops_rate_limiter
+from bot.libs.shortcuts_config import ShortcutsWatcher
+from bot.libs.slack_web_client import get_rate_limiter as get_slack_rate_limiter
+from bot.handlers.slack_async.handle_messages import AsyncHandleMessages
+from bot.handlers.slack_async.handle_shortcut_support import AsyncHandleShortcutSupport
+
+slack_app = AsyncSlackApp()
+slack_request_handler = AsyncSlackRequestHandler(slack_app)
+
+# Rate limiters state, read when /metrics is scraped
+slack_app.use(metrics.async_bolt_dispatch_middleware)
+metrics.state_collector.rate_limiters.extend([get_slack_rate_limiter, get_az_devops_rate_limiter])
+
+# Slack retries and modals submitted twice are acknowledged without
+# running the listeners, so they don't repeat the calls and the tickets
+slack_app.use(Deduplicator.from_config().async_middleware)
+
+# Shortcuts loaded from SLACK_SHORTCUTS_PATH replace the defaults, and
+# their changes are swapped in while the bot runs
+shortcuts_watcher = ShortcutsWatcher.from_config()
+
+# Fails on startup when a shortcut template is missing or invalid
+Config.validate_templates()
+
+# Slack Handles
+# Listeners are registered only once, when the module is imported
+AsyncHandleMessages(slack_app)
+AsyncHandleShortcutSupport(slack_app)
+
+if shortcuts_watcher:
+    shortcuts_watcher.start()
+
+
+async def slack_events(request: Request):
+    """
+    Method that handles Slack events and send to the ASGI server
+    """
+    started_at = time.perf_counter()
+    response = await slack_request_handler.handle(request)
+    metrics.observe_http_request("/slack/events", response.status_code, started_at)
+    return response
+
+
+async def healthcheck(request: Request):
+    return PlainTextResponse("Bot is running!!!\n")
+
+
+async def metrics_export(request: Request):
+    content, content_type = metrics.export()
+    return Response(content, media_type=content_type)
+
+
+async def warmup(az_devops_client: AsyncAzDevOpsClient) -> None:
+    """
+    Loads the team settings used by the shortcuts without a fixed
+    iteration, so the tickets don't wait on them
+    """
+    await az_devops_client.prewarm_team_settings([
+        shortcut_config["az_devops_project"]
+        for shortcut_config in Config.slack_shortcuts.values()
+        if not shortcut_config.get("az_devops_work_item_iteration")
+    ])
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: Starlette):
+    """
+    Runs the warmup on a task after the startup, so the server doesn't
+    wait on Azure DevOps before serving (STARTUP_WARMUP=false skips it)
+
+    The listeners run on tasks, that keep their request trace open until they finish
+    """
+    asyncio.get_running_loop().set_task_factory(tracing.task_factory)
+    az_devops_client = AsyncAzDevOpsClient.get_instance()
+    warmup_task = asyncio.create_task(warmup(az_devops_client)) if Config.startup_warmup else None
+    yield
+
+    if warmup_task is not None:
+        warmup_task.cancel()
+
+    await az_devops_client.close()
+
+
+app = Starlette(
+    routes=[
+        Route("/slack/events", slack_events, methods=["POST"]),
+        Route("/health", healthcheck, methods=["GET", "POST"]),
+        Route("/metrics", metrics_export, methods=["GET"])
+    ],
+    lifespan=lifespan
+)
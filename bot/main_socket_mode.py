@@ -0,0 +1,37 @@
+"""
+Slack Chat Bot Socket Mode entry point
+
+Receives the Slack requests on a WebSocket opened by the bot, acking
+them on the socket, instead of an HTTPS request per event:
+
+    python -m bot.main_socket_mode
+
+The health and metrics routes are still served on Config.port
+"""
+import signal
+import sys
+import threading
+
+from werkzeug.serving import make_server
+
+from bot.config import Config
+from bot.main import app, slack_app
+
+
+def main() -> None:
+    socket_mode_handler = slack_app.socket_mode_handler()
+    http_server = make_server("0.0.0.0", int(Config.port), app, threaded=True)  # nosec
+    threading.Thread(target=http_server.serve_forever, name="http-server", daemon=True).start()
+
+    # Exits on SIGTERM like on Ctrl+C, so the work queue is drained on exit
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        socket_mode_handler.start()
+    finally:
+        socket_mode_handler.close()
+        http_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
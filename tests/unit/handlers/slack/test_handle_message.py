@@ -1,6 +1,7 @@
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+from bot.config import Config
 from bot.handlers.slack.handle_messages import HandleMessages
 
 
@@ -35,3 +36,78 @@ class TestHandleMessages(TestCase):
                 self.slack_app, slack_message, print
             )
         )
+
+    def test_handle_message_filtered_before_api_calls(self):
+        slack_message = dict(
+            channel="Test",
+            subtype="channel_join",
+            text="Test"
+        )
+
+        self.slack_message_handle.handle_message(self.slack_app, slack_message, print)
+
+        self.slack_app.conversations_info.assert_not_called()
+
+    def test_handle_message_channel_info_cached(self):
+        slack_message = dict(
+            channel="Test",
+            subtype="user_message",
+            text="Test"
+        )
+
+        for _ in range(3):
+            self.slack_message_handle.handle_message(self.slack_app, slack_message, print)
+            self.slack_message_handle.channel_reply_cooldowns.clear()
+
+        self.slack_app.conversations_info.assert_called_once_with(channel="Test")
+
+    def test_handle_channel_changed(self):
+        slack_message = dict(
+            channel="Test",
+            subtype="user_message",
+            text="Test"
+        )
+
+        self.slack_message_handle.handle_message(self.slack_app, slack_message, print)
+        self.slack_message_handle.handle_channel_changed(
+            dict(type="channel_rename", channel=dict(id="Test", name="test-renamed"))
+        )
+        self.slack_message_handle.channel_reply_cooldowns.clear()
+        self.slack_message_handle.handle_message(self.slack_app, slack_message, print)
+
+        self.assertEqual(self.slack_app.conversations_info.call_count, 2)
+
+    def test_handle_message_channel_cooldown(self):
+        say = MagicMock()
+
+        for user in ["U1", "U2", "U1"]:
+            self.slack_message_handle.handle_message(
+                self.slack_app, dict(channel="Test", user=user, text="Test"), say
+            )
+
+        say.assert_called_once()
+        self.assertEqual(self.slack_app.chat_postEphemeral.call_count, 1)
+        self.assertEqual(self.slack_app.chat_postEphemeral.call_args.kwargs["user"], "U2")
+        self.slack_app.conversations_info.assert_called_once_with(channel="Test")
+
+    @patch.object(Config, "slack_reply_user_cooldown", 0)
+    def test_handle_message_without_user_cooldown(self):
+        self.slack_message_handle = HandleMessages(self.slack_app)
+
+        for user in ["U1", "U2"]:
+            self.slack_message_handle.handle_message(
+                self.slack_app, dict(channel="Test", user=user, text="Test"), print
+            )
+
+        self.slack_app.chat_postEphemeral.assert_not_called()
+
+    @patch("bot.libs.cache.time.monotonic")
+    def test_handle_message_channel_cooldown_expired(self, mock_monotonic):
+        say = MagicMock()
+        mock_monotonic.return_value = 100
+        self.slack_message_handle.handle_message(self.slack_app, dict(channel="Test", text="Test"), say)
+
+        mock_monotonic.return_value = 100 + Config.slack_reply_channel_cooldown
+        self.slack_message_handle.handle_message(self.slack_app, dict(channel="Test", text="Test"), say)
+
+        self.assertEqual(say.call_count, 2)
@@ -0,0 +1,71 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from bot.config import Config
+from bot.handlers.slack.handle_reactions import HandleReactions
+
+
+def reaction_event(reaction: str, ts: str = "1.2") -> dict:
+    return dict(reaction=reaction, user="U1", item=dict(type="message", channel="C1", ts=ts))
+
+
+class TestHandleReactions(TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.conversations_replies.return_value = dict(messages=[dict(ts="1.2", thread_ts="1.1")])
+        self.logger = MagicMock()
+        self.reactions_handle = HandleReactions(MagicMock())
+
+    def test_handle_reaction_without_rule(self):
+        self.reactions_handle.handle_reactions_added(self.client, {}, reaction_event("tada"), self.logger)
+
+        self.client.conversations_replies.assert_not_called()
+        self.client.chat_postMessage.assert_not_called()
+
+    def test_handle_reaction_thread_reply(self):
+        self.reactions_handle.handle_reactions_added(self.client, {}, reaction_event("eyes"), self.logger)
+
+        self.client.chat_postMessage.assert_called_once_with(
+            text=":eyes: <@U1> está de olho na sua solicitação!",
+            channel="C1",
+            thread_ts="1.1"
+        )
+
+    def test_handle_reaction_thread_parent_cached(self):
+        for _ in range(3):
+            self.reactions_handle.handle_reactions_added(self.client, {}, reaction_event("eyes"), self.logger)
+
+        self.client.conversations_replies.assert_called_once_with(channel="C1", ts="1.2", limit=1)
+        self.assertEqual(self.client.chat_postMessage.call_count, 3)
+
+    def test_handle_reaction_message_without_thread(self):
+        self.client.conversations_replies.return_value = dict(messages=[dict(ts="1.2")])
+
+        for _ in range(2):
+            self.reactions_handle.handle_reactions_added(self.client, {}, reaction_event("eyes"), self.logger)
+
+        self.assertEqual(self.client.conversations_replies.call_count, 2)
+        self.client.chat_postMessage.assert_not_called()
+        self.logger.error.assert_not_called()
+
+        # The message starts a thread with its first reply
+        self.client.conversations_replies.return_value = dict(messages=[dict(ts="1.2", thread_ts="1.2")])
+        self.reactions_handle.handle_reactions_added(self.client, {}, reaction_event("eyes"), self.logger)
+
+        self.client.chat_postMessage.assert_called_once_with(
+            text=":eyes: <@U1> está de olho na sua solicitação!",
+            channel="C1",
+            thread_ts="1.2"
+        )
+
+    def test_handle_reaction_error_logged(self):
+        self.client.conversations_replies.side_effect = RuntimeError("channel_not_found")
+
+        self.reactions_handle.handle_reactions_added(self.client, {}, reaction_event("eyes"), self.logger)
+
+        self.logger.error.assert_called_once()
+
+    @patch.object(Config, "slack_reaction_rules", {"eyes": {"action": "delete", "text": ""}})
+    def test_reaction_rule_unknown_action(self):
+        with self.assertRaises(ValueError):
+            HandleReactions(MagicMock())
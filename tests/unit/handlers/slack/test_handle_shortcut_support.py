@@ -1,7 +1,7 @@
 import json
 
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from bot.config import Config
 from bot.handlers.slack.handle_shortcut_support import HandleShortcutSupport
@@ -10,7 +10,6 @@ from bot.handlers.slack.handle_shortcut_support import HandleShortcutSupport
 class TestHandleShortcutSupport(TestCase):
     @patch("bot.libs.slack_app.SlackApp")
     def setUp(self, mock_slack_app):
-        HandleShortcutSupport.callback_id = "test"
         Config.slack_shortcuts = {
             "test": {
                 "az_devops_board": "test",
@@ -24,7 +23,8 @@ class TestHandleShortcutSupport(TestCase):
                     "Production": "5 dias"
                 },
                 "slack_channel": "test",
-                "slack_template": "slack/tis-administration_shortcut_support.json"
+                "slack_support_team": "test-team",
+                "slack_template": "slack/devops_shortcut_support.json"
             }
         }
         Config.az_devops_organization_url = "https://dummy.azure.com"
@@ -35,12 +35,17 @@ class TestHandleShortcutSupport(TestCase):
             "views_open.return_value": dict(user=dict(name="TestViewsOpen")),
             "users_conversations.return_value": dict(
                 channels=[dict(id=1, name="test")]
+            ),
+            "usergroups_list.return_value": dict(
+                usergroups=[dict(id="S1", handle="test-team")]
             )
         }
         mock_slack_app.configure_mock(**mock_slack_app_attrs)
 
         self.slack_app = mock_slack_app
         self.slack_message_body = json.load(open("tests/unit/slack_message_body.json"))
+        self.slack_message_body["callback_id"] = "test"
+        self.slack_message_body["view"]["callback_id"] = "test"
         self.slack_handle_support = HandleShortcutSupport(self.slack_app)
 
     def test_handle_shortcut(self):
@@ -50,7 +55,10 @@ class TestHandleShortcutSupport(TestCase):
 
         self.slack_app.views_open.assert_called_once_with(
             trigger_id=self.slack_message_body["trigger_id"],
-            view=Config.load_template(Config.slack_shortcuts["test"]["slack_template"])
+            view=dict(
+                Config.load_template(Config.slack_shortcuts["test"]["slack_template"]),
+                callback_id="test"
+            )
         )
 
     # @patch("bot.libs.az_devops_client.AzDevOpsClient")
@@ -69,3 +77,111 @@ class TestHandleShortcutSupport(TestCase):
         self.slack_handle_support.handle_shortcut_submission(
             print, self.slack_message_body, self.slack_app, self.event, Config.logger
         )
+
+    @patch("bot.libs.az_devops_client.AzDevOpsClient.connect")
+    @patch("bot.libs.az_devops_client.AzDevOpsClient.get_team_settings")
+    def test_handle_shortcut_submission_thread_replies_order(
+        self, mock_az_devops_team_settings, mock_az_devops_client_connect
+    ):
+        mock_az_devops_team_settings.return_value = {
+            "defaultIteration": {
+                "path": "\\Test"
+            }
+        }
+
+        self.slack_handle_support.handle_shortcut_submission(
+            print, self.slack_message_body, self.slack_app, dict(), Config.logger
+        )
+
+        messages = self.slack_app.chat_postMessage.call_args_list
+
+        self.assertEqual(len(messages), 4)
+        self.assertIn("Solicitante", messages[0].kwargs["text"])
+        self.assertIn("SLA", messages[1].kwargs["text"])
+        self.assertIn("<!subteam^S1>", messages[2].kwargs["text"])
+        self.assertIn("card de suporte", messages[3].kwargs["text"])
+        self.slack_app.usergroups_list.assert_called_once_with()
+
+    def test_handle_shortcut_submission_queue_full(self):
+        self.slack_handle_support.work_queue = MagicMock()
+        self.slack_handle_support.work_queue.submit.return_value = False
+        mock_ack = MagicMock()
+        release_delivery = MagicMock()
+
+        self.slack_handle_support.handle_shortcut_submission(
+            mock_ack, self.slack_message_body, self.slack_app, dict(), Config.logger,
+            dict(release_delivery=release_delivery)
+        )
+
+        mock_ack.assert_called_once()
+        self.assertEqual(mock_ack.call_args.kwargs["response_action"], "errors")
+        release_delivery.assert_called_once_with()
+
+    @patch.object(Config, "slack_merged_thread_reply", True)
+    @patch("bot.libs.az_devops_client.AzDevOpsClient.connect")
+    @patch("bot.libs.az_devops_client.AzDevOpsClient.get_team_settings")
+    def test_handle_shortcut_submission_merged_thread_reply(
+        self, mock_az_devops_team_settings, mock_az_devops_client_connect
+    ):
+        mock_az_devops_team_settings.return_value = {"defaultIteration": {"path": "\\Test"}}
+        self.slack_app.chat_postMessage.side_effect = [dict(ts="1.0"), dict(ts="1.1")]
+
+        self.slack_handle_support.handle_shortcut_submission(
+            print, self.slack_message_body, self.slack_app, dict(), Config.logger
+        )
+
+        messages = self.slack_app.chat_postMessage.call_args_list
+
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[1].kwargs["thread_ts"], "1.0")
+        self.assertIn("SLA", messages[1].kwargs["text"])
+        self.assertIn("<!subteam^S1>", messages[1].kwargs["text"])
+        self.assertIn("Criando o card", json.dumps(messages[1].kwargs["blocks"]))
+
+        self.slack_app.chat_update.assert_called_once()
+        update = self.slack_app.chat_update.call_args.kwargs
+        self.assertEqual(update["ts"], "1.1")
+        self.assertNotIn("thread_ts", update)
+        self.assertIn("card de suporte", update["text"])
+        self.assertNotIn("Criando o card", json.dumps(update["blocks"]))
+
+    @patch.object(Config, "slack_merged_thread_reply", True)
+    @patch("bot.libs.az_devops_client.AzDevOpsClient.connect")
+    @patch("bot.libs.az_devops_client.AzDevOpsClient.get_team_settings")
+    def test_handle_shortcut_submission_merged_thread_reply_without_card(
+        self, mock_az_devops_team_settings, mock_az_devops_client_connect
+    ):
+        mock_az_devops_team_settings.return_value = None
+        self.slack_app.chat_postMessage.side_effect = [dict(ts="2.0"), dict(ts="2.1")]
+
+        with patch("bot.libs.az_devops_client.AzDevOpsClient._instance", None):
+            self.slack_handle_support.handle_shortcut_submission(
+                print, self.slack_message_body, self.slack_app, dict(), Config.logger
+            )
+
+        update = self.slack_app.chat_update.call_args.kwargs
+        self.assertEqual(update["ts"], "2.1")
+        self.assertIn("SLA", update["text"])
+        self.assertNotIn("card", json.dumps(update["blocks"]))
+
+    @patch.object(Config, "slack_merged_thread_reply", True)
+    @patch("bot.libs.az_devops_client.AzDevOpsClient.connect")
+    @patch("bot.libs.az_devops_client.AzDevOpsClient.get_team_settings")
+    @patch("bot.libs.az_devops_client.AzDevOpsClient.add_item_to_project_board")
+    def test_handle_shortcut_submission_merged_thread_reply_card_not_created(
+        self, mock_add_item_to_project_board, mock_az_devops_team_settings, mock_az_devops_client_connect
+    ):
+        mock_add_item_to_project_board.return_value = None
+        mock_az_devops_team_settings.return_value = {"defaultIteration": {"path": "\\Test"}}
+        self.slack_app.chat_postMessage.side_effect = [dict(ts="3.0"), dict(ts="3.1")]
+
+        with patch("bot.libs.az_devops_client.AzDevOpsClient._instance", None):
+            self.slack_handle_support.handle_shortcut_submission(
+                print, self.slack_message_body, self.slack_app, dict(), Config.logger
+            )
+
+        mock_add_item_to_project_board.assert_called_once()
+        self.slack_app.chat_update.assert_called_once()
+        update = self.slack_app.chat_update.call_args.kwargs
+        self.assertEqual(update["ts"], "3.1")
+        self.assertNotIn("Criando o card", json.dumps(update["blocks"]))
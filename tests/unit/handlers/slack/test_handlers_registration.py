@@ -0,0 +1,92 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from slack_bolt import App, BoltRequest
+from slack_bolt.authorization import AuthorizeResult
+
+from bot.config import Config
+from bot.handlers.slack.handle_messages import HandleMessages
+from bot.handlers.slack.handle_shortcut_support import HandleShortcutSupport
+
+
+def authorize(**kwargs):
+    return AuthorizeResult(
+        enterprise_id=None,
+        team_id="T0001",
+        bot_token="xoxb-test",
+        bot_id="B0001",
+        bot_user_id="U0001"
+    )
+
+
+class TestHandlersRegistration(TestCase):
+    def setUp(self):
+        Config.slack_shortcuts = {
+            "test": {
+                "slack_channel": "test",
+                "slack_template": "slack/devops_shortcut_support.json"
+            }
+        }
+
+        self.slack_app = App(
+            authorize=authorize,
+            process_before_response=True,
+            request_verification_enabled=False
+        )
+
+        HandleMessages(self.slack_app)
+        HandleShortcutSupport(self.slack_app)
+
+    @patch("slack_sdk.WebClient.api_call")
+    def test_listeners_count_after_many_events(self, mock_api_call):
+        mock_api_call.return_value = dict(ok=True, channel=dict(name="test"))
+        listeners_count = len(self.slack_app._listeners)
+        message_body = {
+            "type": "event_callback",
+            "team_id": "T0001",
+            "event": {
+                "type": "message",
+                "channel": "C0001",
+                "user": "U0002",
+                "subtype": "channel_join",
+                "text": "Test",
+                "ts": "0123456789.000100"
+            }
+        }
+        shortcut_body = {
+            "type": "shortcut",
+            "team": {"id": "T0001"},
+            "user": {"id": "U0002"},
+            "callback_id": "test",
+            "trigger_id": "0123456789"
+        }
+
+        for _ in range(2500):
+            self.slack_app.dispatch(BoltRequest(body=message_body, mode="socket_mode"))
+
+        self.slack_app.dispatch(BoltRequest(body=shortcut_body, mode="socket_mode"))
+
+        self.assertEqual(listeners_count, len(self.slack_app._listeners))
+        views_open_calls = [
+            call for call in mock_api_call.call_args_list if call.args[0] == "views.open"
+        ]
+        self.assertEqual(len(views_open_calls), 1)
+
+    @patch("slack_sdk.WebClient.api_call")
+    def test_shortcut_reloaded_after_registration(self, mock_api_call):
+        mock_api_call.return_value = dict(ok=True)
+        shortcut_body = {
+            "type": "shortcut",
+            "team": {"id": "T0001"},
+            "user": {"id": "U0002"},
+            "callback_id": "new",
+            "trigger_id": "0123456789"
+        }
+
+        self.assertEqual(self.slack_app.dispatch(BoltRequest(body=shortcut_body, mode="socket_mode")).status, 404)
+
+        Config.set_slack_shortcuts(dict(Config.slack_shortcuts, new=Config.slack_shortcuts["test"]))
+
+        self.assertEqual(self.slack_app.dispatch(BoltRequest(body=shortcut_body, mode="socket_mode")).status, 200)
+        mock_api_call.assert_called_once()
+        self.assertEqual(mock_api_call.call_args.args[0], "views.open")
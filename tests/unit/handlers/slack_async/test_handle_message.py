@@ -0,0 +1,76 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock
+
+from bot.handlers.slack_async.handle_messages import AsyncHandleMessages
+
+
+class TestAsyncHandleMessages(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.slack_app = MagicMock()
+        self.slack_app.conversations_info = AsyncMock(return_value=dict(channel=dict(id="Test", name="test")))
+        self.say = AsyncMock()
+        self.slack_message_handle = AsyncHandleMessages(self.slack_app)
+
+    async def test_handle_message_with_thread(self):
+        slack_message = dict(
+            channel="Test",
+            subtype="bot_message",
+            text="Test",
+            thread_ts="0123456789"
+        )
+
+        self.assertIsNone(
+            await self.slack_message_handle.handle_message(self.slack_app, slack_message, self.say)
+        )
+        self.say.assert_not_awaited()
+
+    async def test_handle_message_without_thread(self):
+        slack_message = dict(
+            channel="Test",
+            subtype="user_message",
+            text="Test"
+        )
+
+        bot_message_text = await self.slack_message_handle.handle_message(self.slack_app, slack_message, self.say)
+
+        self.assertIn(":robot_face: Para suporte, favor utilizar o(s) atalho(s)", bot_message_text)
+        self.say.assert_awaited_once_with(bot_message_text)
+
+    async def test_handle_message_channel_info_cached(self):
+        slack_message = dict(
+            channel="Test",
+            subtype="user_message",
+            text="Test"
+        )
+
+        for _ in range(3):
+            await self.slack_message_handle.handle_message(self.slack_app, slack_message, self.say)
+            self.slack_message_handle.channel_reply_cooldowns.clear()
+
+        self.slack_app.conversations_info.assert_awaited_once_with(channel="Test")
+
+    async def test_handle_channel_changed(self):
+        slack_message = dict(
+            channel="Test",
+            subtype="user_message",
+            text="Test"
+        )
+
+        await self.slack_message_handle.handle_message(self.slack_app, slack_message, self.say)
+        await self.slack_message_handle.handle_channel_changed(dict(type="channel_rename", channel=dict(id="Test")))
+        self.slack_message_handle.channel_reply_cooldowns.clear()
+        await self.slack_message_handle.handle_message(self.slack_app, slack_message, self.say)
+
+        self.assertEqual(self.slack_app.conversations_info.await_count, 2)
+
+    async def test_handle_message_channel_cooldown(self):
+        self.slack_app.chat_postEphemeral = AsyncMock()
+
+        for user in ["U1", "U2", "U1"]:
+            await self.slack_message_handle.handle_message(
+                self.slack_app, dict(channel="Test", user=user, text="Test"), self.say
+            )
+
+        self.say.assert_awaited_once()
+        self.slack_app.chat_postEphemeral.assert_awaited_once()
+        self.assertEqual(self.slack_app.chat_postEphemeral.call_args.kwargs["user"], "U2")
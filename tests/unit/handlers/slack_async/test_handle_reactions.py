@@ -0,0 +1,46 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock
+
+from bot.handlers.slack_async.handle_reactions import AsyncHandleReactions
+
+
+def reaction_event(reaction: str, ts: str = "1.2") -> dict:
+    return dict(reaction=reaction, user="U1", item=dict(type="message", channel="C1", ts=ts))
+
+
+class TestAsyncHandleReactions(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.conversations_replies = AsyncMock(return_value=dict(messages=[dict(ts="1.2", thread_ts="1.1")]))
+        self.client.chat_postMessage = AsyncMock()
+        self.reactions_handle = AsyncHandleReactions(MagicMock())
+
+    async def test_handle_reaction_without_rule(self):
+        await self.reactions_handle.handle_reactions_added(self.client, {}, reaction_event("tada"), MagicMock())
+
+        self.client.conversations_replies.assert_not_awaited()
+        self.client.chat_postMessage.assert_not_awaited()
+
+    async def test_handle_reaction_thread_parent_cached(self):
+        for _ in range(2):
+            await self.reactions_handle.handle_reactions_added(self.client, {}, reaction_event("eyes"), MagicMock())
+
+        self.client.conversations_replies.assert_awaited_once_with(channel="C1", ts="1.2", limit=1)
+        self.client.chat_postMessage.assert_awaited_with(
+            text=":eyes: <@U1> está de olho na sua solicitação!",
+            channel="C1",
+            thread_ts="1.1"
+        )
+
+    async def test_handle_reaction_message_without_thread(self):
+        self.client.conversations_replies.return_value = dict(messages=[dict(ts="1.2")])
+
+        await self.reactions_handle.handle_reactions_added(self.client, {}, reaction_event("eyes"), MagicMock())
+
+        self.client.chat_postMessage.assert_not_awaited()
+
+        self.client.conversations_replies.return_value = dict(messages=[dict(ts="1.2", thread_ts="1.2")])
+        await self.reactions_handle.handle_reactions_added(self.client, {}, reaction_event("eyes"), MagicMock())
+
+        self.assertEqual(self.client.conversations_replies.await_count, 2)
+        self.client.chat_postMessage.assert_awaited_once()
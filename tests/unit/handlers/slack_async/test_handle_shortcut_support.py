@@ -0,0 +1,173 @@
+import asyncio
+import json
+
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.config import Config
+from bot.handlers.slack_async.handle_shortcut_support import AsyncHandleShortcutSupport
+from bot.libs.async_az_devops_client import AsyncAzDevOpsClient
+
+
+class TestAsyncHandleShortcutSupport(IsolatedAsyncioTestCase):
+    def setUp(self):
+        Config.slack_shortcuts = {
+            "test": {
+                "az_devops_board": "test",
+                "az_devops_board_template": "azure_devops/test.j2",
+                "az_devops_project": "technology-infrastructure-services",
+                "az_devops_work_item_type": "Support",
+                "az_devops_work_item_area": "test\\\\Q1",
+                "az_devops_work_item_iteration": "",
+                "az_devops_sla": {
+                    "N-Production": "3 dias",
+                    "Production": "5 dias"
+                },
+                "slack_channel": "test",
+                "slack_support_team": "test-team",
+                "slack_template": "slack/devops_shortcut_support.json"
+            }
+        }
+
+        self.slack_app = MagicMock()
+        self.slack_app.configure_mock(**{
+            "views_open": AsyncMock(),
+            "bots_info": AsyncMock(return_value=dict(bot=dict(user_id="UBOT"))),
+            "users_conversations": AsyncMock(return_value=dict(channels=[dict(id="C1", name="test")])),
+            "chat_postMessage": AsyncMock(return_value=dict(ts="1.0")),
+            "chat_getPermalink": AsyncMock(return_value=dict(permalink="https://test.slack.com/p1")),
+            "usergroups_list": AsyncMock(return_value=dict(usergroups=[dict(id="S1", handle="test-team")]))
+        })
+
+        self.slack_message_body = json.load(open("tests/unit/slack_message_body.json"))
+        self.slack_message_body["callback_id"] = "test"
+        self.slack_message_body["view"]["callback_id"] = "test"
+        self.slack_handle_support = AsyncHandleShortcutSupport(self.slack_app)
+
+    async def test_handle_shortcut(self):
+        ack = AsyncMock()
+
+        await self.slack_handle_support.handle_shortcut(ack, self.slack_app, self.slack_message_body, Config.logger)
+
+        ack.assert_awaited_once()
+        self.slack_app.views_open.assert_awaited_once_with(
+            trigger_id=self.slack_message_body["trigger_id"],
+            view=dict(
+                Config.load_template(Config.slack_shortcuts["test"]["slack_template"]),
+                callback_id="test"
+            )
+        )
+
+    @patch.object(AsyncAzDevOpsClient, "add_item_to_project_board", new_callable=AsyncMock)
+    @patch.object(AsyncAzDevOpsClient, "get_default_iteration", new_callable=AsyncMock)
+    async def test_handle_shortcut_submission_thread_replies_order(
+        self, mock_get_default_iteration, mock_add_item_to_project_board
+    ):
+        mock_get_default_iteration.return_value = "\\Test"
+        mock_add_item_to_project_board.return_value = dict(id=42)
+        ack = AsyncMock()
+
+        await self.slack_handle_support.handle_shortcut_submission(
+            ack, self.slack_message_body, self.slack_app, Config.logger
+        )
+
+        ack.assert_awaited_once()
+        messages = self.slack_app.chat_postMessage.await_args_list
+
+        self.assertEqual(len(messages), 4)
+        self.assertIn("Solicitante", messages[0].kwargs["text"])
+        self.assertIn("SLA", messages[1].kwargs["text"])
+        self.assertIn("<!subteam^S1>", messages[2].kwargs["text"])
+        self.assertIn("card de suporte", messages[3].kwargs["text"])
+        self.assertIn("42", messages[3].kwargs["text"])
+
+    @patch.object(AsyncAzDevOpsClient, "add_item_to_project_board", new_callable=AsyncMock)
+    @patch.object(AsyncAzDevOpsClient, "get_default_iteration", new_callable=AsyncMock)
+    async def test_handle_shortcut_submission_usergroups_loaded_once(
+        self, mock_get_default_iteration, mock_add_item_to_project_board
+    ):
+        mock_get_default_iteration.return_value = "\\Test"
+        mock_add_item_to_project_board.return_value = dict(id=42)
+
+        for _ in range(2):
+            await self.slack_handle_support.handle_shortcut_submission(
+                AsyncMock(), self.slack_message_body, self.slack_app, Config.logger
+            )
+
+        self.slack_app.usergroups_list.assert_awaited_once_with()
+
+    @patch.object(AsyncAzDevOpsClient, "add_item_to_project_board", new_callable=AsyncMock)
+    @patch.object(AsyncAzDevOpsClient, "get_default_iteration", new_callable=AsyncMock)
+    async def test_handle_shortcut_submission_board_error(
+        self, mock_get_default_iteration, mock_add_item_to_project_board
+    ):
+        mock_get_default_iteration.return_value = "\\Test"
+        mock_add_item_to_project_board.side_effect = RuntimeError("Azure DevOps unavailable")
+
+        await self.slack_handle_support.handle_shortcut_submission(
+            AsyncMock(), self.slack_message_body, self.slack_app, MagicMock()
+        )
+
+        messages = self.slack_app.chat_postMessage.await_args_list
+
+        self.assertEqual(len(messages), 3)
+        self.assertIn("subteam", messages[2].kwargs["text"])
+
+    @patch.object(AsyncAzDevOpsClient, "add_item_to_project_board", new_callable=AsyncMock)
+    @patch.object(AsyncAzDevOpsClient, "get_default_iteration", new_callable=AsyncMock)
+    async def test_handle_shortcut_submission_reply_error(
+        self, mock_get_default_iteration, mock_add_item_to_project_board
+    ):
+        mock_get_default_iteration.return_value = "\\Test"
+        mock_add_item_to_project_board.return_value = dict(id=42)
+        self.slack_app.chat_postMessage.side_effect = [dict(ts="1.0"), RuntimeError("Slack unavailable")]
+        logger = MagicMock()
+
+        with self.assertRaisesRegex(RuntimeError, "Slack unavailable"):
+            await self.slack_handle_support.handle_shortcut_submission(
+                AsyncMock(), self.slack_message_body, self.slack_app, logger
+            )
+
+        mock_add_item_to_project_board.assert_awaited_once()
+        logger.error.assert_not_called()
+        self.assertEqual(len(self.slack_app.chat_postMessage.await_args_list), 2)
+
+    @patch.object(AsyncAzDevOpsClient, "add_item_to_project_board", new_callable=AsyncMock)
+    @patch.object(AsyncAzDevOpsClient, "get_default_iteration", new_callable=AsyncMock)
+    async def test_handle_shortcut_submission_permalink_error(
+        self, mock_get_default_iteration, mock_add_item_to_project_board
+    ):
+        mock_get_default_iteration.return_value = "\\Test"
+        self.slack_app.chat_getPermalink.side_effect = RuntimeError("Slack unavailable")
+
+        with self.assertRaisesRegex(RuntimeError, "Slack unavailable"):
+            await self.slack_handle_support.handle_shortcut_submission(
+                AsyncMock(), self.slack_message_body, self.slack_app, MagicMock()
+            )
+
+        mock_add_item_to_project_board.assert_not_awaited()
+        self.assertEqual(asyncio.all_tasks(), {asyncio.current_task()})
+        self.assertEqual(len(self.slack_app.chat_postMessage.await_args_list), 3)
+
+    @patch.object(Config, "slack_merged_thread_reply", True)
+    @patch.object(AsyncAzDevOpsClient, "add_item_to_project_board", new_callable=AsyncMock)
+    @patch.object(AsyncAzDevOpsClient, "get_default_iteration", new_callable=AsyncMock)
+    async def test_handle_shortcut_submission_merged_thread_reply(
+        self, mock_get_default_iteration, mock_add_item_to_project_board
+    ):
+        mock_get_default_iteration.return_value = "\\Test"
+        mock_add_item_to_project_board.return_value = dict(id=42)
+        self.slack_app.chat_update = AsyncMock()
+        self.slack_app.chat_postMessage.side_effect = [dict(ts="1.0"), dict(ts="1.1")]
+
+        await self.slack_handle_support.handle_shortcut_submission(
+            AsyncMock(), self.slack_message_body, self.slack_app, Config.logger
+        )
+
+        messages = self.slack_app.chat_postMessage.await_args_list
+
+        self.assertEqual(len(messages), 2)
+        self.assertIn("<!subteam^S1>", messages[1].kwargs["text"])
+        self.slack_app.chat_update.assert_awaited_once()
+        self.assertEqual(self.slack_app.chat_update.await_args.kwargs["ts"], "1.1")
+        self.assertIn("edit/42", self.slack_app.chat_update.await_args.kwargs["text"])
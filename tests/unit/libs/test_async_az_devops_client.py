@@ -0,0 +1,66 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, patch
+
+from bot.config import Config
+from bot.libs.async_az_devops_client import AsyncAzDevOpsClient
+
+
+class TestAsyncAzDevOpsClient(IsolatedAsyncioTestCase):
+    def setUp(self):
+        AsyncAzDevOpsClient._instance = None
+
+    def test_get_instance(self):
+        self.assertIs(AsyncAzDevOpsClient.get_instance(), AsyncAzDevOpsClient.get_instance())
+
+    @patch.object(AsyncAzDevOpsClient, "get_team_settings", new_callable=AsyncMock)
+    async def test_get_default_iteration_cached(self, mock_get_team_settings):
+        mock_get_team_settings.return_value = {"defaultIteration": {"path": "\\Test"}}
+        az_devops_client = AsyncAzDevOpsClient()
+
+        for _ in range(3):
+            self.assertEqual(await az_devops_client.get_default_iteration("test"), "\\Test")
+
+        mock_get_team_settings.assert_awaited_once_with("test")
+
+    @patch.object(AsyncAzDevOpsClient, "get_team_settings", new_callable=AsyncMock)
+    async def test_get_default_iteration_stale_on_refresh_error(self, mock_get_team_settings):
+        mock_get_team_settings.return_value = {"defaultIteration": {"path": "\\Test"}}
+        az_devops_client = AsyncAzDevOpsClient()
+        await az_devops_client.prewarm_team_settings(["test"])
+
+        mock_get_team_settings.side_effect = RuntimeError("Azure DevOps unavailable")
+        az_devops_client.team_settings["test"] = (
+            az_devops_client.team_settings["test"][0],
+            az_devops_client.team_settings["test"][1] - Config.az_devops_team_settings_ttl
+        )
+
+        self.assertEqual(await az_devops_client.get_default_iteration("test"), "\\Test")
+        await az_devops_client._refreshing["test"]
+        self.assertEqual(await az_devops_client.get_default_iteration("test"), "\\Test")
+        await az_devops_client._refreshing["test"]
+        self.assertEqual(mock_get_team_settings.await_count, 3)
+
+    @patch.object(AsyncAzDevOpsClient, "get_team_settings", new_callable=AsyncMock)
+    async def test_get_default_iteration_not_found(self, mock_get_team_settings):
+        mock_get_team_settings.return_value = None
+
+        with self.assertRaises(ValueError):
+            await AsyncAzDevOpsClient().get_default_iteration("test")
+
+    async def test_add_item_to_project_board_requires_project(self):
+        with self.assertRaises(ValueError):
+            await AsyncAzDevOpsClient().add_item_to_project_board(project="", document=[], work_item_type="Support")
+
+    @patch.object(AsyncAzDevOpsClient, "request", new_callable=AsyncMock)
+    async def test_add_item_to_project_board_quotes_url(self, mock_request):
+        mock_request.return_value.raise_for_status = lambda: None
+        mock_request.return_value.json = AsyncMock(return_value={"id": 1})
+
+        await AsyncAzDevOpsClient().add_item_to_project_board(
+            project="devops project", document=[], work_item_type="Product Backlog Item"
+        )
+
+        self.assertIn(
+            "/devops%20project/_apis/wit/workitems/$Product%20Backlog%20Item?api-version=6.0",
+            mock_request.call_args.args[1]
+        )
@@ -1,6 +1,12 @@
+import threading
+import time
 import unittest
 from unittest.mock import patch
-from bot.libs.az_devops_client import AzDevOpsClient
+
+from benchmarks.fake_az_devops import FakeAzDevOpsServer
+from bot.config import Config
+from bot.libs.az_devops_client import AzDevOpsClient, check_rate_limit, get_rate_limiter
+from bot.libs.rate_limiter import RateLimited, RateLimiter
 
 
 class TestAzDevOpsClient(unittest.TestCase):
@@ -32,3 +38,154 @@ class TestAzDevOpsClient(unittest.TestCase):
             work_item_type=self.work_item_type,
             document={}
         )
+
+    def test_get_instance(self):
+        AzDevOpsClient._instance = self.az_devops_client
+
+        self.assertIs(AzDevOpsClient.get_instance(), self.az_devops_client)
+
+        AzDevOpsClient._instance = None
+
+    def test_provide_work_item_tracking_client_once(self):
+        self.az_devops_client.provide_work_item_tracking_client()
+        work_item_tracking_client = self.az_devops_client.work_item_tracking_client
+        self.az_devops_client.provide_work_item_tracking_client()
+
+        self.assertIs(self.az_devops_client.work_item_tracking_client, work_item_tracking_client)
+        self.assertTrue(work_item_tracking_client.config.keep_alive)
+
+    @patch("requests.Session.get")
+    def test_get_team_settings_pooled_session(self, mock_session_get):
+        mock_session_get.return_value.json.return_value = {"defaultIteration": {"path": "Test"}}
+
+        self.assertEqual(
+            self.az_devops_client.get_team_settings(self.project),
+            {"defaultIteration": {"path": "Test"}}
+        )
+        self.assertEqual(self.az_devops_client.session.adapters["https://"]._pool_maxsize, 10)
+
+    @patch("bot.libs.az_devops_client.AzDevOpsClient.get_team_settings")
+    def test_get_default_iteration_cached(self, mock_get_team_settings):
+        mock_get_team_settings.return_value = {"defaultIteration": {"path": "Sprint 1"}}
+
+        for _ in range(3):
+            self.assertEqual(self.az_devops_client.get_default_iteration(self.project), "Sprint 1")
+
+        mock_get_team_settings.assert_called_once_with(self.project)
+
+    @patch("bot.libs.az_devops_client.AzDevOpsClient.get_team_settings")
+    def test_get_default_iteration_not_found(self, mock_get_team_settings):
+        mock_get_team_settings.return_value = None
+
+        self.assertRaises(ValueError, self.az_devops_client.get_default_iteration, self.project)
+
+
+class TestAzDevOpsClientBatch(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeAzDevOpsServer(rejected_work_item_types=("Unknown",)).__enter__()
+        self.config = patch.multiple(
+            Config, az_devops_organization_url=self.server.url, az_devops_batch_window=0.2, az_devops_batch_max_size=50
+        )
+        self.config.start()
+        self.az_devops_client = AzDevOpsClient()
+
+    def tearDown(self):
+        self.config.stop()
+        self.server.__exit__()
+
+    def add_items(self, work_item_types):
+        board_items = dict()
+
+        def add_item(index, work_item_type):
+            board_items[index] = self.az_devops_client.add_item_to_project_board(
+                project="project", work_item_type=work_item_type, document=[
+                    {"op": "add", "path": "/fields/System.Title", "from": None, "value": f"Test {index}"}
+                ]
+            )
+
+        threads = [
+            threading.Thread(target=add_item, args=(index, work_item_type))
+            for index, work_item_type in enumerate(work_item_types)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        return board_items
+
+    @patch.object(Config, "az_devops_batch_window", 0)
+    def test_add_item_to_project_board_pooled_session(self):
+        # Fails if an msrest upgrade stops sending the SDK requests on the pooled session
+        az_devops_client = AzDevOpsClient()
+
+        with patch.object(az_devops_client.session, "request", wraps=az_devops_client.session.request) as request:
+            board_item = az_devops_client.add_item_to_project_board(
+                project="project", work_item_type="Support", document=[
+                    {"op": "add", "path": "/fields/System.Title", "from": None, "value": "Test"}
+                ]
+            )
+
+        self.assertEqual(board_item.id, 1)
+        self.assertIn("/_apis/wit/workItems/$Support", request.call_args.args[1])
+
+    def test_add_item_to_project_board_batched(self):
+        board_items = self.add_items(["Support"] * 10)
+
+        self.assertEqual(self.server.counters["batches"], 1)
+        self.assertEqual(sorted(board_item.id for board_item in board_items.values()), list(range(1, 11)))
+
+    @patch.object(Config, "az_devops_timeout", 0.2)
+    def test_add_item_to_project_board_batch_rate_limited(self):
+        # The batch waits the Retry-After longer than the request timeout and the window
+        self.server.throttle(responses=1, retry_after=0.6)
+
+        with patch.dict(RateLimiter._instances, clear=True):
+            board_items = self.add_items(["Support"])
+
+        self.assertEqual(self.server.counters["throttled"], 1)
+        self.assertEqual(board_items[0].id, 1)
+
+    def test_add_item_to_project_board_batched_item_error(self):
+        board_items = self.add_items(["Support", "Unknown", "Support"])
+
+        self.assertEqual(self.server.counters["batches"], 1)
+        self.assertIsNone(board_items[1])
+        self.assertIsNotNone(board_items[0].id)
+        self.assertIsNotNone(board_items[2].id)
+
+
+class TestAzDevOpsClientRateLimit(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeAzDevOpsServer().__enter__()
+        self.config = patch.multiple(Config, az_devops_organization_url=self.server.url)
+        self.config.start()
+        self.instances = patch.dict(RateLimiter._instances, clear=True)
+        self.instances.start()
+
+    def tearDown(self):
+        self.instances.stop()
+        self.config.stop()
+        self.server.__exit__()
+
+    @patch("bot.libs.az_devops_client.AzDevOpsClient.connect")
+    def test_get_team_settings_retries_after_rate_limited(self, mock_connect):
+        self.server.throttle(responses=2, retry_after=0.1)
+
+        team_settings = AzDevOpsClient().get_team_settings("project")
+
+        self.assertEqual(team_settings["defaultIteration"]["path"], "Sprint 1")
+        self.assertEqual(self.server.counters["throttled"], 2)
+
+    def test_check_rate_limit_pauses_on_exhausted_quota(self):
+        check_rate_limit(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 5)})
+
+        self.assertIsNone(get_rate_limiter().get_bucket("az_devops").reserve(max_wait=1))
+
+    def test_check_rate_limit_retry_after(self):
+        with self.assertRaises(RateLimited) as error:
+            check_rate_limit(429, {"Retry-After": "3"})
+
+        self.assertEqual(error.exception.retry_after, 3)
@@ -0,0 +1,64 @@
+import threading
+
+from unittest import TestCase
+
+from bot.libs.batcher import Batcher
+
+
+class TestBatcher(TestCase):
+    def test_batcher_collects_items_in_window(self):
+        batches = list()
+        batcher = Batcher(send=lambda items: batches.append(items) or [item * 2 for item in items], window=0.2, max_size=10)
+
+        futures = [batcher.submit(index) for index in range(5)]
+
+        self.assertEqual([future.result(timeout=5) for future in futures], [0, 2, 4, 6, 8])
+        self.assertEqual(batches, [[0, 1, 2, 3, 4]])
+
+    def test_batcher_sends_full_batch_before_window(self):
+        batches = list()
+        batcher = Batcher(send=lambda items: batches.append(items) or items, window=30, max_size=3)
+
+        futures = [batcher.submit(index) for index in range(3)]
+
+        self.assertEqual([future.result(timeout=5) for future in futures], [0, 1, 2])
+        self.assertEqual(batches, [[0, 1, 2]])
+
+    def test_batcher_item_error(self):
+        batcher = Batcher(
+            send=lambda items: [ValueError(item) if item == "fail" else item for item in items],
+            window=0.1, max_size=10
+        )
+
+        ok_future, failed_future = batcher.submit("ok"), batcher.submit("fail")
+
+        self.assertEqual(ok_future.result(timeout=5), "ok")
+        self.assertRaises(ValueError, failed_future.result, timeout=5)
+
+    def test_batcher_batch_error(self):
+        def send(items):
+            raise ConnectionError("unavailable")
+
+        batcher = Batcher(send=send, window=0.1, max_size=10)
+        futures = [batcher.submit(index) for index in range(2)]
+
+        for future in futures:
+            self.assertRaises(ConnectionError, future.result, timeout=5)
+
+    def test_batcher_concurrent_submits(self):
+        batcher = Batcher(send=lambda items: items, window=0.2, max_size=100)
+        results = dict()
+
+        def submit(index):
+            results[index] = batcher.submit(index).result(timeout=5)
+
+        threads = [threading.Thread(target=submit, args=(index,)) for index in range(20)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {index: index for index in range(20)})
+        self.assertEqual(batcher.batches, 1)
@@ -0,0 +1,251 @@
+import os
+import tempfile
+import threading
+
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from bot.config import Config
+from bot.libs.cache import RefreshingCache, SQLiteCache, TTLCache, create_cache
+
+
+class TestTTLCache(TestCase):
+    def setUp(self):
+        self.cache = TTLCache(maxsize=2, ttl=10)
+
+    def test_cache_get_set(self):
+        self.cache.set("a", 1)
+
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+
+    def test_cache_lru_eviction(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(len(self.cache), 2)
+
+    @patch("bot.libs.cache.time.monotonic")
+    def test_cache_ttl_expiration(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.cache.set("a", 1)
+
+        mock_monotonic.return_value = 111
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(len(self.cache), 0)
+
+    @patch("bot.libs.cache.time.monotonic")
+    def test_cache_add(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+
+        self.assertTrue(self.cache.add("a", 1))
+        self.assertFalse(self.cache.add("a", 2))
+        self.assertEqual(self.cache.get("a"), 1)
+
+        mock_monotonic.return_value = 111
+
+        self.assertTrue(self.cache.add("a", 3))
+        self.assertEqual(self.cache.get("a"), 3)
+
+    def test_cache_delete(self):
+        self.cache.set("a", 1)
+        self.cache.delete("a")
+        self.cache.delete("b")
+
+        self.assertIsNone(self.cache.get("a"))
+
+
+class TestSQLiteCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.db")
+        self.cache = SQLiteCache(self.path, "test", maxsize=2, ttl=10, purge_every=1)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_cache_shared_between_instances(self):
+        other_cache = SQLiteCache(self.path, "test", ttl=10)
+        self.cache.set(("C1", "1.1"), {"name": "general"})
+
+        self.assertEqual(other_cache.get(("C1", "1.1")), {"name": "general"})
+        self.assertIsNone(SQLiteCache(self.path, "other").get(("C1", "1.1")))
+
+        other_cache.delete(("C1", "1.1"))
+
+        self.assertIsNone(self.cache.get(("C1", "1.1")))
+
+    @patch("bot.libs.cache.time.time")
+    def test_cache_ttl_expiration(self, mock_time):
+        mock_time.return_value = 100
+        self.cache.set("a", 1)
+
+        self.assertFalse(self.cache.add("a", 2))
+
+        mock_time.return_value = 111
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertTrue(self.cache.add("a", 2))
+        self.assertEqual(self.cache.get("a"), 2)
+
+    def test_cache_purge_keeps_maxsize(self):
+        for key in ["a", "b", "c"]:
+            self.cache.set(key, key)
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("c"), "c")
+
+    def test_cache_writes_counted_across_threads(self):
+        def write(thread: int):
+            for key in range(25):
+                self.cache.set(f"{thread}-{key}", key)
+
+        threads = [threading.Thread(target=write, args=(thread,)) for thread in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.cache._writes, 100)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_create_cache(self):
+        self.assertIsInstance(create_cache("test"), TTLCache)
+
+        with patch.object(Config, "cache_db", self.path):
+            self.assertIsInstance(create_cache("test"), SQLiteCache)
+
+
+class TestRefreshingCache(TestCase):
+    def setUp(self):
+        self.loader = MagicMock(side_effect=lambda key: f"{key}-value")
+        self.cache = RefreshingCache(loader=self.loader, ttl=10)
+
+    def test_refreshing_cache_loads_once(self):
+        self.assertEqual(self.cache.get("a"), "a-value")
+        self.assertEqual(self.cache.get("a"), "a-value")
+
+        self.loader.assert_called_once_with("a")
+
+    @patch("bot.libs.cache.time.monotonic")
+    def test_refreshing_cache_background_refresh(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.cache.get("a")
+
+        mock_monotonic.return_value = 109
+        self.loader.side_effect = lambda key: f"{key}-refreshed"
+
+        with patch("bot.libs.cache.threading.Thread") as mock_thread:
+            self.assertEqual(self.cache.get("a"), "a-value")
+            self.cache.get("a")
+
+        mock_thread.assert_called_once()
+        mock_thread.call_args.kwargs["target"](*mock_thread.call_args.kwargs["args"])
+
+        self.assertEqual(self.cache.get("a"), "a-refreshed")
+
+    def test_refreshing_cache_serves_last_value_on_failure(self):
+        self.cache.get("a")
+        self.loader.side_effect = ConnectionError("Azure DevOps is down")
+
+        self.assertEqual(self.cache.load("a"), "a-value")
+
+    def test_refreshing_cache_failure_without_value(self):
+        self.loader.side_effect = lambda key: None
+
+        self.assertIsNone(self.cache.get("a"))
+
+    @patch("bot.libs.cache.time.monotonic")
+    def test_refreshing_cache_backs_off_failed_loads(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.loader.side_effect = ConnectionError("Azure DevOps is down")
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.loader.call_count, 1)
+
+        mock_monotonic.return_value = 101
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.loader.call_count, 2)
+
+        # The delay doubles on each failure
+        mock_monotonic.return_value = 102
+        self.loader.side_effect = lambda key: f"{key}-value"
+        self.assertIsNone(self.cache.get("a"))
+
+        mock_monotonic.return_value = 103
+        self.assertEqual(self.cache.get("a"), "a-value")
+        self.assertEqual(self.loader.call_count, 3)
+
+    @patch("bot.libs.cache.time.monotonic")
+    def test_refreshing_cache_backs_off_failed_refresh(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.cache.get("a")
+
+        mock_monotonic.return_value = 109
+        self.loader.side_effect = ConnectionError("Azure DevOps is down")
+
+        with patch("bot.libs.cache.threading.Thread") as mock_thread:
+            self.cache.get("a")
+            mock_thread.call_args.kwargs["target"](*mock_thread.call_args.kwargs["args"])
+
+            mock_monotonic.return_value = 109.5
+            self.assertEqual(self.cache.get("a"), "a-value")
+            self.assertEqual(mock_thread.call_count, 1)
+
+            mock_monotonic.return_value = 110
+            self.cache.get("a")
+            self.assertEqual(mock_thread.call_count, 2)
+
+    def test_refreshing_cache_refresher_skips_failed_and_refreshing_keys(self):
+        for key in ["a", "b", "c"]:
+            self.cache.get(key)
+
+        self.loader.side_effect = ConnectionError("Azure DevOps is down")
+        self.cache.load("a")
+        self.cache.refresh_after = 0
+        self.cache._refreshing.add("b")
+        self.loader.reset_mock(side_effect=True)
+        self.loader.side_effect = lambda key: f"{key}-refreshed"
+
+        with patch("bot.libs.cache.time.sleep", side_effect=[None, InterruptedError]):
+            with self.assertRaises(InterruptedError):
+                self.cache._refresh_all()
+
+        self.loader.assert_called_once_with("c")
+        self.assertEqual(self.cache.get("c"), "c-refreshed")
+
+    def test_refreshing_cache_prewarm(self):
+        self.cache.refresh_after = 3600
+        self.cache.prewarm(["a", "b"]).join()
+
+        self.assertEqual(self.loader.call_count, 2)
+        self.assertEqual(self.cache.get("b"), "b-value")
+
+    def test_refreshing_cache_shared_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.db")
+            self.cache.store = SQLiteCache(path, "team-settings", ttl=10)
+            other_cache = RefreshingCache(loader=self.loader, ttl=10, store=SQLiteCache(path, "team-settings", ttl=10))
+
+            self.assertEqual(self.cache.get("a"), "a-value")
+            self.assertEqual(other_cache.get("a"), "a-value")
+
+            self.loader.assert_called_once_with("a")
+
+    @patch("bot.libs.cache.time.time")
+    def test_refreshing_cache_ignores_stale_shared_value(self, mock_time):
+        self.cache.store = TTLCache(ttl=10)
+        self.cache.store.set("a", ["a-stale", 100])
+        mock_time.return_value = 109
+
+        self.assertEqual(self.cache.get("a"), "a-value")
+        self.assertEqual(self.cache.store.get("a"), ["a-value", 109])
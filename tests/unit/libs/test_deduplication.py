@@ -0,0 +1,172 @@
+import json
+import os
+import tempfile
+
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import MagicMock, patch
+
+from slack_bolt import App, BoltRequest
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.authorization import AuthorizeResult
+from slack_bolt.request.async_request import AsyncBoltRequest
+
+from bot.libs.cache import SQLiteCache, TTLCache
+from bot.libs.deduplication import Deduplicator, get_delivery_key
+
+EVENT_BODY = {
+    "type": "event_callback",
+    "team_id": "T1",
+    "event_id": "Ev1",
+    "event": {"type": "app_mention", "channel": "C1", "user": "U1", "text": "help", "ts": "1.1"}
+}
+
+
+def authorize(**kwargs):
+    return AuthorizeResult(enterprise_id=None, team_id="T1", bot_token="xoxb-test", bot_id="B1", bot_user_id="U0")
+
+
+async def async_authorize(**kwargs):
+    return authorize(**kwargs)
+
+
+def retry_request(body: dict, retry_num: int = None) -> tuple:
+    headers = {"content-type": ["application/json"]}
+
+    if retry_num is not None:
+        headers["x-slack-retry-num"] = [str(retry_num)]
+
+    return json.dumps(body), headers
+
+
+class TestDeliveryKey(TestCase):
+    def test_delivery_key_event(self):
+        self.assertEqual(get_delivery_key(EVENT_BODY), "event:Ev1")
+
+    def test_delivery_key_view_submission(self):
+        body = {"type": "view_submission", "view": {"id": "V1", "hash": "h1", "state": {"values": {"a": 1}}}}
+        edited_body = {"type": "view_submission", "view": {"id": "V1", "hash": "h1", "state": {"values": {"a": 2}}}}
+
+        self.assertTrue(get_delivery_key(body).startswith("view:V1:h1:"))
+        self.assertEqual(get_delivery_key(body), get_delivery_key(json.loads(json.dumps(body))))
+        self.assertNotEqual(get_delivery_key(body), get_delivery_key(edited_body))
+
+    def test_delivery_key_not_deduplicated(self):
+        self.assertIsNone(get_delivery_key({"type": "shortcut", "trigger_id": "t1"}))
+
+
+class TestDeliveriesCaches(TestCase):
+    def test_memory_deliveries_claim_and_release(self):
+        deduplicator = Deduplicator(TTLCache(maxsize=10, ttl=10))
+
+        self.assertFalse(deduplicator.is_duplicate(EVENT_BODY, {}))
+        self.assertTrue(deduplicator.is_duplicate(EVENT_BODY, {}))
+
+        deduplicator.release(EVENT_BODY)
+
+        self.assertFalse(deduplicator.is_duplicate(EVENT_BODY, {}))
+
+    def test_sqlite_deliveries_shared_between_instances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "deliveries.db")
+            first_deduplicator = Deduplicator(SQLiteCache(path, "slack-deliveries", ttl=10))
+            second_deduplicator = Deduplicator(SQLiteCache(path, "slack-deliveries", ttl=10))
+
+            self.assertFalse(first_deduplicator.is_duplicate(EVENT_BODY, {}))
+            self.assertTrue(second_deduplicator.is_duplicate(EVENT_BODY, {}))
+
+            second_deduplicator.release(EVENT_BODY)
+
+            self.assertFalse(first_deduplicator.is_duplicate(EVENT_BODY, {}))
+
+    @patch("bot.libs.cache.time.time")
+    def test_sqlite_deliveries_claim_expired(self, mock_time):
+        with tempfile.TemporaryDirectory() as directory:
+            deduplicator = Deduplicator(SQLiteCache(os.path.join(directory, "deliveries.db"), "slack-deliveries", ttl=10))
+            mock_time.return_value = 100
+            deduplicator.is_duplicate(EVENT_BODY, {})
+
+            mock_time.return_value = 111
+
+            self.assertFalse(deduplicator.is_duplicate(EVENT_BODY, {}))
+            self.assertTrue(deduplicator.is_duplicate(EVENT_BODY, {}))
+
+
+class TestDeduplicator(TestCase):
+    def setUp(self):
+        self.app = App(authorize=authorize, process_before_response=True, request_verification_enabled=False)
+        self.app.use(Deduplicator(TTLCache()).middleware)
+        self.mentions = MagicMock()
+        self.app.event("app_mention")(lambda event: self.mentions(event["text"]))
+
+    def test_deduplicator_ignores_retries(self):
+        for retry_num in [None, 1, 2]:
+            raw_body, headers = retry_request(EVENT_BODY, retry_num)
+            response = self.app.dispatch(BoltRequest(body=raw_body, headers=headers))
+
+            self.assertEqual(response.status, 200)
+
+        self.mentions.assert_called_once_with("help")
+
+    def test_deduplicator_processes_new_events(self):
+        for event_id in ["Ev1", "Ev2"]:
+            raw_body, headers = retry_request(dict(EVENT_BODY, event_id=event_id))
+            self.app.dispatch(BoltRequest(body=raw_body, headers=headers))
+
+        self.assertEqual(self.mentions.call_count, 2)
+
+    def test_deduplicator_resubmit_after_reject(self):
+        body = {
+            "type": "view_submission",
+            "team": {"id": "T1"},
+            "user": {"id": "U1"},
+            "view": {"id": "V1", "type": "modal", "hash": "h1", "callback_id": "support", "state": {"values": {}}}
+        }
+        submissions = MagicMock(side_effect=[False, True])
+
+        def handle_submission(ack, context):
+            if submissions():
+                return ack()
+
+            context["release_delivery"]()
+            ack(response_action="errors", errors={"title_block": "try again"})
+
+        self.app.view("support")(handle_submission)
+
+        for _ in range(2):
+            raw_body, headers = retry_request(body)
+            response = self.app.dispatch(BoltRequest(body=raw_body, headers=headers))
+
+            self.assertEqual(response.status, 200)
+
+        self.assertEqual(submissions.call_count, 2)
+
+        raw_body, headers = retry_request(body)
+        self.app.dispatch(BoltRequest(body=raw_body, headers=headers))
+
+        self.assertEqual(submissions.call_count, 2)
+
+    def test_deduplicator_store_error(self):
+        deliveries = MagicMock()
+        deliveries.add.side_effect = RuntimeError("database is locked")
+
+        self.assertFalse(Deduplicator(deliveries).is_duplicate(EVENT_BODY, {}))
+
+
+class TestAsyncDeduplicator(IsolatedAsyncioTestCase):
+    async def test_async_deduplicator_ignores_retries(self):
+        app = AsyncApp(authorize=async_authorize, process_before_response=True, request_verification_enabled=False)
+        app.use(Deduplicator(TTLCache()).async_middleware)
+        mentions = MagicMock()
+
+        async def handle_mention(event):
+            mentions(event["text"])
+
+        app.event("app_mention")(handle_mention)
+
+        for retry_num in [None, 1]:
+            raw_body, headers = retry_request(EVENT_BODY, retry_num)
+            response = await app.async_dispatch(AsyncBoltRequest(body=raw_body, headers=headers))
+
+            self.assertEqual(response.status, 200)
+
+        mentions.assert_called_once_with("help")
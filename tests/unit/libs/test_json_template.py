@@ -0,0 +1,48 @@
+import json
+
+from unittest import TestCase
+
+from jinja2 import Template
+
+from bot.libs.json_template import JsonTemplate
+
+
+class TestJsonTemplate(TestCase):
+    def test_json_template_static(self):
+        json_template = JsonTemplate(Template('{"a": [1, "b"]}'), '{"a": [1, "b"]}')
+
+        self.assertTrue(json_template.is_static)
+        self.assertEqual(json_template.render(), {"a": [1, "b"]})
+
+        json_template.render()["a"].append("changed")
+
+        self.assertEqual(json_template.render(), {"a": [1, "b"]})
+
+    def test_json_template_builder(self):
+        source = '[{"op": "add", "value": "{{ title }} - {{ path }}", "from": null}]'
+        json_template = JsonTemplate(Template(source), source)
+        values = dict(title='Say "hi"', path="project\\\\q1")
+
+        self.assertIsNotNone(json_template.builder)
+        self.assertEqual(
+            json_template.render(**values),
+            [{"op": "add", "value": 'Say "hi" - project\\q1', "from": None}]
+        )
+        self.assertIsNot(json_template.render(**values), json_template.render(**values))
+
+    def test_json_template_builder_same_as_render(self):
+        source = '{"a": "{{ a }}", "b": {"c": ["{{ b }}", 2]}}'
+        json_template = JsonTemplate(Template(source), source)
+        values = dict(a="x\\\\y", b=10)
+
+        self.assertEqual(
+            json_template.render(**values),
+            json.loads(Template(source).render(**values), strict=False)
+        )
+
+    def test_json_template_render_fallback(self):
+        source = '{"a": "{{ a | upper }}"}'
+        json_template = JsonTemplate(Template(source), source)
+
+        self.assertIsNone(json_template.builder)
+        self.assertEqual(json_template.render(a="x"), {"a": "X"})
@@ -0,0 +1,108 @@
+import io
+import json
+import logging
+import queue
+import sys
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from bot.libs.logs import JsonFormatter, LazyQueueHandler, SamplingFilter, get_queue_handler, setup_logging
+
+
+def make_record(msg: str = "failed %s", args: tuple = ("a",), level: int = logging.ERROR, lineno: int = 10, exc_info=None):
+    return logging.LogRecord("test", level, "test.py", lineno, msg, args, exc_info)
+
+
+class TestSamplingFilter(TestCase):
+    def setUp(self):
+        self.sampling_filter = SamplingFilter(burst=2, window=60)
+
+    @patch("bot.libs.logs.time.monotonic")
+    def test_repeated_errors_suppressed(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+
+        self.assertEqual([self.sampling_filter.filter(make_record()) for _ in range(4)], [True, True, False, False])
+        self.assertTrue(self.sampling_filter.filter(make_record(lineno=11)))
+        self.assertTrue(self.sampling_filter.filter(make_record(level=logging.INFO)))
+        self.assertEqual(self.sampling_filter.suppressed, 2)
+
+        mock_monotonic.return_value = 161
+        record = make_record()
+
+        self.assertTrue(self.sampling_filter.filter(record))
+        self.assertEqual(record.suppressed, 2)
+        self.assertEqual(record.getMessage(), "failed a (2 similar records suppressed)")
+
+    def test_sampling_disabled(self):
+        sampling_filter = SamplingFilter(burst=0, window=60)
+
+        self.assertTrue(all(sampling_filter.filter(make_record()) for _ in range(100)))
+
+
+class TestLazyQueueHandler(TestCase):
+    def test_records_queued_unformatted(self):
+        log_queue = queue.Queue()
+        handler = LazyQueueHandler(log_queue)
+
+        try:
+            raise ValueError("test")
+        except ValueError:
+            record = make_record(exc_info=sys.exc_info())
+
+        handler.handle(record)
+        queued = log_queue.get_nowait()
+
+        self.assertIs(queued, record)
+        self.assertEqual(queued.args, ("a",))
+        self.assertIsNone(queued.exc_text)
+
+    def test_records_dropped_on_full_queue(self):
+        handler = LazyQueueHandler(queue.Queue(maxsize=1))
+        handler.addFilter(SamplingFilter(burst=1, window=60))
+
+        for lineno in range(3):
+            handler.handle(make_record(lineno=lineno))
+
+        handler.handle(make_record(lineno=0))
+
+        self.assertEqual(handler.stats(), dict(queue_depth=1, dropped=2, suppressed=1))
+
+
+class TestJsonFormatter(TestCase):
+    def test_format(self):
+        try:
+            raise ValueError("test")
+        except ValueError:
+            record = make_record(exc_info=sys.exc_info())
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        self.assertEqual(entry["message"], "failed a")
+        self.assertEqual(entry["level"], "ERROR")
+        self.assertEqual(entry["location"], "test.py:10:None()")
+        self.assertIn("ValueError: test", entry["exception"])
+
+
+class TestSetupLogging(TestCase):
+    def setUp(self):
+        self.root_logger = logging.getLogger()
+        self.handlers = list(self.root_logger.handlers)
+        self.level = self.root_logger.level
+
+    def tearDown(self):
+        self.root_logger.handlers = self.handlers
+        self.root_logger.setLevel(self.level)
+
+    def test_setup_logging_json(self):
+        stream = io.StringIO()
+
+        with patch("sys.stderr", stream):
+            listener = setup_logging(level="info", json_output=True)
+
+        self.assertEqual(self.root_logger.handlers, [get_queue_handler()])
+
+        logging.getLogger("test").info("ticket %s created", "T1")
+        listener.stop()
+
+        self.assertEqual(json.loads(stream.getvalue())["message"], "ticket T1 created")
@@ -0,0 +1,78 @@
+import asyncio
+import inspect
+
+from unittest import TestCase
+
+from prometheus_client import REGISTRY
+
+from bot.libs import metrics
+from bot.libs.work_queue import WorkQueue
+
+
+class Handler:
+    @metrics.instrument_handler("test_handler")
+    def handle(self, ack: object, body: dict) -> str:
+        if body.get("fail"):
+            raise ValueError("Test")
+
+        return "ok"
+
+    @metrics.instrument_handler("test_async_handler")
+    async def async_handle(self, ack: object, body: dict) -> str:
+        return "ok"
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetrics(TestCase):
+    def test_instrument_handler_keeps_signature(self):
+        self.assertEqual(inspect.getfullargspec(Handler().handle).args, ["self", "ack", "body"])
+        self.assertEqual(inspect.getfullargspec(Handler().async_handle).args, ["self", "ack", "body"])
+        self.assertTrue(asyncio.iscoroutinefunction(Handler().async_handle))
+
+    def test_instrument_handler_observes_duration_and_errors(self):
+        count = sample("bot_handler_duration_seconds_count", handler="test_handler")
+        errors = sample("bot_handler_errors_total", handler="test_handler")
+
+        self.assertEqual(Handler().handle(print, {}), "ok")
+        self.assertRaises(ValueError, Handler().handle, print, {"fail": True})
+
+        self.assertEqual(sample("bot_handler_duration_seconds_count", handler="test_handler"), count + 2)
+        self.assertEqual(sample("bot_handler_errors_total", handler="test_handler"), errors + 1)
+
+    def test_instrument_async_handler(self):
+        count = sample("bot_handler_duration_seconds_count", handler="test_async_handler")
+
+        self.assertEqual(asyncio.run(Handler().async_handle(print, {})), "ok")
+        self.assertEqual(sample("bot_handler_duration_seconds_count", handler="test_async_handler"), count + 1)
+
+    def test_az_devops_method(self):
+        self.assertEqual(
+            metrics.az_devops_method("get", "https://dev.azure.com/org/project/_apis/work/teamsettings?api-version=6.1"),
+            "GET work/teamsettings"
+        )
+        self.assertEqual(
+            metrics.az_devops_method("PATCH", "https://dev.azure.com/org/project/_apis/wit/workitems/$Support"),
+            "PATCH wit/workitems"
+        )
+        self.assertEqual(metrics.az_devops_method("POST", "https://dev.azure.com/org/_apis/wit/$batch"), "POST wit/$batch")
+
+    def test_slack_request_type(self):
+        self.assertEqual(metrics.slack_request_type({"type": "event_callback", "event": {"type": "message"}}), "message")
+        self.assertEqual(metrics.slack_request_type({"type": "view_submission"}), "view_submission")
+
+    def test_state_collector(self):
+        work_queue = WorkQueue(workers=1, maxsize=10, name="test-queue")
+        metrics.state_collector.work_queues.append(work_queue)
+
+        try:
+            work_queue.submit(print)
+            work_queue.shutdown(timeout=5)
+
+            self.assertEqual(sample("bot_work_queue_workers", queue="test-queue"), 1)
+            self.assertEqual(sample("bot_work_queue_jobs_total", queue="test-queue", state="completed"), 1)
+            self.assertIn(b"bot_work_queue_depth", metrics.export()[0])
+        finally:
+            metrics.state_collector.work_queues.remove(work_queue)
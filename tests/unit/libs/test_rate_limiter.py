@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from bot.libs.rate_limiter import RateLimited, RateLimiter, TokenBucket
+
+
+class TestTokenBucket(TestCase):
+    def test_token_bucket_burst(self):
+        bucket = TokenBucket(rate=1, burst=3)
+
+        self.assertEqual([bucket.reserve(max_wait=10) for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.reserve(max_wait=10), 1, places=1)
+        self.assertAlmostEqual(bucket.reserve(max_wait=10), 2, places=1)
+
+    def test_token_bucket_max_wait(self):
+        bucket = TokenBucket(rate=1, burst=1)
+        bucket.reserve(max_wait=10)
+
+        self.assertIsNone(bucket.reserve(max_wait=0.5))
+        self.assertAlmostEqual(bucket.reserve(max_wait=10), 1, places=1)
+
+    def test_token_bucket_pause(self):
+        bucket = TokenBucket(rate=100, burst=10)
+        bucket.pause(2)
+
+        self.assertAlmostEqual(bucket.reserve(max_wait=10), 2, places=1)
+        self.assertAlmostEqual(bucket.reserve(max_wait=10), 2.01, places=1)
+
+
+class TestRateLimiter(TestCase):
+    def setUp(self):
+        self.rate_limiter = RateLimiter(
+            limits={"fast": [6000, 10], "slow": [20, 1]}, default_limit="fast", deadline=2
+        )
+
+    def test_rate_limiter_buckets_by_key(self):
+        self.assertIs(self.rate_limiter.get_bucket("slow:C1"), self.rate_limiter.get_bucket("slow:C1"))
+        self.assertIsNot(self.rate_limiter.get_bucket("slow:C1"), self.rate_limiter.get_bucket("slow:C2"))
+        self.assertEqual(self.rate_limiter.get_bucket("unknown").burst, 10)
+
+    def test_rate_limiter_call_retries_after_rate_limited(self):
+        function = MagicMock(side_effect=[RateLimited(retry_after=0.2), "ok"])
+        started_at = time.monotonic()
+
+        self.assertEqual(self.rate_limiter.call("fast", function, "arg"), "ok")
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.2)
+        self.assertEqual(function.call_count, 2)
+        self.assertEqual(self.rate_limiter.stats()["throttled"], 1)
+
+    def test_rate_limiter_call_deadline(self):
+        function = MagicMock(side_effect=RateLimited(retry_after=5))
+
+        self.assertRaises(RateLimited, self.rate_limiter.call, "fast", function)
+        function.assert_called_once()
+
+    def test_rate_limiter_rejects_calls_over_deadline(self):
+        self.rate_limiter.call("slow", print)
+
+        self.assertRaises(RateLimited, self.rate_limiter.call, "slow", print)
+        self.assertEqual(self.rate_limiter.stats()["rejected"], 1)
+
+    def test_rate_limiter_wait_times(self):
+        for _ in range(3):
+            self.rate_limiter.call("fast:C1", print)
+
+        wait_times = self.rate_limiter.stats()["wait_times"]["fast"]
+
+        self.assertEqual(wait_times["calls"], 3)
+        self.assertEqual(wait_times["wait_time_max"], 0)
+
+    def test_rate_limiter_acall(self):
+        calls = list()
+
+        async def function(value):
+            calls.append(value)
+
+            if len(calls) == 1:
+                raise RateLimited(retry_after=0.1)
+
+            return value
+
+        self.assertEqual(asyncio.run(self.rate_limiter.acall("fast", function, "ok")), "ok")
+        self.assertEqual(calls, ["ok", "ok"])
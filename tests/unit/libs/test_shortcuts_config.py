@@ -0,0 +1,151 @@
+import json
+import os
+import tempfile
+
+from types import MappingProxyType
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from bot.config import Config
+from bot.libs.shortcuts_config import ShortcutsWatcher, compile_shortcuts, load_shortcuts
+
+SHORTCUT_CONFIG = {
+    "az_devops_board": "test",
+    "az_devops_board_template": "azure_devops/test.j2",
+    "az_devops_project": "test-project",
+    "az_devops_work_item_type": "Support",
+    "az_devops_work_item_area": "test-project\\\\q1",
+    "az_devops_sla": {"N-Production": "5 days", "Production": "3 days"},
+    "slack_channel": "test",
+    "slack_support_team": "test-team",
+    "slack_template": "slack/devops_shortcut_support.json"
+}
+
+
+class TestCompileShortcuts(TestCase):
+    def test_compile_shortcuts(self):
+        shortcuts = compile_shortcuts({"test": SHORTCUT_CONFIG})
+
+        self.assertIsInstance(shortcuts, MappingProxyType)
+        self.assertEqual(shortcuts["test"]["az_devops_work_item_iteration"], "")
+        self.assertEqual(shortcuts["test"]["az_devops_sla"]["Production"], "3 days")
+
+        with self.assertRaises(TypeError):
+            shortcuts["test"]["az_devops_sla"]["Production"] = "1 day"
+
+    def test_compile_shortcuts_invalid(self):
+        shortcut_config = dict(SHORTCUT_CONFIG, slack_channel=1, az_devops_sla={}, unknown="test")
+        del shortcut_config["slack_template"]
+
+        with self.assertRaises(ValueError) as context:
+            compile_shortcuts({"test": shortcut_config, "other": "test"})
+
+        for error in [
+            "test.slack_channel: expected str", "test.az_devops_sla", "test.unknown: unknown key",
+            "test.slack_template: required", "other: expected a mapping"
+        ]:
+            self.assertIn(error, str(context.exception))
+
+
+class TestLoadShortcuts(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, file_name: str, content: str) -> str:
+        path = os.path.join(self.directory.name, file_name)
+
+        with open(path, "w") as shortcuts_file:
+            shortcuts_file.write(content)
+
+        return path
+
+    def test_load_shortcuts_directory(self):
+        self.write("devops.json", json.dumps({"devops": SHORTCUT_CONFIG}))
+        self.write("cloud.yaml", "cloud:\n  slack_channel: cloud\n")
+        self.write("README.md", "ignored")
+
+        shortcuts = load_shortcuts(self.directory.name)
+
+        self.assertEqual(list(shortcuts), ["cloud", "devops"])
+        self.assertEqual(shortcuts["cloud"]["slack_channel"], "cloud")
+
+    def test_load_shortcuts_file(self):
+        path = self.write("shortcuts.json", json.dumps({"devops": SHORTCUT_CONFIG}))
+
+        self.assertEqual(load_shortcuts(path), {"devops": SHORTCUT_CONFIG})
+
+    def test_load_shortcuts_duplicated(self):
+        self.write("a.json", json.dumps({"devops": SHORTCUT_CONFIG}))
+        self.write("b.json", json.dumps({"devops": SHORTCUT_CONFIG}))
+
+        self.assertRaisesRegex(ValueError, "already defined", load_shortcuts, self.directory.name)
+
+    def test_load_shortcuts_invalid_file(self):
+        self.write("a.json", "{")
+
+        self.assertRaisesRegex(ValueError, "a.json", load_shortcuts, self.directory.name)
+
+
+class TestShortcutsWatcher(TestCase):
+    def setUp(self):
+        self.config = patch.multiple(Config, slack_shortcuts={}, _channels_index=None)
+        self.config.start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "shortcuts.json")
+        self.write({"test": SHORTCUT_CONFIG})
+        self.watcher = ShortcutsWatcher(self.path, interval=10)
+
+    def tearDown(self):
+        self.watcher.stop()
+        self.directory.cleanup()
+        self.config.stop()
+
+    def write(self, shortcuts: dict) -> None:
+        with open(self.path, "w") as shortcuts_file:
+            json.dump(shortcuts, shortcuts_file)
+
+        # Moves the mtime forward, the test writes are faster than its resolution
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    def test_load(self):
+        self.watcher.load()
+
+        self.assertEqual(list(Config.slack_shortcuts), ["test"])
+        self.assertEqual(Config.get_channel_shortcuts("test"), ("test",))
+        self.assertFalse(self.watcher.reload())
+
+    def test_reload_changed(self):
+        self.watcher.load()
+        on_change = MagicMock()
+        self.watcher.on_change = on_change
+        shortcuts = Config.slack_shortcuts
+
+        self.write({"test": SHORTCUT_CONFIG, "new": dict(SHORTCUT_CONFIG, slack_channel="new")})
+
+        self.assertTrue(self.watcher.reload())
+        self.assertEqual(Config.get_channel_shortcuts("new"), ("new",))
+        self.assertEqual(list(shortcuts), ["test"])
+        on_change.assert_called_once_with()
+
+    def test_reload_invalid_keeps_current(self):
+        self.watcher.load()
+        shortcuts = Config.slack_shortcuts
+
+        self.write({"test": dict(SHORTCUT_CONFIG, slack_template="slack/missing.json")})
+
+        self.assertFalse(self.watcher.reload())
+        self.assertIs(Config.slack_shortcuts, shortcuts)
+
+    @patch.object(Config, "slack_shortcuts_path", None)
+    def test_from_config_without_path(self):
+        self.assertIsNone(ShortcutsWatcher.from_config())
+
+    def test_from_config_invalid(self):
+        self.write({"test": {}})
+
+        with patch.object(Config, "slack_shortcuts_path", self.path):
+            self.assertRaises(ValueError, ShortcutsWatcher.from_config)
@@ -1,14 +1,25 @@
+import threading
+import time
+
+from queue import Queue
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import ANY, MagicMock, PropertyMock, patch
 
+from benchmarks.fake_slack import FakeSlackServer
+from benchmarks.fake_socket_mode import FakeSocketModeServer
 from bot.config import Config
+from bot.libs import tracing
 from bot.libs.slack_app import SlackApp
+from bot.libs.tracing import TracingExecutor
 
 
 class TestSlackApp(TestCase):
     def setUp(self):
         Config.slack_bot_token = "test"
         Config.slack_signing_secret = "test"
+        listener_runner = patch("bot.libs.slack_app.App.listener_runner", new_callable=PropertyMock)
+        self.listener_runner = listener_runner.start()
+        self.addCleanup(listener_runner.stop)
 
     @patch("bot.libs.slack_app.App.__init__")
     def test_slack_app(self, mock_slack_app):
@@ -16,7 +27,96 @@ class TestSlackApp(TestCase):
 
         mock_slack_app.assert_called_once_with(
             signing_secret="test",
-            token="test"
+            client=ANY
         )
+        assert mock_slack_app.call_args.kwargs["client"].token == "test"
+        assert isinstance(self.listener_runner.return_value.listener_executor, TracingExecutor)
 
         assert slack_app is not None
+
+    @patch("bot.libs.slack_app.App.__init__")
+    def test_get_usergroups_id(self, mock_slack_app):
+        slack_app = SlackApp()
+        slack_app._client = MagicMock()
+        slack_app._client.usergroups_list.return_value = dict(usergroups=[
+            dict(id="S0001", handle="support"),
+            dict(id="S0002", handle="cloud")
+        ])
+
+        self.assertEqual(slack_app.get_usergroups_id(["support", "unknown"]), {"support": "S0001"})
+        slack_app._client.usergroups_list.assert_called_once_with()
+
+    @patch.object(Config, "slack_app_token", None)
+    @patch("bot.libs.slack_app.App.__init__")
+    def test_socket_mode_handler_without_app_token(self, mock_slack_app):
+        with self.assertRaises(ValueError):
+            SlackApp().socket_mode_handler()
+
+
+class TestSlackAppSocketMode(TestCase):
+    def setUp(self):
+        self.slack_server = FakeSlackServer().__enter__()
+        self.socket_mode_server = FakeSocketModeServer().__enter__()
+        self.slack_server.socket_mode_url = self.socket_mode_server.url
+        self.config = patch.multiple(
+            Config, slack_api_url=self.slack_server.api_url, slack_bot_token="xoxb-test",
+            slack_app_token="xapp-test", slack_socket_mode_concurrency=2
+        )
+        self.config.start()
+
+    def tearDown(self):
+        self.config.stop()
+        self.socket_mode_server.__exit__()
+        self.slack_server.__exit__()
+
+    def test_socket_mode_handler_acks_on_socket(self):
+        slack_app = SlackApp()
+        mentions = Queue()
+        slack_app.event("app_mention")(lambda event: mentions.put(event["text"]))
+        socket_mode_handler = slack_app.socket_mode_handler()
+        socket_mode_handler.connect()
+
+        try:
+            self.assertTrue(self.socket_mode_server.wait_connection(10))
+            envelope_id = self.socket_mode_server.send("events_api", {
+                "type": "event_callback",
+                "team_id": "T0000001",
+                "event_id": "Ev1",
+                "event": {"type": "app_mention", "channel": "C1", "user": "U1", "text": "help", "ts": "1.1"}
+            })
+
+            self.assertEqual(mentions.get(timeout=10), "help")
+            deadline = time.monotonic() + 10
+
+            while envelope_id not in self.socket_mode_server.acks and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            self.assertIn(envelope_id, self.socket_mode_server.acks)
+            self.assertEqual(socket_mode_handler.client.message_workers._max_workers, 2)
+        finally:
+            socket_mode_handler.close()
+
+    @patch.object(Config, "tracing_enabled", True)
+    def test_listeners_run_on_request_trace(self):
+        slack_app = SlackApp()
+        listeners = Queue()
+        slack_app.event("app_mention")(lambda: listeners.put((
+            threading.current_thread().name, tracing.get_current_span()
+        )))
+        socket_mode_handler = slack_app.socket_mode_handler()
+        socket_mode_handler.connect()
+
+        try:
+            self.assertTrue(self.socket_mode_server.wait_connection(10))
+            self.socket_mode_server.send("events_api", {
+                "type": "event_callback",
+                "team_id": "T0000001",
+                "event_id": "Ev1",
+                "event": {"type": "app_mention", "channel": "C1", "user": "U1", "text": "help", "ts": "1.1"}
+            })
+
+            thread_name, current_span = listeners.get(timeout=10)
+            self.assertTrue(thread_name.startswith("bolt-listener"))
+            self.assertEqual(current_span.trace.root.name, "app_mention")
+        finally:
+            socket_mode_handler.close()
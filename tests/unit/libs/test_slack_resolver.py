@@ -0,0 +1,123 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from bot.libs.slack_resolver import SlackResolver
+
+
+class TestSlackResolver(TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.bots_info.return_value = dict(bot=dict(user_id="U0001"))
+        self.client.users_conversations.side_effect = [
+            dict(
+                channels=[dict(id="C0001", name="test")],
+                response_metadata=dict(next_cursor="page_2")
+            ),
+            dict(
+                channels=[dict(id="C0002", name="test-2")],
+                response_metadata=dict(next_cursor="")
+            )
+        ]
+        self.slack_resolver = SlackResolver()
+
+    def test_get_channel_id_paginated(self):
+        self.assertEqual(self.slack_resolver.get_channel_id(self.client, "B0001", "test-2"), "C0002")
+        self.assertEqual(self.slack_resolver.get_channel_id(self.client, "B0001", "test"), "C0001")
+
+        self.client.bots_info.assert_called_once_with(bot="B0001")
+        self.assertEqual(self.client.users_conversations.call_count, 2)
+        self.assertEqual(
+            self.client.users_conversations.call_args.kwargs["cursor"], "page_2"
+        )
+
+    def test_get_channel_id_loaded_by_other_worker(self):
+        self.slack_resolver.get_channel_id(self.client, "B0001", "test")
+        other_resolver = SlackResolver()
+        other_resolver.cache = self.slack_resolver.cache
+
+        self.assertEqual(other_resolver.get_channel_id(self.client, "B0001", "test-2"), "C0002")
+        self.assertEqual(other_resolver.get_bot_user_id(self.client, "B0001"), "U0001")
+        self.assertEqual(self.client.users_conversations.call_count, 2)
+        self.client.bots_info.assert_called_once_with(bot="B0001")
+
+    def test_handle_member_joined_channel(self):
+        self.slack_resolver.get_channel_id(self.client, "B0001", "test")
+        self.client.conversations_info.return_value = dict(channel=dict(id="C0003", name="test-3"))
+
+        self.slack_resolver.handle_member_joined_channel(
+            self.client, {}, {}, dict(user="U0001", channel="C0003")
+        )
+
+        self.assertEqual(self.slack_resolver.get_channel_id(self.client, "B0001", "test-3"), "C0003")
+        self.assertEqual(self.client.users_conversations.call_count, 2)
+
+    def test_handle_member_joined_channel_other_user(self):
+        self.slack_resolver.get_channel_id(self.client, "B0001", "test")
+
+        self.slack_resolver.handle_member_joined_channel(
+            self.client, {}, {}, dict(user="U0002", channel="C0003")
+        )
+
+        self.client.conversations_info.assert_not_called()
+
+    def test_handle_member_joined_channel_shared_channels(self):
+        self.slack_resolver.get_channel_id(self.client, "B0001", "test")
+        self.client.conversations_info.return_value = dict(channel=dict(id="C0003", name="test-3"))
+
+        # The channels loaded by another worker, the bot user id is read from the cache
+        other_resolver = SlackResolver()
+        other_resolver.cache = self.slack_resolver.cache
+        other_resolver.get_channel_id(self.client, "B0001", "test")
+
+        other_resolver.handle_member_joined_channel(
+            self.client, {}, dict(bot_id="B0001"), dict(user="U0001", channel="C0003")
+        )
+
+        self.assertEqual(other_resolver.channels["test-3"], "C0003")
+        self.client.bots_info.assert_called_once_with(bot="B0001")
+
+    def test_handle_member_joined_channel_event_authorizations(self):
+        self.slack_resolver.channels = dict(test="C0001")
+        self.client.conversations_info.return_value = dict(channel=dict(id="C0003", name="test-3"))
+        body = dict(authorizations=[dict(user_id="U0001", is_bot=True)])
+
+        self.slack_resolver.handle_member_joined_channel(
+            self.client, body, {}, dict(user="U0001", channel="C0003")
+        )
+
+        self.assertEqual(self.slack_resolver.channels["test-3"], "C0003")
+        self.client.bots_info.assert_not_called()
+
+    def test_handle_channel_left(self):
+        self.slack_resolver.get_channel_id(self.client, "B0001", "test")
+
+        self.slack_resolver.handle_channel_left(dict(channel="C0001"))
+
+        self.assertNotIn("test", self.slack_resolver.channels)
+        self.assertIn("test-2", self.slack_resolver.channels)
+
+    def test_get_usergroup_id_loaded_once(self):
+        self.client.usergroups_list.return_value = dict(usergroups=[
+            dict(id="S0001", handle="support"),
+            dict(id="S0002", handle="disabled", date_delete=1650000000)
+        ])
+
+        self.assertEqual(self.slack_resolver.get_usergroup_id(self.client, "support"), "S0001")
+        self.assertIsNone(self.slack_resolver.get_usergroup_id(self.client, "disabled"))
+        self.assertIsNone(self.slack_resolver.get_usergroup_id(self.client, "unknown"))
+
+        self.client.usergroups_list.assert_called_once_with()
+
+    def test_handle_subteam_changed(self):
+        self.client.usergroups_list.return_value = dict(usergroups=[dict(id="S0001", handle="support")])
+        self.slack_resolver.get_usergroup_id(self.client, "support")
+
+        self.slack_resolver.handle_subteam_changed(dict(subteam=dict(id="S0002", handle="cloud", date_delete=0)))
+        self.slack_resolver.handle_subteam_changed(dict(subteam=dict(id="S0001", handle="devops", date_delete=0)))
+
+        self.assertEqual(self.slack_resolver.usergroups, {"cloud": "S0002", "devops": "S0001"})
+
+        self.slack_resolver.handle_subteam_changed(dict(subteam=dict(id="S0002", handle="cloud", date_delete=1)))
+
+        self.assertEqual(self.slack_resolver.usergroups, {"devops": "S0001"})
+        self.client.usergroups_list.assert_called_once_with()
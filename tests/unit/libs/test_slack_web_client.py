@@ -0,0 +1,33 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks.fake_slack import FakeSlackServer
+from bot.libs.rate_limiter import RateLimiter
+from bot.libs.slack_web_client import RateLimitedWebClient, get_rate_limit_key
+
+
+class TestRateLimitedWebClient(TestCase):
+    def setUp(self):
+        self.server = FakeSlackServer().__enter__()
+        self.instances = patch.dict(RateLimiter._instances, clear=True)
+        self.instances.start()
+        self.client = RateLimitedWebClient(token="xoxb-test", base_url=self.server.api_url)
+
+    def tearDown(self):
+        self.instances.stop()
+        self.server.__exit__()
+
+    def test_get_rate_limit_key(self):
+        self.assertEqual(get_rate_limit_key("usergroups.list", {}), "tier2")
+        self.assertEqual(get_rate_limit_key("chat.postMessage", {"channel": "C1"}), "chat.postMessage:C1")
+        self.assertEqual(get_rate_limit_key("unknown.method", {}), "tier3")
+
+    def test_retries_after_rate_limited(self):
+        self.server.throttle(responses=1, retry_after=0.2)
+
+        response = self.client.chat_postMessage(channel="C1", text="Test")
+
+        self.assertTrue(response["ok"])
+        self.assertEqual(self.server.counters["throttled"], 1)
+        self.assertEqual(len(self.server.messages), 1)
+        self.assertEqual(RateLimiter._instances["slack"].stats()["throttled"], 1)
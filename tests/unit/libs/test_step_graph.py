@@ -0,0 +1,82 @@
+import json
+import subprocess  # nosec
+import sys
+import textwrap
+import time
+
+from unittest import TestCase
+
+from bot.libs.step_graph import StepGraph
+
+
+class TestStepGraph(TestCase):
+    def setUp(self):
+        self.steps = StepGraph("test")
+
+    def test_step_graph_dependencies(self):
+        self.steps.add("a", lambda results: 1)
+        self.steps.add("b", lambda results: results["a"] + 1, depends_on=["a"])
+        self.steps.add("c", lambda results: results["a"] + results["b"], depends_on=["a", "b"])
+
+        self.assertEqual(self.steps.run(), dict(a=1, b=2, c=3))
+        self.assertEqual(set(self.steps.timings), {"a", "b", "c", "total"})
+
+    def test_step_graph_concurrent_steps(self):
+        for name in ["a", "b", "c"]:
+            self.steps.add(name, lambda results: time.sleep(0.2))
+
+        self.steps.run()
+
+        self.assertLess(self.steps.timings["total"], 0.5)
+
+    def test_step_graph_failed_step(self):
+        self.steps.add("a", lambda results: int("not a number"))
+        self.steps.add("b", lambda results: "b", depends_on=["a"])
+        self.steps.add("c", lambda results: "c")
+
+        self.assertEqual(self.steps.run(), dict(c="c"))
+        self.assertIsInstance(self.steps.errors["a"], ValueError)
+        self.assertIsInstance(self.steps.errors["b"], RuntimeError)
+
+    def test_step_graph_unknown_dependency(self):
+        self.assertRaises(ValueError, self.steps.add, "a", print, depends_on=["b"])
+
+
+# Jobs still queued when the process exits, drained by the atexit hook
+# after the concurrent.futures one has closed the pools
+DRAIN_AT_EXIT = textwrap.dedent("""
+    import atexit, json, time
+    from bot.libs.step_graph import StepGraph
+    from bot.libs.work_queue import WorkQueue
+
+    work_queue = WorkQueue(workers=1, maxsize=10)
+
+    def shutdown():
+        work_queue.shutdown(timeout=5)
+        print(json.dumps(work_queue.stats()))
+
+    def job():
+        time.sleep(0.05)
+        steps = StepGraph("job")
+        steps.add("a", lambda results: 1)
+        steps.add("b", lambda results: results["a"] + 1, depends_on=["a"])
+        steps.run()
+
+        if steps.errors:
+            raise RuntimeError(steps.errors)
+
+    atexit.register(shutdown)
+
+    for _ in range(3):
+        work_queue.submit(job)
+""")
+
+
+class TestStepGraphAtExit(TestCase):
+    def test_work_queue_drained_at_exit(self):
+        process = subprocess.run(  # nosec
+            [sys.executable, "-c", DRAIN_AT_EXIT], capture_output=True, text=True, timeout=30, check=True
+        )
+        stats = json.loads(process.stdout.splitlines()[-1])
+
+        self.assertEqual((stats["completed"], stats["failed"]), (3, 0))
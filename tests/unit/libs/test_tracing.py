@@ -0,0 +1,212 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import MagicMock, patch
+
+from benchmarks.fake_otlp import FakeOTLPCollector
+from bot.config import Config
+from bot.libs import tracing
+from bot.libs.work_queue import WorkQueue
+
+
+class TracingTestCase(TestCase):
+    def setUp(self):
+        self.exporter = MagicMock()
+        self.config = patch.multiple(Config, tracing_enabled=True, tracing_slow_request_threshold=0)
+        self.config.start()
+        self.get_exporter = patch("bot.libs.tracing.get_exporter", return_value=self.exporter)
+        self.get_exporter.start()
+
+    def tearDown(self):
+        self.get_exporter.stop()
+        self.config.stop()
+
+    def exported_traces(self) -> list:
+        return [call.args[0] for call in self.exporter.submit.call_args_list]
+
+
+class TestTracing(TracingTestCase):
+    def test_span_outside_trace(self):
+        with tracing.span("test") as span:
+            self.assertIsNone(span)
+
+        self.assertIsNone(tracing.get_current_span())
+
+    def test_trace_spans(self):
+        with tracing.start_trace("view_submission", **{"slack.trigger_id": "T1"}) as root:
+            with tracing.span("handler"):
+                with tracing.span("slack chat.postMessage", tracing.SPAN_KIND_CLIENT) as call:
+                    self.assertIs(tracing.get_current_span(), call)
+
+            with self.assertRaises(ValueError):
+                with tracing.span("board_item"):
+                    raise ValueError("test")
+
+        trace, = self.exported_traces()
+
+        self.assertIs(trace.root, root)
+        self.assertEqual([span.name for span in trace.spans], [
+            "view_submission", "handler", "slack chat.postMessage", "board_item"
+        ])
+        self.assertEqual(trace.spans[2].parent_id, trace.spans[1].span_id)
+        self.assertEqual(trace.spans[3].error, "ValueError")
+        self.assertIsNone(tracing.get_current_span())
+
+    @patch.object(Config, "tracing_enabled", False)
+    def test_tracing_disabled(self):
+        with tracing.start_trace("message") as root:
+            self.assertIsNone(root)
+
+    def test_trace_kept_open_by_bound_job(self):
+        started = threading.Event()
+
+        def job():
+            started.wait(5)
+
+            with tracing.span("job"):
+                pass
+
+        with tracing.start_trace("message"):
+            thread = threading.Thread(target=tracing.bind(job))
+            thread.start()
+
+        self.exporter.submit.assert_not_called()
+
+        started.set()
+        thread.join(5)
+        trace, = self.exported_traces()
+
+        self.assertEqual([span.name for span in trace.spans], ["message", "job"])
+        self.assertEqual(trace.spans[1].parent_id, trace.root.span_id)
+
+    def test_work_queue_jobs_traced(self):
+        work_queue = WorkQueue(workers=1, maxsize=1)
+        started = threading.Event()
+        blocker = threading.Event()
+        work_queue.submit(lambda: started.set() or blocker.wait(5))
+        started.wait(5)
+
+        def job():
+            with tracing.span("job"):
+                pass
+
+        with tracing.start_trace("view_submission"):
+            self.assertTrue(work_queue.submit(job))
+            self.assertFalse(work_queue.submit(job))
+
+        blocker.set()
+        work_queue.shutdown(timeout=5)
+        trace, = self.exported_traces()
+
+        self.assertEqual([span.name for span in trace.spans], ["view_submission", "job"])
+
+    def test_tracing_executor(self):
+        executor = tracing.TracingExecutor(max_workers=1)
+
+        with tracing.start_trace("message") as root:
+            span = executor.submit(tracing.get_current_span).result(5)
+
+        executor.shutdown()
+
+        self.assertIs(span, root)
+
+    @patch.object(Config, "tracing_slow_request_threshold", 0.01)
+    def test_slow_request_logged(self):
+        with self.assertLogs(Config.logger, "WARNING") as logs:
+            with tracing.start_trace("view_submission"):
+                with tracing.span("az_devops POST wit/workItems", service="az_devops"):
+                    time.sleep(0.02)
+
+        self.assertIn("Slow request view_submission", logs.output[0])
+        self.assertIn("ms   az_devops POST wit/workItems service=az_devops", logs.output[0])
+
+    def test_slack_request_attributes(self):
+        self.assertEqual(tracing.slack_request_attributes({
+            "type": "event_callback",
+            "team_id": "T1",
+            "event_id": "Ev1",
+            "event": {"type": "message", "channel": "C1"}
+        }), {"slack.request_type": "message", "slack.team_id": "T1", "slack.event_id": "Ev1", "slack.channel": "C1"})
+        self.assertEqual(tracing.slack_request_attributes({
+            "type": "view_submission",
+            "team": {"id": "T1"},
+            "trigger_id": "1.2",
+            "view": {"id": "V1", "callback_id": "devops_support"}
+        }), {
+            "slack.request_type": "view_submission", "slack.team_id": "T1", "slack.trigger_id": "1.2",
+            "slack.callback_id": "devops_support", "slack.view_id": "V1"
+        })
+
+
+class TestAsyncTracing(IsolatedAsyncioTestCase):
+    async def test_task_factory_keeps_trace_open(self):
+        asyncio.get_running_loop().set_task_factory(tracing.task_factory)
+        exporter = MagicMock()
+
+        async def listener():
+            await asyncio.sleep(0.01)
+
+            with tracing.span("listener"):
+                pass
+
+        with patch.object(Config, "tracing_enabled", True), patch.object(Config, "tracing_slow_request_threshold", 0), \
+                patch("bot.libs.tracing.get_exporter", return_value=exporter):
+            with tracing.start_trace("message"):
+                task = asyncio.ensure_future(listener())
+
+            exporter.submit.assert_not_called()
+            await task
+
+        trace = exporter.submit.call_args.args[0]
+
+        self.assertEqual([span.name for span in trace.spans], ["message", "listener"])
+
+
+class TestOTLPExporter(TracingTestCase):
+    def trace(self) -> tracing.Trace:
+        with tracing.start_trace("message", **{"slack.event_id": "Ev1"}):
+            with tracing.span("slack chat.postMessage", tracing.SPAN_KIND_CLIENT, service="slack"):
+                pass
+
+        return self.exported_traces()[-1]
+
+    def test_otlp_traces(self):
+        trace = self.trace()
+        resource_spans, = tracing.otlp_traces([trace])["resourceSpans"]
+        root, call = resource_spans["scopeSpans"][0]["spans"]
+
+        self.assertEqual(root["traceId"], trace.trace_id)
+        self.assertNotIn("parentSpanId", root)
+        self.assertEqual(root["attributes"], [{"key": "slack.event_id", "value": {"stringValue": "Ev1"}}])
+        self.assertEqual(call["parentSpanId"], root["spanId"])
+        self.assertEqual(call["kind"], tracing.SPAN_KIND_CLIENT)
+        self.assertGreaterEqual(int(call["endTimeUnixNano"]), int(call["startTimeUnixNano"]))
+
+    def test_export_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "traces.jsonl")
+            exporter = tracing.OTLPExporter(file=path)
+            exporter.export([self.trace(), self.trace()])
+
+            with open(path) as traces_file:
+                lines = traces_file.readlines()
+
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(len(json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]), 4)
+
+    def test_export_collector(self):
+        with FakeOTLPCollector() as collector:
+            exporter = tracing.OTLPExporter(endpoint=collector.url, window=0.01)
+            trace = self.trace()
+            exporter.submit(trace)
+            deadline = time.monotonic() + 5
+
+            while not collector.spans and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            self.assertEqual(list(collector.traces()), [trace.trace_id])
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from unittest import TestCase
+
+from bot.libs.work_queue import WorkQueue
+
+
+class TestWorkQueue(TestCase):
+    def test_work_queue_runs_jobs(self):
+        results = list()
+        work_queue = WorkQueue(workers=2, maxsize=10)
+
+        for index in range(5):
+            self.assertTrue(work_queue.submit(results.append, index))
+
+        work_queue.shutdown(timeout=5)
+
+        self.assertEqual(sorted(results), [0, 1, 2, 3, 4])
+        self.assertEqual(work_queue.stats()["completed"], 5)
+
+    def test_work_queue_rejects_when_full(self):
+        release = threading.Event()
+        work_queue = WorkQueue(workers=1, maxsize=1)
+
+        work_queue.submit(release.wait)
+
+        while work_queue.queue_depth:
+            pass
+
+        self.assertTrue(work_queue.submit(print))
+        self.assertFalse(work_queue.submit(print))
+        self.assertEqual(work_queue.stats()["rejected"], 1)
+
+        release.set()
+        work_queue.shutdown(timeout=5)
+
+    def test_work_queue_shutdown_drains_jobs(self):
+        results = list()
+        release = threading.Event()
+        work_queue = WorkQueue(workers=1, maxsize=10)
+
+        work_queue.submit(release.wait)
+        work_queue.submit(results.append, "queued")
+        release.set()
+        work_queue.shutdown(timeout=5)
+
+        self.assertEqual(results, ["queued"])
+        self.assertFalse(work_queue.submit(results.append, "after shutdown"))
+
+    def test_work_queue_failed_job(self):
+        work_queue = WorkQueue(workers=1, maxsize=10)
+
+        work_queue.submit(int, "not a number")
+        work_queue.shutdown(timeout=5)
+
+        self.assertEqual(work_queue.stats()["failed"], 1)
+
+    def test_work_queue_shutdown_timeout_with_full_queue(self):
+        release = threading.Event()
+        work_queue = WorkQueue(workers=1, maxsize=1)
+
+        work_queue.submit(release.wait)
+
+        while work_queue.queue_depth:
+            pass
+
+        work_queue.submit(release.wait)
+
+        started_at = time.monotonic()
+        work_queue.shutdown(timeout=0.1)
+
+        self.assertLess(time.monotonic() - started_at, 1)
+
+        release.set()
@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+from bot.config import Config
+
+
+class TestConfig(TestCase):
+    def setUp(self):
+        Config.slack_shortcuts = {
+            "test": {"slack_channel": "test"},
+            "test_2": {"slack_channel": "test"},
+            "other": {"slack_channel": "other"}
+        }
+
+    def test_get_channel_shortcuts(self):
+        self.assertEqual(Config.get_channel_shortcuts("test"), ("test", "test_2"))
+        self.assertEqual(Config.get_channel_shortcuts("missing"), ())
+
+    def test_get_channel_reply_text(self):
+        self.assertIn("*/test, /test_2*", Config.get_channel_reply_text("test"))
+        self.assertIn("**", Config.get_channel_reply_text("missing"))
+
+    def test_channels_index_rebuilt_on_shortcuts_change(self):
+        channels_index = Config.get_channels_index()
+
+        self.assertIs(Config.get_channels_index(), channels_index)
+
+        Config.slack_shortcuts = {"new": {"slack_channel": "test"}}
+
+        self.assertEqual(Config.get_channel_shortcuts("test"), ("new",))
+
+    def test_set_slack_shortcuts(self):
+        slack_shortcuts = {"new": {"slack_channel": "test"}}
+        Config.set_slack_shortcuts(slack_shortcuts)
+
+        self.assertIs(Config.slack_shortcuts, slack_shortcuts)
+        self.assertIs(Config.get_channels_index()[0], slack_shortcuts)
+        self.assertEqual(Config.get_channel_shortcuts("test"), ("new",))
+
+    def test_load_template_cached(self):
+        json_template = Config.get_template("slack/devops_shortcut_support.json")
+        view = Config.load_template("slack/devops_shortcut_support.json")
+        view["blocks"].clear()
+
+        self.assertIs(Config.get_template("slack/devops_shortcut_support.json"), json_template)
+        self.assertTrue(Config.load_template("slack/devops_shortcut_support.json")["blocks"])
+
+    def test_load_template_not_found(self):
+        self.assertIsNone(Config.load_template("slack/missing.json"))
+
+    def test_validate_templates(self):
+        Config.slack_shortcuts = {
+            "test": {
+                "slack_template": "slack/devops_shortcut_support.json",
+                "az_devops_board_template": "azure_devops/test.j2"
+            }
+        }
+        Config.validate_templates()
+
+        Config.slack_shortcuts["test"]["slack_template"] = "slack/missing.json"
+
+        self.assertRaises(ValueError, Config.validate_templates)
+
+    def test_templates_env_created_once(self):
+        templates_env = Config.get_templates_env()
+
+        self.assertIs(Config.get_templates_env(), templates_env)
+        self.assertIsNotNone(templates_env.get_template("slack/devops_shortcut_support.json"))
@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+from unittest import TestCase
+
+from benchmarks.fake_az_devops import FakeAzDevOpsServer
+from benchmarks.fake_slack import FakeSlackServer
+from benchmarks.load import bot_env
+
+# The import time budget is checked by benchmarks.bench_startup, the unit
+# suite only checks the SDKs imported on first use don't come back
+LAZY_PACKAGES = ["aiohttp", "azure", "msrest"]
+
+
+class TestMainStartup(TestCase):
+    def test_lazy_packages_not_imported(self):
+        with FakeSlackServer() as slack_server, FakeAzDevOpsServer() as az_server:
+            process = subprocess.run(
+                [sys.executable, "-c", "import sys, bot.main; print(' '.join(sys.modules))"],
+                env=dict(os.environ, STARTUP_WARMUP="false", **bot_env(slack_server.api_url, az_server.url)),
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
+
+        self.assertEqual(process.returncode, 0, process.stderr)
+        packages = {module.split(".")[0] for module in process.stdout.splitlines()[-1].split()}
+        self.assertIn("bot", packages)
+
+        for package in LAZY_PACKAGES:
+            self.assertNotIn(package, packages)